@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared email extractor against the previous find_valid_email.
+
+Run from the repository root:
+    python -m benchmarks.bench_email_extractor [--pages 300]
+
+Pages are parsed once up front, so the numbers only cover email extraction.
+Validation is a cheap stub (no DNS) that only accepts the page's real address;
+the validations column shows how many DNS checks each version would have made.
+"""
+import argparse
+import random
+import re
+import time
+from typing import Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.scrapers.email_extractor import find_email
+
+WORDS = ("family owned local service quality repair contact team years "
+         "customers call today hours open monday friday schedule estimate").split()
+
+
+def legacy_find_valid_email(soup: BeautifulSoup, validate_email) -> Tuple[Optional[str], str]:
+    """Copy of BusinessScraper.find_valid_email before the shared extractor."""
+    # Common email patterns to look for
+    email_patterns = [
+        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # Standard email
+        r'[a-zA-Z0-9._%+-]+\s*\[at\]\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # [at] format
+        r'[a-zA-Z0-9._%+-]+\s*\(at\)\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # (at) format
+        r'[a-zA-Z0-9._%+-]+\s*@\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'  # Spaced @ format
+    ]
+
+    # Common email prefixes to look for
+    email_prefixes = [
+        'email', 'contact', 'info', 'support', 'help', 'inquiries',
+        'business', 'office', 'admin', 'sales', 'marketing'
+    ]
+
+    # First try to find email in meta tags (fastest check)
+    meta_tags = soup.find_all('meta')
+    for tag in meta_tags:
+        content = tag.get('content', '')
+        for pattern in email_patterns:
+            matches = re.findall(pattern, content)
+            for email in matches:
+                # Clean up the email
+                email = re.sub(r'\s*\[at\]\s*', '@', email)
+                email = re.sub(r'\s*\(at\)\s*', '@', email)
+                email = re.sub(r'\s*@\s*', '@', email)
+
+                # Validate the email
+                if validate_email(email):
+                    return email, "Valid email found in meta tags"
+
+    # Look for email in mailto links (second fastest check)
+    links = soup.find_all('a', href=True)
+    for link in links:
+        href = link.get('href', '')
+        if href.startswith('mailto:'):
+            email = href[7:]  # Remove 'mailto:' prefix
+            if validate_email(email):
+                return email, "Valid email found in mailto link"
+
+    # Look for contact forms (third fastest check)
+    forms = soup.find_all('form')
+    for form in forms:
+        # Check form action for email
+        action = form.get('action', '')
+        if 'mailto:' in action:
+            email = action.split('mailto:')[1].split('?')[0]
+            if validate_email(email):
+                return email, "Valid email found in form action"
+
+    # Look for email in text content (slowest check, but most thorough)
+    text_content = soup.get_text()
+    for pattern in email_patterns:
+        matches = re.findall(pattern, text_content)
+        for email in matches:
+            # Clean up the email
+            email = re.sub(r'\s*\[at\]\s*', '@', email)
+            email = re.sub(r'\s*\(at\)\s*', '@', email)
+            email = re.sub(r'\s*@\s*', '@', email)
+
+            # Validate the email
+            if validate_email(email):
+                return email, "Valid email found in text content"
+
+    return None, "No valid email found on page"
+
+
+def build_page(index: int, rng: random.Random) -> Tuple[str, str]:
+    """Build a small-business style page with decoys and one real address near the end."""
+    paragraphs = []
+    for _ in range(rng.randint(40, 120)):
+        paragraphs.append("<p>" + " ".join(rng.choice(WORDS) for _ in range(30)) + "</p>")
+    metas = "".join(f'<meta name="m{i}" content="{" ".join(rng.sample(WORDS, 5))}">' for i in range(15))
+    decoys = "<p>Follow us at social@tracker-widget.net or jobs (at) staffing-portal.com</p>"
+    real = f"shop{index}@business{index}.com"
+    variant = index % 3
+    if variant == 0:
+        contact = f"<p>Email us: {real}</p>"
+    elif variant == 1:
+        contact = f"<p>Email us: {real.replace('@', ' [at] ')}</p>"
+    else:
+        contact = f"<p>Email us: {real.replace('@', ' @ ')}</p>"
+    html = f"<html><head>{metas}</head><body>{decoys}{''.join(paragraphs)}{contact}</body></html>"
+    return html, real
+
+
+def run(label, func, pages) -> float:
+    calls = [0]
+    start = time.perf_counter()
+    found = 0
+    for soup, real in pages:
+        def validate(email, real=real):
+            calls[0] += 1
+            return email.lower() == real
+        email, _ = func(soup, validate)
+        found += email is not None
+    elapsed = time.perf_counter() - start
+    rate = len(pages) / elapsed
+    print(f"{label:<10} {rate:10.1f} pages/sec   {calls[0]:6d} validations   ({found}/{len(pages)} emails found)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email extraction")
+    parser.add_argument('--pages', type=int, default=300, help='Number of synthetic pages')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = []
+    for index in range(args.pages):
+        html, real = build_page(index, rng)
+        soup = BeautifulSoup(html, 'html.parser')
+        pages.append((soup, real))
+
+    legacy = run("legacy", legacy_find_valid_email, pages)
+    shared = run("shared", find_email, pages)
+    print(f"speedup    {shared / legacy:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark full html.parser soups against strained parsing with each backend.
+
+Run from the repository root:
+    python -m benchmarks.bench_html_parsing [--pages 200]
+
+Each run parses every page and searches it for an email, which is what the
+crawler does per fetched page. Peak memory is measured with tracemalloc over
+a single page parse.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from benchmarks.bench_email_extractor import build_page
+from src.scrapers.email_extractor import find_email
+from src.scrapers.html_parsing import ParsedPage, resolve_parser
+
+
+def full_soup(markup):
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def run(label, parse, pages) -> float:
+    start = time.perf_counter()
+    found = 0
+    for markup, real in pages:
+        email, _ = find_email(parse(markup), lambda email, real=real: email.lower() == real)
+        found += email is not None
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(pages[0][0]).get_text()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    rate = len(pages) / elapsed
+    print(f"{label:<20} {rate:8.1f} pages/sec   {peak / 1024:8.0f} KiB peak   ({found}/{len(pages)} emails found)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing backends")
+    parser.add_argument('--pages', type=int, default=200, help='Number of synthetic pages')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    pages = [build_page(index, rng) for index in range(args.pages)]
+
+    baseline = run("full html.parser", full_soup, pages)
+    strained = run("strained html.parser", lambda markup: ParsedPage(markup, 'html.parser'), pages)
+    backend = resolve_parser('lxml')
+    fastest = run(f"strained {backend}", lambda markup: ParsedPage(markup, backend), pages)
+    print(f"{'speedup html.parser':<20} {strained / baseline:8.2f}x")
+    print(f"{'speedup ' + backend:<20} {fastest / baseline:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 import json
 import time
 from mailgun_service import MailgunService
-import requests
+from src.utils.http_transport import get_session
 
 # Load environment variables before any other imports
 load_dotenv(override=True)
@@ -27,7 +27,7 @@ def get_all_businesses():
         print("Fetching businesses from Firebase...")
         
         # Make the request to Firebase
-        response = requests.get(f"{firebase_url}/.json")
+        response = get_session('firebase').get(f"{firebase_url}/.json")
         print(f"Response status code: {response.status_code}")
         print(f"Response headers: {response.headers}")
         
@@ -92,7 +92,7 @@ def mark_email_sent(business_id):
         print(f"Updating Firebase at: {update_url}")
         
         data = {"email_sent": True}
-        response = requests.patch(update_url, json=data)
+        response = get_session('firebase').patch(update_url, json=data)
         
         print(f"Update response status: {response.status_code}")
         print(f"Update response content: {response.text}")
@@ -6,7 +6,9 @@ setup(
     packages=find_packages(),
     install_requires=[
         'beautifulsoup4==4.12.3',
+        'lxml==5.1.0',
         'requests==2.31.0',
+        'aiohttp==3.9.3',
         'dnspython==2.5.0',
         'python-dotenv==1.0.1',
         'pytest==8.0.2',
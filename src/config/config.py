@@ -18,7 +18,7 @@ FIREBASE_CREDENTIALS = {
     "type": "service_account",
     "project_id": os.environ.get('FIREBASE_PROJECT_ID'),
     "private_key_id": os.environ.get('FIREBASE_PRIVATE_KEY_ID'),
-    "private_key": os.environ.get('FIREBASE_PRIVATE_KEY').replace('\\n', '\n'),
+    "private_key": (os.environ.get('FIREBASE_PRIVATE_KEY') or '').replace('\\n', '\n'),
     "client_email": os.environ.get('FIREBASE_CLIENT_EMAIL'),
     "client_id": os.environ.get('FIREBASE_CLIENT_ID'),
     "auth_uri": os.environ.get('FIREBASE_AUTH_URI'),
@@ -35,6 +35,17 @@ TEST_RECIPIENT = os.environ.get('TEST_RECIPIENT')
 
 # Hunter.io Configuration
 HUNTER_API_KEY = os.environ.get('HUNTER_API_KEY')
+# Verification results are reused for this long before Hunter is asked again
+HUNTER_CACHE_PATH = os.environ.get('HUNTER_CACHE_PATH', '.cache/hunter_verifications.sqlite3')
+HUNTER_CACHE_TTL = int(os.environ.get('HUNTER_CACHE_TTL', 30 * 24 * 3600))
+# Bulk verification: lists at least this long are submitted as one job and polled
+HUNTER_BULK_PATH = os.environ.get('HUNTER_BULK_PATH', 'bulk-verifications')
+HUNTER_BULK_MIN_SIZE = 20
+HUNTER_BULK_POLL_INTERVAL = 5  # seconds between job status polls
+HUNTER_BULK_TIMEOUT = 30 * 60  # seconds before a job is abandoned for single calls
+# Single email-verifier calls: Hunter allows about 10 requests per second
+HUNTER_RATE_LIMIT = 10  # requests per second
+HUNTER_MAX_CONCURRENCY = 5  # single verifications in flight
 
 # API Keys for Grok
 GROK_API_KEYS = [
@@ -44,9 +55,38 @@ GROK_API_KEYS = [
     "xai-tSqllE2zOWUdhDaDfY0SILvJ1wHC02Oqt0mSMDdAfsugQOcRVURjntYL2nm2pxJBLUI7xeP0lmT7a5au"
 ]
 
+# Shared LLM client (see src/services/llm_client.py)
+GROK_API_URL = os.environ.get('GROK_API_URL', 'https://api.x.ai/v1/chat/completions')
+GROK_MODEL = 'grok-2-latest'  # default model when a caller does not pick one
+DEEPSEEK_API_URL = os.environ.get('DEEPSEEK_API_URL', 'https://api.deepseek.com/v1/chat/completions')
+# Completions in flight per API key adapt between the min and max: +1 per round of
+# successes while the rate-limit headers show room, halved on a 429
+LLM_CONCURRENCY_PER_KEY = 4  # starting limit
+LLM_MIN_CONCURRENCY_PER_KEY = 1
+LLM_MAX_CONCURRENCY_PER_KEY = 16
+LLM_AIMD_INCREASE = 1.0
+LLM_AIMD_DECREASE = 0.5
+LLM_RATE_LIMIT_COOLDOWN = 5.0  # seconds a key rests after a 429 without Retry-After
+LLM_MAX_RETRIES = 3  # retries after 429s, 5xx and connection errors
+LLM_BACKOFF_FACTOR = 1.0  # seconds before the first retry, doubled for each one after
+LLM_TIMEOUT = 60  # seconds per completion request
+# Opt-in cache of deterministic (temperature 0) completions, shared by all processes and runs
+LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE', 'false').lower() == 'true'
+LLM_CACHE_PATH = os.environ.get('LLM_CACHE_PATH', '.cache/llm_responses.sqlite3')
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024  # compressed size before LRU eviction
+
 # Number of parallel processes
 NUM_PROCESSES = 4
 
+# Business types asked for in one Grok discovery prompt (1 = one call per city x type)
+DISCOVERY_BATCH_SIZE = int(os.environ.get('DISCOVERY_BATCH_SIZE', 4))
+
+# Already-saved businesses: how many prompt tokens may go to naming them for Grok to
+# skip (the rest are excluded locally), and how alike two names must be to be duplicates
+EXCLUSION_PROMPT_TOKENS = int(os.environ.get('EXCLUSION_PROMPT_TOKENS', 300))
+NAME_MATCH_THRESHOLD = 0.88  # difflib ratio of normalized names, within one city
+
 # Rate limiting settings
 RATE_LIMIT_DELAY = 2  # seconds between requests
 MAX_RETRIES = 3
@@ -54,6 +94,68 @@ MAX_RETRIES = 3
 # Timeout settings
 REQUEST_TIMEOUT = 30  # seconds
 
+# Shared HTTP transport settings (see src/utils/http_transport.py)
+HTTP_POOL_SIZE = 10  # keep-alive connections per upstream
+HTTP_MAX_RETRIES = 3  # retries for connection errors and 5xx on idempotent requests
+HTTP_BACKOFF_FACTOR = 0.5
+# Per-upstream overrides of pool_size, max_retries, backoff_factor and timeout
+HTTP_UPSTREAMS = {
+    "grok": {"pool_size": 16},
+    "deepseek": {"pool_size": 8},
+    "firebase": {"pool_size": 16},
+    "google_places": {"pool_size": 8},
+    "mailgun": {"pool_size": 4},
+    "hunter": {"pool_size": 4},
+    "web": {"pool_size": 32, "timeout": 10}
+}
+
+# Website crawl settings
+CRAWL_CONCURRENCY = 200  # website fetches in flight per process
+CRAWL_TIMEOUT = 10  # seconds per page
+CRAWL_MIN_INTERVAL = 3.0  # minimum seconds between requests to the same host
+CRAWL_HOST_BURST = 1  # requests allowed back-to-back before a host is throttled
+CRAWL_MAX_PAGE_BYTES = 1024 * 1024  # stop downloading a page after this many bytes
+CRAWL_CHUNK_BYTES = 16 * 1024  # streamed chunk size scanned for emails
+CRAWL_MAX_PAGES_PER_SITE = 6  # pages fetched per website, home page included
+CRAWL_TOP_K = 3  # best-ranked contact pages fetched concurrently per batch
+
+# HTML parsing for the scrapers: BeautifulSoup backend ('lxml' or 'html.parser'),
+# and whether to only build the tags the email search inspects
+HTML_PARSER = os.environ.get('HTML_PARSER', 'lxml')
+HTML_STRAINED = os.environ.get('HTML_STRAINED', 'true').lower() == 'true'
+
+# Crawled page cache
+PAGE_CACHE_PATH = os.environ.get('PAGE_CACHE_PATH', '.cache/pages.sqlite3')
+PAGE_CACHE_TTL = 7 * 24 * 3600  # seconds a cached page is used without revalidation
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024  # compressed size before LRU eviction
+
+# Per-host robots.txt and sitemap index, shared by all workers and runs
+SITE_INDEX_PATH = os.environ.get('SITE_INDEX_PATH', '.cache/sites.sqlite3')
+SITE_INDEX_TTL = 14 * 24 * 3600  # seconds before a host's robots.txt and sitemaps are fetched again
+SITEMAP_MAX_FILES = 3  # sitemap documents read per host (index files included)
+SITEMAP_MAX_CONTACT_URLS = 5  # contact-like sitemap URLs kept per host
+
+# DNS answer cache shared by the validators in every worker process and later runs
+DNS_CACHE_PATH = os.environ.get('DNS_CACHE_PATH', '.cache/dns.sqlite3')
+DNS_MIN_TTL = 60  # floor on record TTLs, so zero-TTL records still dedupe within a page
+DNS_MAX_TTL = 24 * 3600  # cap on record TTLs
+DNS_NEGATIVE_TTL = 3600  # seconds NXDOMAIN / no-answer results are kept
+DNS_ERROR_TTL = 300  # seconds failed lookups (no nameservers answered) are kept
+DNS_BULK_CONCURRENCY = 100  # DNS queries in flight during batch validation
+DNS_QUERY_TIMEOUT = 5.0  # seconds per batch DNS query before it counts as timed out
+
+# Disposable / role-only email domain blocklist. Plain-text lists (one domain per line) are
+# compiled into a memory-mapped lookup file, rebuilt automatically when a list changes.
+# Add large public lists with DISPOSABLE_DOMAIN_LISTS / ROLE_DOMAIN_LISTS (os.pathsep separated).
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DOMAIN_BLOCKLIST_PATH = os.environ.get('DOMAIN_BLOCKLIST_PATH', '.cache/domain_blocklist.bin')
+DOMAIN_BLOCKLIST_SOURCES = {
+    'disposable': [os.path.join(_DATA_DIR, 'disposable_domains.txt')]
+                  + [path for path in os.environ.get('DISPOSABLE_DOMAIN_LISTS', '').split(os.pathsep) if path],
+    'role': [os.path.join(_DATA_DIR, 'role_domains.txt')]
+            + [path for path in os.environ.get('ROLE_DOMAIN_LISTS', '').split(os.pathsep) if path],
+}
+
 # Logging configuration
 LOG_LEVEL = "INFO"
 LOG_FILE = "scraper.log"
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import json
-import requests
+from src.utils.http_transport import get_session
 from typing import Dict, List, Tuple
 from datetime import datetime
 
@@ -102,7 +102,7 @@ def get_businesses_from_firebase() -> Dict:
     firebase_url = "https://emailsender-44bcc-default-rtdb.firebaseio.com/siteList.json"
     
     try:
-        response = requests.get(firebase_url)
+        response = get_session('firebase').get(firebase_url)
         if response.status_code == 200:
             businesses = response.json() or {}
             print(f"Found {len(businesses)} businesses")
@@ -165,7 +165,7 @@ def save_email_to_firebase(business: Dict, template_name: str, email_content: st
         
         # Save to Firebase
         firebase_url = f"https://emailsender-44bcc-default-rtdb.firebaseio.com/emails/{clean_name}.json"
-        response = requests.put(firebase_url, json=email_data)
+        response = get_session('firebase').put(firebase_url, json=email_data)
         
         if response.status_code == 200:
             print(f"Successfully saved email for {business['name']}")
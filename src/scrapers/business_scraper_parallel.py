@@ -1,21 +1,25 @@
 #!/usr/bin/env python3
-import requests
-import json
 import os
 import random
-import time
 import logging
 import re
-import dns.resolver
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Set, Tuple, Optional
 from multiprocessing import Pool, Manager, Lock
-from bs4 import BeautifulSoup
 from src.config.config import (
-    LOG_LEVEL, LOG_FILE, NUM_PROCESSES, RATE_LIMIT_DELAY, REQUEST_TIMEOUT,
-    GROK_API_KEYS, FIREBASE_URL
+    LOG_LEVEL, LOG_FILE, NUM_PROCESSES, REQUEST_TIMEOUT,
+    GROK_API_KEYS, FIREBASE_URL, DISCOVERY_BATCH_SIZE
 )
-from urllib.parse import urlparse
+from src.scrapers.crawler import AsyncCrawler
+from src.services.llm_client import LLMClient, LLMError, LLMResponseError
+from src.scrapers.email_extractor import find_email
+from src.scrapers.html_parsing import Page
+from src.utils.http_transport import get_session
+from src.utils.json_repair import Field, validate
+from src.utils.dns_cache import dns_cache
+from src.utils.validation_pipeline import ValidationResult, email_pipeline, website_pipeline
 
 # Set up logging
 logging.basicConfig(
@@ -30,6 +34,54 @@ logging.basicConfig(
 # Import the business types and cities from the original scraper
 from src.scrapers.business_scraper import MAJOR_CITIES, BUSINESS_TYPES
 
+DISCOVERY_SYSTEM_PROMPT = "You are a business research assistant. Provide accurate business information in JSON format. Only include real, existing businesses that you can verify."
+
+# Per-business instructions shared by single and batched discovery prompts
+BUSINESS_FIELDS_PROMPT = """For each business, provide:
+1. Name (must be a real, existing business)
+2. Description (2-3 sentences about their services and target market)
+3. Website URL (must be a real, existing website that is currently active)
+4. Email address (MUST be extracted from the website's HTML, specifically from:
+   - Contact page
+   - About page
+   - Footer
+   - Contact forms
+   - Business information sections
+   Do NOT make up or guess email addresses)
+5. Phone number (must be a valid US phone number)
+6. Number of employees (if available, must be less than 1000)
+
+Important requirements:
+- Only include real, existing businesses
+- Businesses must be independently owned (not chains or franchises)
+- Websites must be currently active and accessible
+- Email addresses MUST be found in the website's HTML
+- Phone numbers must be valid US numbers
+- Employee count must be less than 1000
+
+Format each business as a JSON object with these fields:
+{
+    "name": "string",
+    "description": "string",
+    "website": "string or null",
+    "email": "string or null",
+    "phone": "string or null",
+    "employees": "string or null"
+}"""
+
+# What a discovered business must look like (see json_repair.validate)
+BUSINESS_SCHEMA = {
+    'name': str,
+    'description': str,
+    'website': Field(str, required=False),
+    'email': Field(str, required=False),
+    'phone': Field(str, required=False),
+    'employees': Field((str, int), required=False)
+}
+
+# Output tokens allowed per combination of a discovery prompt
+DISCOVERY_MAX_TOKENS = 2000
+
 def get_random_user_agent():
     """Return a random user agent string."""
     user_agents = [
@@ -56,12 +108,13 @@ class BusinessScraper:
     def __init__(self, api_key: str, process_id: int):
         self.api_key = api_key
         self.process_id = process_id
-        self.headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
+        self.llm = LLMClient([api_key])
         self.logger = logging.getLogger(f"Process-{process_id}")
-        # Initialize statistics
+        self.email_pipeline = email_pipeline(reject_suspicious_mx=True)
+        self.website_pipeline = website_pipeline()
+        self.crawler = AsyncCrawler(self.find_valid_email, get_headers, validate_email=self.validate_email)
+        # Initialize statistics; business types of a city run on threads that share them
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_businesses': 0,
             'rejected_businesses': 0,
@@ -71,162 +124,30 @@ class BusinessScraper:
             'start_time': datetime.now().isoformat()
         }
 
-    def find_valid_email(self, soup: BeautifulSoup, business_name: str) -> Tuple[Optional[str], str]:
+    def find_valid_email(self, soup: Page, business_name: str) -> Tuple[Optional[str], str]:
         """
         Search for valid email addresses in the webpage.
         Returns tuple of (email, message) where email is None if no valid email found.
         """
-        # Common email patterns to look for
-        email_patterns = [
-            r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # Standard email
-            r'[a-zA-Z0-9._%+-]+\s*\[at\]\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # [at] format
-            r'[a-zA-Z0-9._%+-]+\s*\(at\)\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # (at) format
-            r'[a-zA-Z0-9._%+-]+\s*@\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'  # Spaced @ format
-        ]
-        
-        # Common email prefixes to look for
-        email_prefixes = [
-            'email', 'contact', 'info', 'support', 'help', 'inquiries',
-            'business', 'office', 'admin', 'sales', 'marketing'
-        ]
-        
-        # First try to find email in meta tags (fastest check)
-        meta_tags = soup.find_all('meta')
-        for tag in meta_tags:
-            content = tag.get('content', '')
-            for pattern in email_patterns:
-                matches = re.findall(pattern, content)
-                for email in matches:
-                    # Clean up the email
-                    email = re.sub(r'\s*\[at\]\s*', '@', email)
-                    email = re.sub(r'\s*\(at\)\s*', '@', email)
-                    email = re.sub(r'\s*@\s*', '@', email)
-                    
-                    # Validate the email
-                    if self.validate_email(email):
-                        return email, "Valid email found in meta tags"
-        
-        # Look for email in mailto links (second fastest check)
-        links = soup.find_all('a', href=True)
-        for link in links:
-            href = link.get('href', '')
-            if href.startswith('mailto:'):
-                email = href[7:]  # Remove 'mailto:' prefix
-                if self.validate_email(email):
-                    return email, "Valid email found in mailto link"
-        
-        # Look for contact forms (third fastest check)
-        forms = soup.find_all('form')
-        for form in forms:
-            # Check form action for email
-            action = form.get('action', '')
-            if 'mailto:' in action:
-                email = action.split('mailto:')[1].split('?')[0]
-                if self.validate_email(email):
-                    return email, "Valid email found in form action"
-        
-        # Look for email in text content (slowest check, but most thorough)
-        text_content = soup.get_text()
-        for pattern in email_patterns:
-            matches = re.findall(pattern, text_content)
-            for email in matches:
-                # Clean up the email
-                email = re.sub(r'\s*\[at\]\s*', '@', email)
-                email = re.sub(r'\s*\(at\)\s*', '@', email)
-                email = re.sub(r'\s*@\s*', '@', email)
-                
-                # Validate the email
-                if self.validate_email(email):
-                    return email, "Valid email found in text content"
-        
-        return None, "No valid email found on page"
+        return find_email(soup, self.validate_email)
 
     def scrape_business_website(self, url: str, business_name: str, max_depth: int = 2) -> Tuple[Optional[str], str]:
         """
         Scrape business website for valid email address.
         Returns tuple of (email, message) where email is None if no valid email found.
         """
-        try:
-            # Add random delay between 2-5 seconds to be respectful to servers
-            time.sleep(random.uniform(2, 5))
-            
-            # Make request with browser-like headers
-            response = requests.get(url, headers=get_headers(), timeout=10)
-            response.raise_for_status()
-            
-            # Check if we got HTML content
-            if 'text/html' not in response.headers.get('Content-Type', '').lower():
-                return None, "Response is not HTML content"
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # First try to find email on main page
-            email, message = self.find_valid_email(soup, business_name)
-            if email:
-                return email, message
-            
-            # If no valid email found and we haven't reached max depth, look for contact page
-            if max_depth > 0:
-                # Look for contact page link
-                contact_links = soup.find_all('a', href=True)
-                for link in contact_links:
-                    href = link.get('href', '').lower()
-                    text = link.get_text().lower()
-                    
-                    # Check if this is likely a contact page
-                    if any(term in href or term in text for term in ['contact', 'about', 'reach', 'get-in-touch']):
-                        # Make sure the URL is absolute
-                        if not href.startswith(('http://', 'https://')):
-                            if href.startswith('/'):
-                                href = url.rstrip('/') + href
-                            else:
-                                href = url.rstrip('/') + '/' + href
-                        
-                        # Recursively search contact page
-                        email, message = self.scrape_business_website(href, business_name, max_depth - 1)
-                        if email:
-                            return email, message
-            
-            return None, "No valid email found after checking all pages"
-            
-        except requests.exceptions.RequestException as e:
-            return None, f"Network error: {str(e)}"
-        except Exception as e:
-            return None, f"Error scraping website: {str(e)}"
+        return self.scrape_business_websites([(url, business_name)], max_depth)[0]
+
+    def scrape_business_websites(self, targets: List[Tuple[str, str]], max_depth: int = 2) -> List[Tuple[Optional[str], str]]:
+        """
+        Scrape several business websites concurrently.
+        Takes a list of (url, business_name) and returns one (email, message) tuple per target.
+        """
+        return self.crawler.crawl(targets, max_depth)
 
     def validate_email(self, email: str) -> bool:
-        """Validate email format and check if domain has MX records."""
-        if not email or email.lower() == 'null':
-            return False
-        
-        # Basic email format validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            return False
-        
-        # Extract domain
-        domain = email.split('@')[1]
-        
-        # Skip validation for common disposable email domains
-        disposable_domains = {'tempmail.com', 'throwawaymail.com', 'tempmailaddress.com'}
-        if domain in disposable_domains:
-            return False
-            
-        try:
-            # Check for MX records
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            if not mx_records:
-                return False
-                
-            # Additional check: Verify the MX record is not a catch-all or spam domain
-            mx_string = str(mx_records[0]).lower()
-            spam_indicators = {'spam', 'catch-all', 'bounce', 'invalid'}
-            if any(indicator in mx_string for indicator in spam_indicators):
-                return False
-                
-            return True
-        except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers):
-            return False
+        """Validate email format, blocklist and MX records (see validation_pipeline)."""
+        return self.email_pipeline.check(email).valid
 
     def is_small_business(self, business: Dict) -> bool:
         """Check if a business meets small business criteria."""
@@ -276,41 +197,8 @@ class BusinessScraper:
         return True
 
     def validate_website(self, url: str) -> bool:
-        """Validate website URL and check if it exists."""
-        if not url:
-            return False
-        
-        # Basic URL validation
-        try:
-            parsed = urlparse(url)
-            if not all([parsed.scheme, parsed.netloc]):
-                return False
-        except Exception:
-            return False
-        
-        # Check DNS records
-        try:
-            domain = parsed.netloc
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            # Check A records
-            try:
-                answers = dns.resolver.resolve(domain, 'A')
-                if not answers:
-                    return False
-            except dns.resolver.NoAnswer:
-                # If no A records, check CNAME
-                try:
-                    answers = dns.resolver.resolve(domain, 'CNAME')
-                    if not answers:
-                        return False
-                except dns.resolver.NoAnswer:
-                    return False
-            
-            return True
-        except Exception:
-            return False
+        """Validate website URL and check that its domain resolves."""
+        return self.website_pipeline.check(url).valid
 
     def validate_employee_count(self, employee_count: str) -> bool:
         """Validate employee count format."""
@@ -369,27 +257,10 @@ class BusinessScraper:
 
     def clean_business_data(self, business: Dict) -> Dict:
         """Clean and validate business data."""
-        # Create a copy to avoid modifying the original
-        cleaned = business.copy()
-        
-        # Clean email
-        email = cleaned.get('email', '')
-        if email and isinstance(email, str):
-            email = email.strip().lower()
-            if not self.validate_email(email):
-                cleaned['email'] = None
-        else:
-            cleaned['email'] = None
-        
-        # Clean website
-        website = cleaned.get('website', '')
-        if website and isinstance(website, str):
-            website = website.strip()
-            if not self.validate_website(website):
-                cleaned['website'] = None
-        else:
-            cleaned['website'] = None
-        
+        return self.clean_businesses_data([business])[0]
+
+    def _clean_fields(self, cleaned: Dict):
+        """Normalize the phone and text fields of a business, in place."""
         # Clean phone
         phone = cleaned.get('phone', '')
         if phone and isinstance(phone, str):
@@ -413,22 +284,57 @@ class BusinessScraper:
         
         # Clean employees
         employees = cleaned.get('employees', '')
-        if employees and isinstance(employees, str):
-            cleaned['employees'] = employees.strip()
+        if employees and isinstance(employees, (str, int)):
+            # Validation turns counts sent as strings ("50") into ints; store them as text
+            cleaned['employees'] = str(employees).strip()
         else:
             cleaned['employees'] = ''
-        
+
+    def clean_businesses_data(self, businesses: List[Dict]) -> List[Dict]:
+        """
+        Clean and validate many businesses at once.
+        Emails and websites go through the validation pipelines as one batch, so each
+        domain is resolved once and concurrently.
+        """
+        # Copy to avoid modifying the originals
+        cleaned = [business.copy() for business in businesses]
+        self._validate_contacts(cleaned)
+        for business in cleaned:
+            self._clean_fields(business)
         return cleaned
 
+    def _validate_contacts(self, businesses: List[Dict]) -> Dict[str, Dict[int, ValidationResult]]:
+        """
+        Run the emails and websites of a batch through the validation pipelines and set
+        missing or invalid values to None, in place. Returns {field: {index: result}}
+        for the businesses that had a value.
+        """
+        checks = (('email', self.email_pipeline, lambda value: value.strip().lower()),
+                  ('website', self.website_pipeline, lambda value: value.strip()))
+        results = {}
+        for field, pipeline, normalize in checks:
+            rows = []
+            for row, business in enumerate(businesses):
+                if business.get(field) and isinstance(business.get(field), str):
+                    rows.append(row)
+                else:
+                    business[field] = None
+            results[field] = dict(zip(rows, pipeline.run([normalize(businesses[row][field]) for row in rows])))
+            for row, result in results[field].items():
+                if not result.valid:
+                    businesses[row][field] = None
+        return results
+
     def update_stats(self, rejection_reason: str = None, saved: bool = False):
         """Update scraper statistics."""
-        self.stats['total_businesses'] += 1
-        if rejection_reason:
-            self.stats['rejected_businesses'] += 1
-            self.stats['rejection_reasons'][rejection_reason] = self.stats['rejection_reasons'].get(rejection_reason, 0) + 1
-        if saved:
-            self.stats['saved_businesses'] += 1
-        self.stats['api_requests'] += 1
+        with self._stats_lock:
+            self.stats['total_businesses'] += 1
+            if rejection_reason:
+                self.stats['rejected_businesses'] += 1
+                self.stats['rejection_reasons'][rejection_reason] = self.stats['rejection_reasons'].get(rejection_reason, 0) + 1
+            if saved:
+                self.stats['saved_businesses'] += 1
+            self.stats['api_requests'] += 1
 
     def save_scraper_log(self):
         """Save scraper statistics to Firebase."""
@@ -447,7 +353,15 @@ class BusinessScraper:
                 'saved_businesses': self.stats['saved_businesses'],
                 'api_requests': self.stats['api_requests'],
                 'rejection_reasons': self.stats['rejection_reasons'],
-                'success_rate': f"{(self.stats['saved_businesses'] / self.stats['total_businesses'] * 100):.2f}%" if self.stats['total_businesses'] > 0 else "0%"
+                'success_rate': f"{(self.stats['saved_businesses'] / self.stats['total_businesses'] * 100):.2f}%" if self.stats['total_businesses'] > 0 else "0%",
+                'crawl_politeness': self.crawler.scheduler.stats(),
+                'site_index': self.crawler.site_index.stats,
+                'dns_cache': dns_cache.summary(),
+                'llm': self.llm.summary(),
+                'validation': {
+                    'email': self.email_pipeline.summary(),
+                    'website': self.website_pipeline.summary()
+                }
             }
 
             # Generate a unique log ID
@@ -455,7 +369,7 @@ class BusinessScraper:
 
             # Save to Firebase
             firebase_url = f"{FIREBASE_URL}/scraperLogs/{log_id}.json"
-            response = requests.put(firebase_url, json=log_data)
+            response = get_session('firebase').put(firebase_url, json=log_data)
 
             if response.status_code == 200:
                 self.logger.info(f"Successfully saved scraper log with ID: {log_id}")
@@ -473,10 +387,10 @@ class BusinessScraper:
             cleaned_business = {
                 'name': business.get('name', '').strip(),
                 'description': business.get('description', '').strip(),
-                'website': business.get('website', '').strip(),
-                'email': business.get('email', '').strip(),
-                'phone': business.get('phone', '').strip(),
-                'employees': business.get('employees', '').strip(),
+                'website': (business.get('website') or '').strip(),
+                'email': (business.get('email') or '').strip(),
+                'phone': (business.get('phone') or '').strip(),
+                'employees': str(business.get('employees') or '').strip(),
                 'city': city,
                 'state': state,
                 'type': business_type,
@@ -517,12 +431,13 @@ class BusinessScraper:
 
             # Save to Firebase
             url = f"{FIREBASE_URL}/businesses/{business_id}.json"
-            response = requests.put(url, json=business_data, timeout=REQUEST_TIMEOUT)
+            response = get_session('firebase').put(url, json=business_data, timeout=REQUEST_TIMEOUT)
 
             if response.status_code == 200:
                 # Update statistics
-                self.stats['total_businesses'] += 1
-                self.stats['saved_businesses'] += 1
+                with self._stats_lock:
+                    self.stats['total_businesses'] += 1
+                    self.stats['saved_businesses'] += 1
                 
                 # Save API action tracking
                 api_action = {
@@ -543,7 +458,7 @@ class BusinessScraper:
                 
                 # Save API action to Firebase
                 action_url = f"{FIREBASE_URL}/apiActions/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{business_id}.json"
-                requests.put(action_url, json=api_action, timeout=REQUEST_TIMEOUT)
+                get_session('firebase').put(action_url, json=api_action, timeout=REQUEST_TIMEOUT)
                 
                 self.logger.info(f"Successfully saved business {cleaned_business['name']} to siteList")
                 return True
@@ -579,7 +494,7 @@ class BusinessScraper:
             
             # Save to rejectedSiteList in Firebase
             firebase_url = f"{FIREBASE_URL}/rejectedSiteList/{business_id}.json"
-            response = requests.put(firebase_url, json=rejected_data)
+            response = get_session('firebase').put(firebase_url, json=rejected_data)
             
             if response.status_code == 200:
                 self.logger.info(f"Successfully saved rejected business {business['name']} to rejectedSiteList")
@@ -595,43 +510,50 @@ class BusinessScraper:
 
     def get_existing_businesses(self, city: str, state: str, business_type: str) -> Tuple[List[str], List[str]]:
         """Get lists of existing and rejected business names for a specific city and business type"""
+        return self.get_existing_businesses_by_type(city, state, [business_type])[business_type]
+
+    def get_existing_businesses_by_type(self, city: str, state: str,
+                                        business_types: List[str]) -> Dict[str, Tuple[List[str], List[str]]]:
+        """
+        Get existing and rejected business names for several business types of a city.
+        Both lists are fetched from Firebase once and split by type.
+        """
+        names = {business_type: ([], []) for business_type in business_types}
         try:
             # Query both siteList and rejectedSiteList from Firebase using REST API
             site_list_url = f"{FIREBASE_URL}/siteList.json"
             rejected_url = f"{FIREBASE_URL}/rejectedSiteList.json"
             
-            site_list_response = requests.get(site_list_url)
-            rejected_response = requests.get(rejected_url)
+            site_list_response = get_session('firebase').get(site_list_url)
+            rejected_response = get_session('firebase').get(rejected_url)
             
             if site_list_response.status_code != 200 or rejected_response.status_code != 200:
                 self.logger.error(f"Failed to get existing businesses: {site_list_response.status_code}, {rejected_response.status_code}")
-                return [], []
+                return names
             
             site_list_data = site_list_response.json() or {}
             rejected_data = rejected_response.json() or {}
             
-            existing_names = []
-            rejected_names = []
-            
             # Filter businesses by city, state, and business type
             for business_id, business_data in site_list_data.items():
-                if (business_data.get('metadata', {}).get('city') == city and 
-                    business_data.get('metadata', {}).get('state') == state and 
-                    business_data.get('metadata', {}).get('business_type') == business_type):
-                    existing_names.append(business_data['name'].lower().strip())
+                metadata = business_data.get('metadata', {})
+                if (metadata.get('city') == city and metadata.get('state') == state and
+                    metadata.get('business_type') in names):
+                    names[metadata['business_type']][0].append(business_data['name'].lower().strip())
             
             for business_id, business_data in rejected_data.items():
                 if (business_data.get('city') == city and 
                     business_data.get('state') == state and 
-                    business_data.get('business_type') == business_type):
-                    rejected_names.append(business_data['business_name'].lower().strip())
+                    business_data.get('business_type') in names):
+                    names[business_data['business_type']][1].append(business_data['business_name'].lower().strip())
             
-            self.logger.info(f"Found {len(existing_names)} existing and {len(rejected_names)} rejected businesses for {business_type} in {city}, {state}")
-            return existing_names, rejected_names
+            for business_type, (existing_names, rejected_names) in names.items():
+                self.logger.info(f"Found {len(existing_names)} existing and {len(rejected_names)} rejected businesses for {business_type} in {city}, {state}")
+            return names
             
         except Exception as e:
             self.logger.error(f"Error getting existing businesses from Firebase: {str(e)}")
-            return [], []
+            return {business_type: ([], []) for business_type in business_types}
 
     def get_businesses_from_grok(self, city: str, state: str, business_type: str, 
                                description: str, software_probability: int, 
@@ -646,203 +568,229 @@ class BusinessScraper:
         all_excluded_names = list(set(existing_names + rejected_names))
         self.logger.info(f"Total excluded business names: {len(all_excluded_names)}")
         
-        businesses = []
+        prompt = f"""Find 5 real small businesses in {city} that are {business_type}. 
+{BUSINESS_FIELDS_PROMPT}
+
+Return a JSON array of these objects."""
+
+        businesses_data = self._ask_grok(prompt, list, DISCOVERY_MAX_TOKENS)
+        if businesses_data is None:
+            return []
+        self.logger.info(f"Successfully parsed {len(businesses_data)} businesses from Grok API response")
+        return self._process_grok_businesses([(businesses_data, all_excluded_names)])[0]
+
+    def get_businesses_from_grok_batch(self, city: str, state: str, business_types: List[Tuple[str, int, str]],
+                                       existing_names: List[str], lock: Lock) -> Dict[str, List[Dict]]:
+        """
+        Get businesses for several business types of a city with one Grok call.
+
+        The prompt asks for a JSON object keyed by business type; each type's array is
+        processed like a single-type response. Types the answer leaves out are asked for
+        one by one; if the batched call fails, every type gets no businesses rather than
+        a call of its own. Returns {business_type: businesses}.
+        """
+        type_names = [business_type for business_type, _, _ in business_types]
+        self.logger.info(f"Getting business information for {len(type_names)} business types in {city}, {state}: {', '.join(type_names)}")
+
+        excluded = {
+            business_type: list(set(existing + rejected))
+            for business_type, (existing, rejected) in self.get_existing_businesses_by_type(city, state, type_names).items()
+        }
+
+        type_list = "\n".join(f"- {business_type}: {description}" for business_type, _, description in business_types)
+        prompt = f"""Find 5 real small businesses in {city} for each of these business types:
+{type_list}
+
+{BUSINESS_FIELDS_PROMPT}
+
+Return a JSON object with one key per business type, spelled exactly as listed above, whose value is a JSON array of that type's businesses."""
+
+        answer = self._ask_grok(prompt, dict, DISCOVERY_MAX_TOKENS * len(business_types))
+        if answer is None:
+            # The client has already retried; per-type calls would only multiply the failing requests
+            return {business_type: [] for business_type in type_names}
+        # Match keys loosely: models sometimes change case or spacing
+        by_key = {str(key).lower().strip(): value for key, value in answer.items()}
+        groups = {}
+        for business_type in type_names:
+            businesses_data = by_key.get(business_type.lower())
+            if isinstance(businesses_data, list):
+                groups[business_type] = businesses_data
+            else:
+                self.logger.warning(f"Batched response has no businesses for {business_type}")
+        self.logger.info(f"Successfully parsed {sum(map(len, groups.values()))} businesses for {len(groups)} business types from Grok API response")
+
+        results = dict(zip(groups, self._process_grok_businesses(
+            [(businesses_data, excluded[business_type]) for business_type, businesses_data in groups.items()]
+        )))
+        for business_type, software_probability, description in business_types:
+            if business_type not in results:
+                results[business_type] = self.get_businesses_from_grok(
+                    city, state, business_type, description, software_probability, existing_names, lock
+                )
+        return results
+
+    def _ask_grok(self, prompt: str, expect: type, max_tokens: int):
+        """Send a discovery prompt, retrying unparseable answers. Returns the parsed JSON, or None."""
         max_retries = 3
-        retry_delay = 5
 
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Attempt {attempt + 1} of {max_retries} to get businesses from Grok API")
-                
-                prompt = f"""Find 5 real small businesses in {city} that are {business_type}. 
-                For each business, provide:
-                1. Name (must be a real, existing business)
-                2. Description (2-3 sentences about their services and target market)
-                3. Website URL (must be a real, existing website that is currently active)
-                4. Email address (MUST be extracted from the website's HTML, specifically from:
-                   - Contact page
-                   - About page
-                   - Footer
-                   - Contact forms
-                   - Business information sections
-                   Do NOT make up or guess email addresses)
-                5. Phone number (must be a valid US phone number)
-                6. Number of employees (if available, must be less than 1000)
-                
-                Important requirements:
-                - Only include real, existing businesses
-                - Businesses must be independently owned (not chains or franchises)
-                - Websites must be currently active and accessible
-                - Email addresses MUST be found in the website's HTML
-                - Phone numbers must be valid US numbers
-                - Employee count must be less than 1000
-                
-                Format each business as a JSON object with these fields:
-                {{
-                    "name": "string",
-                    "description": "string",
-                    "website": "string or null",
-                    "email": "string or null",
-                    "phone": "string or null",
-                    "employees": "string or null"
-                }}
-                
-                Return a JSON array of these objects."""
-
-                response = requests.post(
-                    "https://api.x.ai/v1/chat/completions",
-                    headers=self.headers,
-                    json={
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a business research assistant. Provide accurate business information in JSON format. Only include real, existing businesses that you can verify."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "model": "grok-2",
-                        "temperature": 0.7,
-                        "max_tokens": 2000
-                    },
-                    timeout=REQUEST_TIMEOUT
+                return self.llm.chat_json(
+                    [
+                        {
+                            "role": "system",
+                            "content": DISCOVERY_SYSTEM_PROMPT
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    expect=expect,
+                    model="grok-2",
+                    temperature=0.7,
+                    max_tokens=max_tokens
                 )
 
-                if response.status_code != 200:
-                    self.logger.error(f"Grok API returned non-200 status code: {response.status_code}")
-                    self.logger.error(f"Response text: {response.text}")
-                    time.sleep(retry_delay)
+            except LLMResponseError as e:
+                # Only answers the tolerant parser could not salvage get here; ask again at once
+                self.logger.error(f"Error parsing Grok API response: {e}")
+                self.logger.error(f"Content that failed to parse: {e.content}")
+                continue
+
+            except LLMError as e:
+                # The client has already retried rate limits and server errors
+                self.logger.error(f"Grok API request failed: {str(e)}")
+                break
+
+        self.logger.warning(f"Failed to get valid businesses after {max_retries} attempts")
+        return None
+
+    def _process_grok_businesses(self, groups: List[Tuple[List, List[str]]]) -> List[List[Dict]]:
+        """
+        Filter, validate and complete the businesses Grok returned.
+
+        Takes one (businesses_data, excluded_names) pair per combination and returns one
+        list of businesses per pair. Contacts are validated and websites scraped as a
+        single batch across all combinations.
+        """
+        results = [[] for _ in groups]
+        candidates, owners = [], []
+        for group, (businesses_data, excluded_names) in enumerate(groups):
+            for business in businesses_data:
+                # Validate required fields and types
+                errors = validate(business, BUSINESS_SCHEMA)
+                if errors:
+                    self.logger.error(f"Invalid business entry ({'; '.join(errors)}): {business}")
                     continue
 
-                response_json = response.json()
-                content = response_json.get("choices", [{}])[0].get("message", {}).get("content", "")
-                
-                if not content or content.strip() == "":
-                    self.logger.error("Grok API returned empty response")
-                    time.sleep(retry_delay)
+                # Skip if business name is in excluded list
+                business_name = business['name'].lower().strip()
+                if business_name in excluded_names:
+                    self.logger.info(f"Skipping excluded business: {business_name}")
                     continue
 
-                try:
-                    # Clean the content string to ensure it's valid JSON
-                    content = content.strip()
-                    if content.startswith("```json"):
-                        content = content[7:]
-                    if content.endswith("```"):
-                        content = content[:-3]
-                    content = content.strip()
-                    
-                    businesses_data = json.loads(content)
-                    if not isinstance(businesses_data, list):
-                        self.logger.error("Grok API returned invalid response format")
-                        self.logger.error(f"Response content: {content}")
-                        time.sleep(retry_delay)
+                # Log business details for debugging
+                self.logger.info(f"Processing business: {business.get('name', 'unknown')}")
+                self.logger.info(f"Website: {business.get('website', 'None')}")
+                self.logger.info(f"Email: {business.get('email', 'None')}")
+                self.logger.info(f"Phone: {business.get('phone', 'None')}")
+                self.logger.info(f"Employees: {business.get('employees', 'None')}")
+                candidates.append(business)
+                owners.append(group)
+
+        try:
+            # Validate every website and email in the response as one batch, cheapest checks first
+            originals = [(business.get("website"), business.get("email")) for business in candidates]
+            validation = self._validate_contacts(candidates)
+
+            to_scrape = []
+            for row, (business, (website, email)) in enumerate(zip(candidates, originals)):
+                for field, value in (("website", website), ("email", email)):
+                    result = validation[field].get(row)
+                    if result is None:
                         continue
+                    if not result.valid:
+                        self.logger.warning(f"Invalid {field} for {business['name']}: {value} ({result.message})")
+                    else:
+                        self.logger.info(f"Valid {field} found for {business['name']}")
 
-                    self.logger.info(f"Successfully parsed {len(businesses_data)} businesses from Grok API response")
-
-                    for business in businesses_data:
-                        if not isinstance(business, dict):
-                            self.logger.error(f"Invalid business entry: {business}")
-                            continue
-
-                        # Skip if business name is in excluded list
-                        business_name = business.get('name', '').lower().strip()
-                        if business_name in all_excluded_names:
-                            self.logger.info(f"Skipping excluded business: {business_name}")
-                            continue
-
-                        # Log business details for debugging
-                        self.logger.info(f"Processing business: {business.get('name', 'unknown')}")
-                        self.logger.info(f"Website: {business.get('website', 'None')}")
-                        self.logger.info(f"Email: {business.get('email', 'None')}")
-                        self.logger.info(f"Phone: {business.get('phone', 'None')}")
-                        self.logger.info(f"Employees: {business.get('employees', 'None')}")
-
-                        # Validate required fields
-                        required_fields = ["name", "description"]
-                        if not all(field in business for field in required_fields):
-                            self.logger.error(f"Business missing required fields: {business}")
-                            continue
-
-                        # Validate website if present
-                        if business.get("website"):
-                            if not self.validate_website(business["website"]):
-                                self.logger.warning(f"Invalid website for {business['name']}: {business['website']}")
-                                business["website"] = None
-                            else:
-                                self.logger.info(f"Valid website found for {business['name']}")
-
-                        # Validate email if present
-                        if business.get("email"):
-                            if not self.validate_email(business["email"]):
-                                self.logger.warning(f"Invalid email for {business['name']}: {business['email']}")
-                                business["email"] = None
-                            else:
-                                self.logger.info(f"Valid email found for {business['name']}")
-
-                        # If no valid email but valid website, try to scrape email
-                        if not business.get("email") and business.get("website"):
-                            self.logger.info(f"Attempting to scrape email from website: {business['website']}")
-                            email, message = self.scrape_business_website(business["website"], business["name"])
-                            if email:
-                                self.logger.info(f"Found valid email through scraping: {email}")
-                                business["email"] = email
-                            else:
-                                self.logger.warning(f"Could not find valid email through scraping: {message}")
-
-                        # Validate phone if present
-                        if business.get("phone"):
-                            if not self.validate_phone(business["phone"]):
-                                self.logger.warning(f"Invalid phone for {business['name']}: {business['phone']}")
-                                business["phone"] = None
-                            else:
-                                self.logger.info(f"Valid phone found for {business['name']}")
-
-                        businesses.append(business)
-                        self.logger.info(f"Successfully processed business: {business['name']}")
-
-                    return businesses
-
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Error parsing Grok API response: {e}")
-                    self.logger.error(f"Content that failed to parse: {content}")
-                    time.sleep(retry_delay)
-                    continue
+                # If no valid email but valid website, queue the website for scraping
+                if not business.get("email") and business.get("website"):
+                    to_scrape.append(business)
 
-            except Exception as e:
-                self.logger.error(f"Error making request to Grok API: {str(e)}")
-                time.sleep(retry_delay)
-                continue
+                # Validate phone if present
+                if business.get("phone"):
+                    if not self.validate_phone(business["phone"]):
+                        self.logger.warning(f"Invalid phone for {business['name']}: {business['phone']}")
+                        business["phone"] = None
+                    else:
+                        self.logger.info(f"Valid phone found for {business['name']}")
 
-        self.logger.warning(f"Failed to get valid businesses after {max_retries} attempts")
-        return businesses
+                results[owners[row]].append(business)
+                self.logger.info(f"Successfully processed business: {business['name']}")
+
+            # Scrape all queued websites concurrently
+            if to_scrape:
+                self.logger.info(f"Attempting to scrape email from {len(to_scrape)} websites")
+                scraped = self.scrape_business_websites(
+                    [(business["website"], business["name"]) for business in to_scrape]
+                )
+                for business, (email, message) in zip(to_scrape, scraped):
+                    if email:
+                        self.logger.info(f"Found valid email through scraping for {business['name']}: {email}")
+                        business["email"] = email
+                    else:
+                        self.logger.warning(f"Could not find valid email through scraping for {business['name']}: {message}")
+
+        except Exception as e:
+            self.logger.error(f"Error processing businesses from Grok API: {str(e)}")
+
+        return results
 
 def process_city_group(args):
-    """Process a group of cities with a specific API key"""
+    """
+    Process a group of cities with a specific API key.
+
+    The business types of a city are requested concurrently; the client's key pool
+    holds in-flight requests to what the key's rate limits allow, so no fixed delay
+    between requests is needed. With DISCOVERY_BATCH_SIZE above 1, each request asks
+    for that many business types at once.
+    """
     cities, api_key, process_id, existing_names, lock = args
     scraper = BusinessScraper(api_key, process_id)
-    
+    batches = [BUSINESS_TYPES[i:i + DISCOVERY_BATCH_SIZE] for i in range(0, len(BUSINESS_TYPES), DISCOVERY_BATCH_SIZE)]
+
+    def save_businesses(businesses, city, state, business_type):
+        for business in businesses:
+            success = scraper.save_to_firebase(business, business_type, city, state)
+            if success:
+                with lock:
+                    if business['name'].lower().strip() not in existing_names:
+                        existing_names.append(business['name'].lower().strip())
+
+    def process_batch(city, state, batch):
+        if len(batch) == 1:
+            business_type, software_probability, description = batch[0]
+            results = {business_type: scraper.get_businesses_from_grok(
+                city, state, business_type, description,
+                software_probability, existing_names, lock
+            )}
+        else:
+            results = scraper.get_businesses_from_grok_batch(city, state, batch, existing_names, lock)
+
+        for business_type, businesses in results.items():
+            save_businesses(businesses, city, state, business_type)
+
     try:
-        for city, state in cities:
-            for business_type, software_probability, description in BUSINESS_TYPES:
-                businesses = scraper.get_businesses_from_grok(
-                    city, state, business_type, description, 
-                    software_probability, existing_names, lock
-                )
-                
-                if businesses:
-                    for business in businesses:
-                        success = scraper.save_to_firebase(business, business_type, city, state)
-                        if success:
-                            with lock:
-                                if business['name'].lower().strip() not in existing_names:
-                                    existing_names.append(business['name'].lower().strip())
-                
-                # Add delay between requests to avoid rate limiting
-                time.sleep(RATE_LIMIT_DELAY)
+        # The worker threads share the crawler's event loop, so CRAWL_CONCURRENCY bounds them all together
+        with ThreadPoolExecutor(max_workers=scraper.llm.keys.capacity()) as executor:
+            for city, state in cities:
+                list(executor.map(lambda batch: process_batch(city, state, batch), batches))
     finally:
+        scraper.crawler.close()
         # Save scraper log when done
         scraper.save_scraper_log()
 
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+import asyncio
+import codecs
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import aiohttp
+
+from src.config.config import (
+    CRAWL_CONCURRENCY, CRAWL_TIMEOUT, CRAWL_MAX_PAGE_BYTES, CRAWL_CHUNK_BYTES, SITEMAP_MAX_FILES
+)
+from src.scrapers.politeness import HostScheduler
+from src.scrapers.page_cache import PageCache
+from src.scrapers.email_extractor import EMAIL_ADDRESS_PATTERN, iter_email_matches
+from src.scrapers.html_parsing import Page, parse_page
+from src.scrapers.frontier import CrawlFrontier
+from src.scrapers.site_index import (
+    SiteIndex, SiteInfo, can_fetch, contact_candidates, parse_sitemap, rank_child_sitemaps, site_root,
+    sitemap_locations
+)
+
+EmailFinder = Callable[[Page, str], Tuple[Optional[str], str]]
+EmailValidator = Callable[[str], bool]
+
+MAILTO_PATTERN = re.compile(r'mailto:([^"\'<>?\s]+)', re.IGNORECASE)
+
+
+class PageFetch(NamedTuple):
+    html: str
+    email: Optional[str] = None  # set when a valid email was found while streaming
+    message: str = ''
+
+
+class EmailStreamScanner:
+    """
+    Incrementally scans page text for mailto links and email addresses, including
+    the "[at]" / "(at)" obfuscations handled by the shared extractor.
+
+    Text is fed chunk by chunk; a short tail of the previous chunk is kept so that
+    addresses split across chunk boundaries are still found. Each candidate is
+    reported once, and matches touching the end of the buffer are held back until
+    more text arrives so a partial address is never reported.
+    """
+
+    def __init__(self, overlap: int = 256):
+        self.overlap = overlap
+        self.window = ''
+        self.seen: Set[str] = set()
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Add decoded text and return new (email, source) candidates."""
+        previous = self.window
+        self.window = previous[-self.overlap:] + text
+        # A match at the very start of a clipped window may be the tail of a longer address
+        clipped = len(previous) > self.overlap
+        candidates = []
+
+        for match in MAILTO_PATTERN.finditer(self.window):
+            if match.end() == len(self.window):
+                continue
+            email = match.group(1)
+            if EMAIL_ADDRESS_PATTERN.fullmatch(email) and email not in self.seen:
+                self.seen.add(email)
+                candidates.append((email, "mailto link"))
+
+        for start, end, email in iter_email_matches(self.window):
+            if end == len(self.window) or (clipped and start == 0):
+                continue
+            if email not in self.seen:
+                self.seen.add(email)
+                candidates.append((email, "page content"))
+
+        return candidates
+
+
+class AsyncCrawler:
+    """
+    Asyncio crawl engine that searches many business websites for an email at once.
+
+    Every site is crawled the same way as the original blocking scraper (main page
+    first, then contact/about pages up to ``max_depth``), but all fetches share one
+    connection pool and run concurrently, bounded by ``max_in_flight``. Politeness is
+    enforced per host by ``scheduler``, so only repeat hits to the same site wait.
+    Pages are kept in ``cache`` across runs and revalidated with conditional GETs.
+    Each host's robots.txt and sitemap contact pages are kept in ``site_index``.
+
+    Bodies are streamed and capped at ``max_page_bytes``. When ``validate_email`` is
+    given, chunks are scanned as they arrive and the download stops as soon as a
+    valid address is found.
+
+    crawl() runs every call on one background event loop per process, with one
+    session and semaphore, so ``max_in_flight`` bounds the fetches of all the threads
+    that share the crawler.
+    """
+
+    def __init__(self, find_email: EmailFinder, headers_factory: Callable[[], Dict[str, str]],
+                 max_in_flight: int = CRAWL_CONCURRENCY, timeout: float = CRAWL_TIMEOUT,
+                 scheduler: Optional[HostScheduler] = None, cache: Optional[PageCache] = None,
+                 validate_email: Optional[EmailValidator] = None, max_page_bytes: int = CRAWL_MAX_PAGE_BYTES,
+                 site_index: Optional[SiteIndex] = None):
+        self.find_email = find_email
+        self.headers_factory = headers_factory
+        self.validate_email = validate_email
+        self.max_page_bytes = max_page_bytes
+        self.scheduler = scheduler or HostScheduler()
+        self.cache = cache or PageCache()
+        self.site_index = site_index or SiteIndex()
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.logger = logging.getLogger("AsyncCrawler")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_pid: Optional[int] = None
+        self._loop_lock = threading.Lock()
+        self._shared: Optional[Tuple[aiohttp.ClientSession, asyncio.Semaphore]] = None
+
+    def crawl(self, targets: List[Tuple[str, str]], max_depth: int = 2) -> List[Tuple[Optional[str], str]]:
+        """
+        Crawl a list of (url, business_name) targets concurrently.
+        Returns one (email, message) tuple per target, in the same order.
+        """
+        if not targets:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self._crawl_shared(targets, max_depth), self._background_loop())
+        return future.result()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        # Forked workers do not inherit the parent's loop thread, so they start their own
+        with self._loop_lock:
+            if self._loop is None or self._loop_pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._loop_pid = os.getpid()
+                self._shared = None
+                threading.Thread(target=self._loop.run_forever, name="AsyncCrawler", daemon=True).start()
+            return self._loop
+
+    def _session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, ttl_dns_cache=300)
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def _crawl_shared(self, targets: List[Tuple[str, str]], max_depth: int) -> List[Tuple[Optional[str], str]]:
+        # Runs on the background loop, which is the only one touching _shared
+        if self._shared is None:
+            self._shared = (self._session(), asyncio.Semaphore(self.max_in_flight))
+        session, semaphore = self._shared
+        return await self._scrape_all(session, semaphore, targets, max_depth)
+
+    async def crawl_async(self, targets: List[Tuple[str, str]], max_depth: int = 2) -> List[Tuple[Optional[str], str]]:
+        """Async variant of crawl() for callers that already run an event loop; uses a session of its own."""
+        async with self._session() as session:
+            return await self._scrape_all(session, asyncio.Semaphore(self.max_in_flight), targets, max_depth)
+
+    async def _scrape_all(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          targets: List[Tuple[str, str]], max_depth: int) -> List[Tuple[Optional[str], str]]:
+        return await asyncio.gather(*[
+            self.scrape_site(session, semaphore, url, business_name, max_depth)
+            for url, business_name in targets
+        ])
+
+    def close(self):
+        """Close the shared session and stop the background loop, if crawl() started one."""
+        with self._loop_lock:
+            loop, shared = self._loop, self._shared
+            self._loop = self._shared = None
+        if loop is None or self._loop_pid != os.getpid():
+            return
+        if shared is not None:
+            asyncio.run_coroutine_threadsafe(shared[0].close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    async def scrape_site(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          url: str, business_name: str, max_depth: int = 2) -> Tuple[Optional[str], str]:
+        """
+        Scrape one business website for a valid email address.
+
+        The home page is searched first. If it has no valid email, contact pages listed
+        in the site's sitemap and the best-ranked contact-like links are fetched
+        concurrently from a per-site frontier, a batch at a time, until an email is
+        found or the site's page budget runs out. Pages disallowed by robots.txt are skipped.
+        Returns tuple of (email, message) where email is None if no valid email found.
+        """
+        try:
+            result = await self._visit(session, semaphore, url, business_name)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return None, f"Network error: {str(e) or type(e).__name__}"
+        except Exception as e:
+            return None, f"Error scraping website: {str(e)}"
+
+        if result is None:
+            return None, "Response is not HTML content"
+        soup, email, message = result
+        if email:
+            return email, message
+
+        site = await self.site_info(session, semaphore, url)
+        frontier = CrawlFrontier(url, max_depth=max_depth, can_fetch=lambda link: can_fetch(site, link))
+        frontier.add_urls(site.contact_urls)
+        frontier.add_links(soup, url, 0)
+        batch = frontier.next_batch()
+        while batch:
+            results = await asyncio.gather(*[
+                self._visit(session, semaphore, link.url, business_name) for link in batch
+            ], return_exceptions=True)
+
+            # Batches are ranked, so report the best-ranked page that had an email
+            for link, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    self.logger.debug(f"Skipping {link.url}: {result}")
+                    continue
+                if result is not None and result[1]:
+                    return result[1], result[2]
+
+            for link, result in zip(batch, results):
+                if result is not None and not isinstance(result, BaseException):
+                    frontier.add_links(result[0], link.url, link.depth)
+            batch = frontier.next_batch()
+
+        return None, "No valid email found after checking all pages"
+
+    async def _visit(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                     url: str, business_name: str) -> Optional[Tuple[Optional[Page], Optional[str], str]]:
+        """Fetch and search one page. Returns (page, email, message), or None if it is not HTML."""
+        page = await self.fetch(session, semaphore, url)
+        if page is None:
+            return None
+        if page.email:
+            # Found while streaming; the page is incomplete and will not be searched further
+            return None, page.email, page.message
+
+        # Parsing and email validation block, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        soup, (email, message) = await loop.run_in_executor(None, self._parse_and_search, page.html, business_name)
+        return soup, email, message
+
+    async def site_info(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> SiteInfo:
+        """
+        Return robots.txt and the sitemap contact pages for the URL's host.
+        Hosts are looked up in the shared site index first and only fetched when missing or expired.
+        """
+        info = self.site_index.get(url)
+        if info is not None:
+            return info
+
+        root = site_root(url)
+        robots = await self._fetch_text(session, semaphore, root + '/robots.txt') or ''
+        pending = sitemap_locations(robots, root)
+        pages: List[str] = []
+        for _ in range(SITEMAP_MAX_FILES):
+            if not pending:
+                break
+            xml = await self._fetch_text(session, semaphore, pending.pop(0))
+            if xml:
+                found, children = parse_sitemap(xml)
+                pages.extend(found)
+                pending = rank_child_sitemaps(pending + children)
+
+        return self.site_index.put(url, robots, contact_candidates(pages, url))
+
+    async def _fetch_text(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Optional[str]:
+        """Fetch a small text resource such as robots.txt or a sitemap; None if it is unavailable."""
+        if url.lower().endswith('.gz'):
+            return None
+        await self.scheduler.wait_async(url)
+        try:
+            async with semaphore:
+                async with session.get(url, headers=self.headers_factory()) as response:
+                    if response.status != 200:
+                        return None
+                    body = b''
+                    async for chunk in response.content.iter_chunked(CRAWL_CHUNK_BYTES):
+                        body += chunk
+                        if len(body) >= self.max_page_bytes:
+                            break
+                    return body[:self.max_page_bytes].decode(response.charset or 'utf-8', errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError, LookupError) as e:
+            self.logger.debug(f"Could not fetch {url}: {str(e) or type(e).__name__}")
+            return None
+
+    async def fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Optional[PageFetch]:
+        """
+        Fetch a page, or return None if the response is not HTML.
+        Fresh cached pages are returned without a request; stale ones are revalidated.
+        """
+        cached = self.cache.get(url)
+        if cached is not None and self.cache.is_fresh(cached):
+            return PageFetch(cached.body)
+
+        # Only wait if this host was hit recently; other sites proceed in parallel
+        await self.scheduler.wait_async(url)
+
+        headers = self.headers_factory()
+        headers.update(self.cache.conditional_headers(cached))
+
+        async with semaphore:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached is not None:
+                    self.cache.touch(url)
+                    return PageFetch(cached.body)
+
+                response.raise_for_status()
+
+                # Check if we got HTML content
+                content_type = response.headers.get('Content-Type', '')
+                if 'text/html' not in content_type.lower():
+                    return None
+
+                page = await self._read_body(response)
+                if page.email:
+                    # The download stopped early, so there is no complete page to cache
+                    return page
+
+        self.cache.put(url, page.html, content_type, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return page
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> PageFetch:
+        """Stream the body up to max_page_bytes, stopping early once a valid email is seen."""
+        try:
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        scanner = EmailStreamScanner() if self.validate_email else None
+        loop = asyncio.get_running_loop()
+
+        parts = []
+        remaining = self.max_page_bytes
+        async for chunk in response.content.iter_chunked(CRAWL_CHUNK_BYTES):
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+
+            if scanner:
+                for email, source in scanner.feed(text):
+                    # DNS checks block, so run them off the event loop
+                    if await loop.run_in_executor(None, self.validate_email, email):
+                        return PageFetch(''.join(parts), email, f"Valid email found in {source}")
+
+            if remaining <= 0:
+                self.logger.info(f"Stopped reading {response.url} at {self.max_page_bytes} bytes")
+                break
+
+        parts.append(decoder.decode(b'', final=True))
+        return PageFetch(''.join(parts))
+
+    def _parse_and_search(self, html: str, business_name: str) -> Tuple[Page, Tuple[Optional[str], str]]:
+        """Parse a page and run the email finder on it."""
+        soup = parse_page(html)
+        return soup, self.find_email(soup, business_name)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.scrapers.html_parsing import Page
+
+# "@" and its "[at]" / "(at)" obfuscations. Scanning for these anchors first and only
+# then matching the local part and domain around them keeps extraction to a single
+# cheap pass, instead of running every pattern from every word in the page.
+EMAIL_ANCHOR_PATTERN = re.compile(r'@|\[at\]|\(at\)')
+LOCAL_PART_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]{1,64}\s*$')
+DOMAIN_PATTERN = re.compile(r'\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+EMAIL_ADDRESS_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Order in which page sources are checked, cheapest first
+DEFAULT_SOURCES = ('meta', 'mailto', 'form', 'text')
+
+SOURCE_MESSAGES = {
+    'meta': "Valid email found in meta tags",
+    'mailto': "Valid email found in mailto link",
+    'form': "Valid email found in form action",
+    'text': "Valid email found in text content"
+}
+
+
+def iter_email_matches(text: str) -> Iterator[Tuple[int, int, str]]:
+    """Yield (start, end, email) for every email-like candidate, normalized to local@domain."""
+    for anchor in EMAIL_ANCHOR_PATTERN.finditer(text):
+        local = LOCAL_PART_PATTERN.search(text, max(0, anchor.start() - 80), anchor.start())
+        if not local:
+            continue
+        domain = DOMAIN_PATTERN.match(text, anchor.end())
+        if not domain:
+            continue
+        yield local.start(), domain.end(), f"{local.group(0).rstrip()}@{domain.group(1)}"
+
+
+def extract_emails(text: str) -> List[str]:
+    """Return every email-like candidate in the text, normalized, in order, without duplicates."""
+    seen = set()
+    emails = []
+    for _, _, email in iter_email_matches(text):
+        key = email.lower()
+        if key not in seen:
+            seen.add(key)
+            emails.append(email)
+    return emails
+
+
+def _source_candidates(soup: Page, source: str) -> Iterable[str]:
+    """Yield raw candidates from one part of the page."""
+    if source == 'meta':
+        contents = [tag.get('content', '') for tag in soup.find_all('meta')]
+        yield from extract_emails('\n'.join(content for content in contents if isinstance(content, str)))
+    elif source == 'mailto':
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
+            if href.startswith('mailto:'):
+                yield href[7:]
+    elif source == 'form':
+        for form in soup.find_all('form'):
+            action = form.get('action', '')
+            if 'mailto:' in action:
+                yield action.split('mailto:')[1].split('?')[0]
+    elif source == 'text':
+        yield from extract_emails(soup.get_text())
+
+
+def find_email(soup: Page, validate: Callable[[str], bool],
+               sources: Tuple[str, ...] = DEFAULT_SOURCES) -> Tuple[Optional[str], str]:
+    """
+    Search a parsed page for the first email that passes ``validate``.
+
+    Sources are checked in the given order. A candidate that shows up in several
+    places is validated only once.
+    Returns tuple of (email, message) where email is None if no valid email found.
+    """
+    checked: Dict[str, bool] = {}
+    for source in sources:
+        for email in _source_candidates(soup, source):
+            key = email.lower()
+            if key not in checked:
+                checked[key] = validate(email)
+            if checked[key]:
+                return email, SOURCE_MESSAGES[source]
+    return None, "No valid email found on page"
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import heapq
+from typing import Callable, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from src.config.config import CRAWL_MAX_PAGES_PER_SITE, CRAWL_TOP_K
+from src.scrapers.html_parsing import Page
+from src.scrapers.page_cache import canonical_url
+from src.scrapers.politeness import host_key
+
+# Link text / href fragments that suggest a page with contact details, with how likely
+# each one is to lead to an address. Anything scoring zero is never followed.
+CONTACT_TERM_WEIGHTS = {
+    'contact': 10,
+    'get-in-touch': 9,
+    'get in touch': 9,
+    'reach': 6,
+    'email': 6,
+    'support': 4,
+    'about': 3,
+    'team': 2,
+    'location': 2,
+}
+
+# Added to pages the site itself lists in its sitemap, so they are tried before guessed links
+SITEMAP_BONUS = 5
+
+# Paths that mention a contact term but never hold contact details
+IGNORED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.doc', '.docx', '.mp4')
+
+
+class FrontierLink(NamedTuple):
+    url: str
+    score: float
+    depth: int
+
+
+def resolve_link(base_url: str, href: str) -> Optional[str]:
+    """Resolve a link against the page it was found on, returning None for non-web links."""
+    href = (href or '').strip()
+    if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+        return None
+    absolute = urljoin(base_url, href)
+    parts = urlsplit(absolute)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return None
+    if parts.path.lower().endswith(IGNORED_EXTENSIONS):
+        return None
+    return canonical_url(absolute)
+
+
+def score_link(url: str, text: str) -> float:
+    """Score how likely a link is to lead to contact details; 0 means do not follow."""
+    path = urlsplit(url).path.lower()
+    text = ' '.join(text.lower().split())
+    score = 0.0
+    for term, weight in CONTACT_TERM_WEIGHTS.items():
+        if term in path:
+            score += weight
+        if term in text:
+            score += weight * 1.5  # visible link text is the stronger signal
+    if score:
+        # Prefer shallow pages: /contact over /blog/2019/contact-form-plugin-review
+        score -= path.rstrip('/').count('/')
+    return max(score, 0.0)
+
+
+class CrawlFrontier:
+    """
+    Per-site crawl frontier for the contact-page search.
+
+    Links are resolved with urljoin and canonicalized, so every page is fetched at most
+    once per site. Candidates are kept ranked by how likely they are to hold contact
+    details, and at most ``top_k`` are handed out per batch. No more than ``max_pages``
+    pages (the home page included) are ever fetched for one site, and links to other
+    sites or disallowed by ``can_fetch`` (robots.txt) are ignored.
+    """
+
+    def __init__(self, root_url: str, max_depth: int = 2, max_pages: int = CRAWL_MAX_PAGES_PER_SITE,
+                 top_k: int = CRAWL_TOP_K, can_fetch: Optional[Callable[[str], bool]] = None):
+        self.root_url = root_url
+        self.can_fetch = can_fetch
+        self.host = host_key(canonical_url(root_url))
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.top_k = top_k
+        self.visited: Set[str] = {canonical_url(root_url)}
+        self.fetched = 1
+        self._queued: Set[str] = set()
+        self._heap: List[Tuple[float, int, FrontierLink]] = []
+        self._counter = 0
+
+    def add_links(self, page: Page, page_url: str, depth: int):
+        """Queue the contact-like links on a page fetched at ``depth`` (the home page is depth 0)."""
+        if depth >= self.max_depth:
+            return
+        for link in page.find_all('a', href=True):
+            url = resolve_link(page_url, link.get('href', ''))
+            if url is not None:
+                self._push(url, score_link(url, link.get_text()), depth + 1)
+
+    def add_urls(self, urls: Iterable[str], depth: int = 1, bonus: float = SITEMAP_BONUS):
+        """Queue known page URLs, e.g. contact pages listed in the site's sitemap."""
+        for url in urls:
+            url = resolve_link(self.root_url, url)
+            if url is not None:
+                # There is no link text, so the last path segment stands in for it
+                slug = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').replace('_', ' ')
+                self._push(url, score_link(url, slug) + bonus, depth)
+
+    def _push(self, url: str, score: float, depth: int):
+        if score <= 0 or url in self.visited or url in self._queued or host_key(url) != self.host:
+            return
+        if self.can_fetch is not None and not self.can_fetch(url):
+            return
+        self._queued.add(url)
+        self._counter += 1
+        heapq.heappush(self._heap, (-score, self._counter, FrontierLink(url, score, depth)))
+
+    def next_batch(self) -> List[FrontierLink]:
+        """Pop the best-ranked unvisited links, bounded by top_k and the remaining page budget."""
+        batch = []
+        limit = min(self.top_k, self.max_pages - self.fetched)
+        while self._heap and len(batch) < limit:
+            _, _, link = heapq.heappop(self._heap)
+            self._queued.discard(link.url)
+            if link.url in self.visited:
+                continue
+            self.visited.add(link.url)
+            batch.append(link)
+        self.fetched += len(batch)
+        return batch
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import html
+import logging
+import re
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.config.config import HTML_PARSER, HTML_STRAINED
+
+# The only tags the email and contact-page search ever inspect
+EXTRACTION_TAGS = ['meta', 'a', 'form']
+
+# Content BeautifulSoup leaves out of get_text(): comments, scripts, styles and templates
+IGNORED_BLOCK_PATTERN = re.compile(r'<!--.*?-->|<(script|style|template)\b[^>]*>.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+CDATA_PATTERN = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+# A bare '<' ("5<10") is text, and a '>' inside a quoted attribute value does not end the tag
+TAG_PATTERN = re.compile(r'<[A-Za-z/!?](?:"[^"]*"|\'[^\']*\'|[^\'">])*>')
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_parser(name: str) -> str:
+    """Return the requested BeautifulSoup backend, falling back to html.parser if it is not installed."""
+    if name in ('lxml', 'lxml-xml', 'xml'):
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning(f"Parser '{name}' is not installed, falling back to html.parser")
+            return 'html.parser'
+    return name
+
+
+def visible_text(markup: str) -> str:
+    """Return the page text the way soup.get_text() does, without building a tree."""
+    text = IGNORED_BLOCK_PATTERN.sub('', markup)
+    text = CDATA_PATTERN.sub(lambda match: match.group(1), text)
+    return html.unescape(TAG_PATTERN.sub('', text))
+
+
+class ParsedPage:
+    """
+    Strained parse of a page for email and contact-page extraction.
+
+    Only <meta>, <a> and <form> elements are materialized as a tree; the visible text
+    is produced by a single regex pass when first asked for. Exposes the find_all()
+    and get_text() calls the extractors use, so it can stand in for a full soup.
+    """
+
+    def __init__(self, markup: str, parser: str = HTML_PARSER):
+        self.markup = markup
+        self.soup = BeautifulSoup(markup, resolve_parser(parser), parse_only=SoupStrainer(EXTRACTION_TAGS))
+        self._text: Optional[str] = None
+
+    def find_all(self, *args, **kwargs):
+        return self.soup.find_all(*args, **kwargs)
+
+    def get_text(self) -> str:
+        if self._text is None:
+            self._text = visible_text(self.markup)
+        return self._text
+
+
+Page = Union[BeautifulSoup, ParsedPage]
+
+
+def parse_page(markup: str, parser: str = HTML_PARSER, strained: bool = HTML_STRAINED) -> Page:
+    """Parse a page with the configured backend, materializing only the tags we inspect when strained."""
+    if strained:
+        return ParsedPage(markup, parser)
+    return BeautifulSoup(markup, resolve_parser(parser))
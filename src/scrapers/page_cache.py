@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from src.config.config import PAGE_CACHE_PATH, PAGE_CACHE_TTL, PAGE_CACHE_MAX_BYTES
+
+
+class CachedPage(NamedTuple):
+    url: str
+    body: str
+    content_type: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so the same page always maps to the same cache key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class PageCache:
+    """
+    Persistent, compressed cache of crawled pages stored in SQLite.
+
+    Pages are keyed by canonical URL and keep their ETag/Last-Modified validators.
+    Within ``ttl`` seconds a page is served without any request; after that it should
+    be revalidated with a conditional GET. The store is shared by all worker processes
+    and evicts least recently used pages once it grows past ``max_bytes``.
+    """
+
+    def __init__(self, path: str = PAGE_CACHE_PATH, ttl: float = PAGE_CACHE_TTL,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across forked processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    content_type TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+            # Running total of stored bytes, so eviction checks need no scan of the table
+            conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute(
+                "INSERT OR IGNORE INTO cache_meta SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM pages"
+            )
+            conn.executescript("""
+                CREATE TRIGGER IF NOT EXISTS pages_size_insert AFTER INSERT ON pages BEGIN
+                    UPDATE cache_meta SET value = value + new.size WHERE name = 'total_bytes';
+                END;
+                CREATE TRIGGER IF NOT EXISTS pages_size_update AFTER UPDATE OF size ON pages BEGIN
+                    UPDATE cache_meta SET value = value + new.size - old.size WHERE name = 'total_bytes';
+                END;
+                CREATE TRIGGER IF NOT EXISTS pages_size_delete AFTER DELETE ON pages BEGIN
+                    UPDATE cache_meta SET value = value - old.size WHERE name = 'total_bytes';
+                END;
+            """)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for a URL, fresh or stale, or None if it was never stored."""
+        key = canonical_url(url)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT body, content_type, etag, last_modified, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), key))
+            self.stats['hits'] += 1
+
+        body, content_type, etag, last_modified, fetched_at = row
+        return CachedPage(key, zlib.decompress(body).decode('utf-8'), content_type, etag, last_modified, fetched_at)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Check whether a cached page can be used without revalidating it."""
+        return time.time() - page.fetched_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(page: Optional[CachedPage]) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for revalidating a cached page."""
+        headers = {}
+        if page is not None:
+            if page.etag:
+                headers['If-None-Match'] = page.etag
+            if page.last_modified:
+                headers['If-Modified-Since'] = page.last_modified
+        return headers
+
+    def put(self, url: str, body: str, content_type: str = '', etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a freshly downloaded page and evict old pages if the cache is over budget."""
+        key = canonical_url(url)
+        compressed = zlib.compress(body.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the triggers
+            conn.execute("""
+                INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    body = excluded.body, content_type = excluded.content_type, etag = excluded.etag,
+                    last_modified = excluded.last_modified, fetched_at = excluded.fetched_at,
+                    last_access = excluded.last_access, size = excluded.size
+            """, (key, compressed, content_type, etag, last_modified, now, now, len(compressed)))
+            self.stats['stores'] += 1
+            self._evict(conn)
+
+    def touch(self, url: str):
+        """Mark a cached page as revalidated (e.g. after a 304 Not Modified)."""
+        now = time.time()
+        with self._lock:
+            self._connection().execute(
+                "UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, canonical_url(url))
+            )
+            self.stats['revalidated'] += 1
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used pages until the cache fits in max_bytes."""
+        excess = conn.execute("SELECT value FROM cache_meta WHERE name = 'total_bytes'").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        # Walk the last_access index only as far as needed, then delete those pages at once
+        count, freed = 0, 0
+        for (size,) in conn.execute("SELECT size FROM pages ORDER BY last_access"):
+            count += 1
+            freed += size
+            if freed >= excess:
+                break
+        conn.execute("DELETE FROM pages WHERE url IN (SELECT url FROM pages ORDER BY last_access LIMIT ?)", (count,))
+        self.stats['evictions'] += count
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import asyncio
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+from src.config.config import CRAWL_MIN_INTERVAL, CRAWL_HOST_BURST
+
+
+def host_key(url: str) -> str:
+    """Return the host a URL belongs to, ignoring a leading www."""
+    host = urlparse(url).netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class HostScheduler:
+    """
+    Per-host politeness scheduler built on one token bucket per host.
+
+    Each host refills one token every ``min_interval`` seconds, up to ``burst`` tokens.
+    Requests to different hosts never wait on each other; only repeat hits to the same
+    site are spaced out. Works from threads (wait) and from asyncio (wait_async).
+    """
+
+    def __init__(self, min_interval: float = CRAWL_MIN_INTERVAL, burst: int = CRAWL_HOST_BURST):
+        self.min_interval = min_interval
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self._waiting: Dict[str, int] = {}
+        self._stats = {
+            'requests': 0,
+            'delayed_requests': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'max_queue_depth': 0
+        }
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for the URL's host and return how long the caller must wait.
+        The reservation is made immediately, so concurrent callers queue up in order.
+        """
+        host = host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, {'tokens': float(self.burst), 'updated': now})
+
+            # Refill tokens for the time elapsed since the last reservation
+            if self.min_interval > 0:
+                elapsed = now - bucket['updated']
+                bucket['tokens'] = min(float(self.burst), bucket['tokens'] + elapsed / self.min_interval)
+            else:
+                bucket['tokens'] = float(self.burst)
+            bucket['updated'] = now
+
+            bucket['tokens'] -= 1
+            delay = max(0.0, -bucket['tokens'] * self.min_interval)
+
+            self._stats['requests'] += 1
+            if delay > 0:
+                self._stats['delayed_requests'] += 1
+                self._stats['total_wait_seconds'] += delay
+                self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], delay)
+            return delay
+
+    def wait(self, url: str):
+        """Block the current thread until the URL's host may be hit again."""
+        delay = self.reserve(url)
+        if delay > 0:
+            self._enter_queue(url)
+            try:
+                time.sleep(delay)
+            finally:
+                self._leave_queue(url)
+
+    async def wait_async(self, url: str):
+        """Suspend the current task until the URL's host may be hit again."""
+        delay = self.reserve(url)
+        if delay > 0:
+            self._enter_queue(url)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._leave_queue(url)
+
+    def _enter_queue(self, url: str):
+        host = host_key(url)
+        with self._lock:
+            self._waiting[host] = self._waiting.get(host, 0) + 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._waiting[host])
+
+    def _leave_queue(self, url: str):
+        host = host_key(url)
+        with self._lock:
+            self._waiting[host] -= 1
+            if not self._waiting[host]:
+                del self._waiting[host]
+
+    def stats(self) -> Dict:
+        """Return queue-depth and wait-time statistics for tuning crawl throughput."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['hosts'] = len(self._buckets)
+            stats['queue_depth'] = dict(self._waiting)
+            stats['avg_wait_seconds'] = (
+                stats['total_wait_seconds'] / stats['delayed_requests'] if stats['delayed_requests'] else 0.0
+            )
+            return stats
@@ -1,10 +1,19 @@
 import requests
-from bs4 import BeautifulSoup
-import re
 from email_validator import validate_email
-import time
 from typing import Optional, Tuple
 import random
+from src.scrapers.politeness import HostScheduler
+from src.scrapers.page_cache import PageCache
+from src.scrapers.email_extractor import find_email
+from src.scrapers.html_parsing import Page, parse_page
+from src.scrapers.frontier import CrawlFrontier
+from src.utils.http_transport import get_session
+
+# Spaces out repeat requests to the same host; different hosts are not throttled
+scheduler = HostScheduler()
+
+# Pages downloaded by earlier runs, revalidated with conditional GETs once stale
+page_cache = PageCache()
 
 def get_random_user_agent():
     """Return a random user agent string."""
@@ -28,146 +37,79 @@ def get_headers():
         'Cache-Control': 'max-age=0'
     }
 
-def find_valid_email(soup: BeautifulSoup, business_name: str) -> Tuple[Optional[str], str]:
+def find_valid_email(soup: Page, business_name: str) -> Tuple[Optional[str], str]:
     """
     Search for valid email addresses in the webpage.
     Returns tuple of (email, message) where email is None if no valid email found.
     """
-    # Common email patterns to look for
-    email_patterns = [
-        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # Standard email
-        r'[a-zA-Z0-9._%+-]+\s*\[at\]\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # [at] format
-        r'[a-zA-Z0-9._%+-]+\s*\(at\)\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # (at) format
-        r'[a-zA-Z0-9._%+-]+\s*@\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'  # Spaced @ format
-    ]
-    
-    # Common email prefixes to look for
-    email_prefixes = [
-        'email', 'contact', 'info', 'support', 'help', 'inquiries',
-        'business', 'office', 'admin', 'sales', 'marketing'
-    ]
-    
-    # First try to find email in meta tags
-    meta_tags = soup.find_all('meta')
-    for tag in meta_tags:
-        content = tag.get('content', '')
-        for pattern in email_patterns:
-            matches = re.findall(pattern, content)
-            for email in matches:
-                # Clean up the email
-                email = re.sub(r'\s*\[at\]\s*', '@', email)
-                email = re.sub(r'\s*\(at\)\s*', '@', email)
-                email = re.sub(r'\s*@\s*', '@', email)
-                
-                # Validate the email
-                is_valid, message = validate_email(email)
-                if is_valid:
-                    return email, "Valid email found in meta tags"
+    # Text content is checked before links here; it already covers text around contact forms
+    return find_email(soup, lambda email: validate_email(email)[0], sources=('meta', 'text', 'mailto', 'form'))
+
+def fetch_page(url: str) -> Optional[str]:
+    """
+    Return the HTML for a URL, or None if the response is not HTML.
+    Fresh cached pages are returned without a request; stale ones are revalidated.
+    """
+    cached = page_cache.get(url)
+    if cached is not None and page_cache.is_fresh(cached):
+        return cached.body
     
-    # Look for email in text content
-    text_content = soup.get_text()
-    for pattern in email_patterns:
-        matches = re.findall(pattern, text_content)
-        for email in matches:
-            # Clean up the email
-            email = re.sub(r'\s*\[at\]\s*', '@', email)
-            email = re.sub(r'\s*\(at\)\s*', '@', email)
-            email = re.sub(r'\s*@\s*', '@', email)
-            
-            # Validate the email
-            is_valid, message = validate_email(email)
-            if is_valid:
-                return email, "Valid email found in text content"
+    # Wait only if this host was requested recently
+    scheduler.wait(url)
     
-    # Look for email in href attributes
-    links = soup.find_all('a', href=True)
-    for link in links:
-        href = link.get('href', '')
-        if href.startswith('mailto:'):
-            email = href[7:]  # Remove 'mailto:' prefix
-            is_valid, message = validate_email(email)
-            if is_valid:
-                return email, "Valid email found in mailto link"
+    # Make request with browser-like headers
+    headers = get_headers()
+    headers.update(page_cache.conditional_headers(cached))
+    response = get_session('web').get(url, headers=headers, timeout=10)
+    if response.status_code == 304 and cached is not None:
+        page_cache.touch(url)
+        return cached.body
+    response.raise_for_status()
     
-    # Look for contact forms
-    forms = soup.find_all('form')
-    for form in forms:
-        # Check form action for email
-        action = form.get('action', '')
-        if 'mailto:' in action:
-            email = action.split('mailto:')[1].split('?')[0]
-            is_valid, message = validate_email(email)
-            if is_valid:
-                return email, "Valid email found in form action"
-        
-        # Check form fields for email hints
-        inputs = form.find_all('input')
-        for input_field in inputs:
-            placeholder = input_field.get('placeholder', '').lower()
-            name = input_field.get('name', '').lower()
-            if any(prefix in placeholder or prefix in name for prefix in email_prefixes):
-                # Look for email in nearby text
-                parent = input_field.parent
-                if parent:
-                    text = parent.get_text()
-                    for pattern in email_patterns:
-                        matches = re.findall(pattern, text)
-                        for email in matches:
-                            email = re.sub(r'\s*\[at\]\s*', '@', email)
-                            email = re.sub(r'\s*\(at\)\s*', '@', email)
-                            email = re.sub(r'\s*@\s*', '@', email)
-                            
-                            is_valid, message = validate_email(email)
-                            if is_valid:
-                                return email, "Valid email found near contact form"
+    # Check if we got HTML content
+    content_type = response.headers.get('Content-Type', '')
+    if 'text/html' not in content_type.lower():
+        return None
     
-    return None, "No valid email found on page"
+    page_cache.put(url, response.text, content_type, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return response.text
 
 def scrape_business_website(url: str, business_name: str, max_depth: int = 2) -> Tuple[Optional[str], str]:
     """
     Scrape business website for valid email address.
+    The home page is searched first, then the best-ranked contact pages, each at most once.
     Returns tuple of (email, message) where email is None if no valid email found.
     """
     try:
-        # Add random delay between 2-5 seconds to be respectful to servers
-        time.sleep(random.uniform(2, 5))
-        
-        # Make request with browser-like headers
-        response = requests.get(url, headers=get_headers(), timeout=10)
-        response.raise_for_status()
-        
-        # Check if we got HTML content
-        if 'text/html' not in response.headers.get('Content-Type', '').lower():
+        html = fetch_page(url)
+        if html is None:
             return None, "Response is not HTML content"
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = parse_page(html)
         
         # First try to find email on main page
         email, message = find_valid_email(soup, business_name)
         if email:
             return email, message
         
-        # If no valid email found and we haven't reached max depth, look for contact page
-        if max_depth > 0:
-            # Look for contact page link
-            contact_links = soup.find_all('a', href=True)
-            for link in contact_links:
-                href = link.get('href', '').lower()
-                text = link.get_text().lower()
-                
-                # Check if this is likely a contact page
-                if any(term in href or term in text for term in ['contact', 'about', 'reach', 'get-in-touch']):
-                    # Make sure the URL is absolute
-                    if not href.startswith(('http://', 'https://')):
-                        if href.startswith('/'):
-                            href = url.rstrip('/') + href
-                        else:
-                            href = url.rstrip('/') + '/' + href
-                    
-                    # Recursively search contact page
-                    email, message = scrape_business_website(href, business_name, max_depth - 1)
-                    if email:
-                        return email, message
+        # Then work through likely contact pages, best first, within the site's page budget
+        frontier = CrawlFrontier(url, max_depth=max_depth)
+        frontier.add_links(soup, url, 0)
+        batch = frontier.next_batch()
+        while batch:
+            for link in batch:
+                try:
+                    html = fetch_page(link.url)
+                except requests.exceptions.RequestException:
+                    continue
+                if html is None:
+                    continue
+                soup = parse_page(html)
+                email, message = find_valid_email(soup, business_name)
+                if email:
+                    return email, message
+                frontier.add_links(soup, link.url, link.depth)
+            batch = frontier.next_batch()
         
         return None, "No valid email found after checking all pages"
         
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from src.config.config import SITE_INDEX_PATH, SITE_INDEX_TTL, SITEMAP_MAX_CONTACT_URLS
+from src.scrapers.frontier import score_link
+from src.scrapers.politeness import host_key
+
+SITEMAP_ENTRY_PATTERN = re.compile(r'<(url|sitemap)\b[^>]*>.*?<loc>\s*(?:<!\[CDATA\[)?\s*(.*?)\s*(?:\]\]>)?\s*</loc>',
+                                   re.DOTALL | re.IGNORECASE)
+
+# Child sitemaps named like these list pages; posts, products and media rarely hold contact details
+PAGE_SITEMAP_TERMS = ('page', 'main', 'site')
+NOISY_SITEMAP_TERMS = ('post', 'product', 'image', 'video', 'news', 'tag', 'category', 'author')
+
+
+class SiteInfo(NamedTuple):
+    host: str
+    robots: str  # robots.txt body, empty when the site has none
+    contact_urls: List[str]  # contact-like pages listed in the sitemaps, best first
+    fetched_at: float
+
+
+def site_root(url: str) -> str:
+    """Return scheme://host for a URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme or 'https'}://{parts.netloc}"
+
+
+@lru_cache(maxsize=1024)
+def robots_parser(robots: str) -> RobotFileParser:
+    """Build a parser for a robots.txt body (cached, since hosts share few distinct bodies)."""
+    parser = RobotFileParser()
+    parser.parse(robots.splitlines())
+    return parser
+
+
+def can_fetch(info: SiteInfo, url: str, user_agent: str = '*') -> bool:
+    """Check a URL against the host's robots.txt rules."""
+    if not info.robots:
+        return True
+    return robots_parser(info.robots).can_fetch(user_agent, url)
+
+
+def sitemap_locations(robots: str, root: str) -> List[str]:
+    """Return the sitemaps declared in robots.txt, or the conventional /sitemap.xml."""
+    declared = robots_parser(robots).site_maps() if robots else None
+    return list(declared) if declared else [root + '/sitemap.xml']
+
+
+def parse_sitemap(xml: str) -> Tuple[List[str], List[str]]:
+    """Split a sitemap document into (page URLs, child sitemap URLs)."""
+    pages, children = [], []
+    for kind, loc in SITEMAP_ENTRY_PATTERN.findall(xml):
+        loc = loc.replace('&amp;', '&')
+        (children if kind.lower() == 'sitemap' else pages).append(loc)
+    return pages, children
+
+
+def rank_child_sitemaps(urls: Iterable[str]) -> List[str]:
+    """Order child sitemaps so the ones listing site pages are read first."""
+    def priority(url: str) -> int:
+        name = url.lower().rsplit('/', 1)[-1].replace('sitemap', '')
+        if any(term in name for term in PAGE_SITEMAP_TERMS):
+            return 0
+        if any(term in name for term in NOISY_SITEMAP_TERMS):
+            return 2
+        return 1
+    return sorted(urls, key=priority)
+
+
+def contact_candidates(urls: Iterable[str], site_url: str, limit: int = SITEMAP_MAX_CONTACT_URLS) -> List[str]:
+    """Pick the same-site sitemap URLs most likely to be contact pages, best first."""
+    host = host_key(site_url)
+    scored = {}
+    for url in urls:
+        if host_key(url) != host:
+            continue
+        score = score_link(url, '')
+        if score > 0:
+            scored[url] = score
+    return sorted(scored, key=lambda url: -scored[url])[:limit]
+
+
+class SiteIndex:
+    """
+    Persistent per-host store of robots.txt and the contact-like pages found in sitemaps.
+
+    Hosts are fetched once and reused by every worker process and later runs until
+    ``ttl`` expires, so a site's discovery cost is paid once per ``ttl`` rather than
+    once per crawl. Hosts without robots.txt or sitemaps are stored too, so they are
+    not probed again.
+    """
+
+    def __init__(self, path: str = SITE_INDEX_PATH, ttl: float = SITE_INDEX_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across forked processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sites (
+                    host TEXT PRIMARY KEY,
+                    robots TEXT NOT NULL,
+                    contact_urls TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, url: str) -> Optional[SiteInfo]:
+        """Return the stored info for the URL's host, or None if it is missing or expired."""
+        host = host_key(url)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT robots, contact_urls, fetched_at FROM sites WHERE host = ?", (host,)
+            ).fetchone()
+            if row is None or time.time() - row[2] >= self.ttl:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return SiteInfo(host, row[0], json.loads(row[1]), row[2])
+
+    def put(self, url: str, robots: str, contact_urls: List[str]) -> SiteInfo:
+        """Store what was discovered for the URL's host."""
+        info = SiteInfo(host_key(url), robots, contact_urls, time.time())
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO sites VALUES (?, ?, ?, ?)",
+                (info.host, info.robots, json.dumps(info.contact_urls), info.fetched_at)
+            )
+            self.stats['stores'] += 1
+        return info
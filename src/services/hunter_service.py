@@ -1,22 +1,58 @@
 import os
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.config.config import (
+    HUNTER_BULK_PATH, HUNTER_BULK_MIN_SIZE, HUNTER_BULK_POLL_INTERVAL, HUNTER_BULK_TIMEOUT,
+    HUNTER_RATE_LIMIT, HUNTER_MAX_CONCURRENCY
+)
+from src.utils.http_transport import get_session
+from src.scrapers.politeness import HostScheduler
+from src.utils.domain_blocklist import blocked_domain_kind
+from src.services.verification_cache import VerificationCache, normalize_email
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+def is_deliverable(status, score):
+    """
+    Consider email valid if:
+    1. Status is 'valid' or 'accept-all'
+    2. Score is above 50
+    """
+    return (status in ['valid', 'accept-all']) and (score or 0) > 50
+
 class HunterService:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.api_key = os.getenv('HUNTER_API_KEY')
         self.base_url = "https://api.hunter.io/v2"
+        self.cache = cache or VerificationCache()
+        # Spaces out single email-verifier calls to stay under Hunter's rate limit
+        self.rate_limiter = HostScheduler(min_interval=1.0 / HUNTER_RATE_LIMIT, burst=HUNTER_RATE_LIMIT)
+        self.bulk_poll_interval = HUNTER_BULK_POLL_INTERVAL
+        self.bulk_timeout = HUNTER_BULK_TIMEOUT
 
     def verify_email(self, email):
         """Verify if an email address is valid using Hunter.io API."""
         try:
             print(f"DEBUG: Verifying email: {email}")
             
+            # Don't spend Hunter quota on disposable or role-only domains
+            blocked = blocked_domain_kind(email.rsplit('@', 1)[-1]) if '@' in email else None
+            if blocked:
+                print(f"DEBUG: Skipping {blocked} domain: {email}")
+                return False
+            
+            # Reuse a recent verification of the same address
+            cached = self.cache.get(email)
+            if cached is not None:
+                is_valid = is_deliverable(cached.status, cached.score)
+                print(f"DEBUG: Cached verification - Status: {cached.status}, Score: {cached.score}, Valid: {is_valid}")
+                return is_valid
+            
             # Make request to Hunter.io API
-            response = requests.get(
+            self.rate_limiter.wait(self.base_url)
+            response = get_session('hunter').get(
                 f"{self.base_url}/email-verifier",
                 params={
                     "email": email,
@@ -34,11 +70,10 @@ class HunterService:
                 # Check verification status
                 status = result.get('status')
                 score = result.get('score', 0)
+                if status:
+                    self.cache.put(email, status, score)
                 
-                # Consider email valid if:
-                # 1. Status is 'valid' or 'accept-all'
-                # 2. Score is above 50
-                is_valid = (status in ['valid', 'accept-all']) and score > 50
+                is_valid = is_deliverable(status, score)
                 
                 print(f"DEBUG: Email verification result - Status: {status}, Score: {score}, Valid: {is_valid}")
                 return is_valid
@@ -50,13 +85,105 @@ class HunterService:
             print(f"Error verifying email: {e}")
             return False
 
+    def verify_emails(self, emails, min_bulk_size=HUNTER_BULK_MIN_SIZE):
+        """
+        Verify many addresses; returns {normalized email: is_valid}.
+
+        Blocklisted and recently verified addresses are answered locally. Lists of at
+        least ``min_bulk_size`` remaining addresses are submitted as one bulk job whose
+        results are streamed into the cache while it runs. Anything the job does not
+        cover (or everything, if the bulk endpoint is unavailable) falls back to
+        concurrent single calls under the rate limit.
+        """
+        results = {}
+        pending = []
+        for email in dict.fromkeys(normalize_email(email) for email in emails if email):
+            domain = email.rsplit('@', 1)[-1] if '@' in email else ''
+            if not domain or blocked_domain_kind(domain):
+                results[email] = False
+                continue
+            cached = self.cache.get(email)
+            if cached is not None:
+                results[email] = is_deliverable(cached.status, cached.score)
+            else:
+                pending.append(email)
+
+        if len(pending) >= min_bulk_size:
+            results.update(self.verify_bulk(pending))
+            pending = [email for email in pending if email not in results]
+
+        if pending:
+            print(f"DEBUG: Verifying {len(pending)} emails with single calls")
+            with ThreadPoolExecutor(max_workers=HUNTER_MAX_CONCURRENCY) as executor:
+                results.update(zip(pending, executor.map(self.verify_email, pending)))
+        return results
+
+    def verify_bulk(self, emails):
+        """
+        Verify a list as one Hunter bulk job; returns {email: is_valid} for the addresses it covered.
+
+        The job is submitted with POST {base_url}/{HUNTER_BULK_PATH} and polled with
+        GET {base_url}/{HUNTER_BULK_PATH}/{id}?offset=N, which returns the status and
+        the results after the first N. Each result is cached as soon as it arrives.
+        Returns an empty dict if the job cannot be submitted.
+        """
+        results = {}
+        timeout = self.bulk_timeout
+        try:
+            response = get_session('hunter').post(
+                f"{self.base_url}/{HUNTER_BULK_PATH}",
+                params={"api_key": self.api_key},
+                json={"emails": list(emails)}
+            )
+            if response.status_code not in (200, 201, 202):
+                print(f"Bulk verification unavailable: {response.status_code} - {response.text}")
+                return results
+            job_id = response.json().get('data', {}).get('id')
+            print(f"DEBUG: Submitted bulk verification job {job_id} for {len(emails)} emails")
+
+            offset = 0
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                response = get_session('hunter').get(
+                    f"{self.base_url}/{HUNTER_BULK_PATH}/{job_id}",
+                    params={"api_key": self.api_key, "offset": offset}
+                )
+                if response.status_code != 200:
+                    print(f"Failed to poll bulk verification: {response.status_code} - {response.text}")
+                    break
+                data = response.json().get('data', {})
+
+                # Stream this batch of results into the cache
+                for result in data.get('results', []):
+                    email, status, score = result.get('email'), result.get('status'), result.get('score', 0)
+                    offset += 1
+                    if email and status:
+                        self.cache.put(email, status, score)
+                        results[normalize_email(email)] = is_deliverable(status, score)
+
+                if data.get('status') in ('completed', 'failed'):
+                    break
+                time.sleep(self.bulk_poll_interval)
+            else:
+                print(f"Bulk verification job {job_id} timed out after {timeout} seconds")
+
+        except Exception as e:
+            print(f"Error during bulk verification: {e}")
+
+        print(f"DEBUG: Bulk verification covered {len(results)} of {len(emails)} emails")
+        return results
+
+    def cache_stats(self):
+        """Verification cache hits, misses and hit rate."""
+        return self.cache.summary()
+
     def find_email(self, domain, first_name=None, last_name=None):
         """Find email address for a domain using Hunter.io API."""
         try:
             print(f"DEBUG: Finding email for domain: {domain}")
             
             # Make request to Hunter.io API
-            response = requests.get(
+            response = get_session('hunter').get(
                 f"{self.base_url}/email-finder",
                 params={
                     "domain": domain,
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from src.config.config import LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+
+# Payload fields that do not change what the model answers
+UNCACHED_FIELDS = ('stream', 'user')
+
+
+def cache_key(payload: Dict) -> str:
+    """Hash of the model, messages and sampling parameters of a completion request."""
+    request = {name: value for name, value in payload.items() if name not in UNCACHED_FIELDS}
+    canonical = json.dumps(request, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent, compressed cache of chat-completion responses stored in SQLite.
+
+    Responses are keyed by cache_key() of the request payload and reused for ``ttl``
+    seconds, so re-running a deterministic (temperature 0) prompt costs no API call.
+    The store is shared by all worker processes and evicts least recently used
+    responses once it grows past ``max_bytes``.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across forked processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response body for a key, or None if it is missing or expired."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                self.stats['misses'] += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.stats['hits'] += 1
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put(self, key: str, body: Dict):
+        """Store a response body and evict old responses if the cache is over budget."""
+        compressed = zlib.compress(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, compressed, now, now, len(compressed))
+            )
+            self.stats['stores'] += 1
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete expired responses, then least recently used ones until the cache fits in max_bytes."""
+        conn.execute("DELETE FROM responses WHERE stored_at <= ?", (time.time() - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while total > self.max_bytes:
+            row = conn.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 1").fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
+            self.stats['evictions'] += 1
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def summary(self) -> Dict:
+        """Stats plus the hit rate, for logs."""
+        return {**self.stats, 'hit_rate': f"{self.hit_rate() * 100:.2f}%"}
@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+import requests
+
+from src.config.config import (
+    GROK_API_KEYS, GROK_API_URL, GROK_MODEL, LLM_CONCURRENCY_PER_KEY, LLM_MIN_CONCURRENCY_PER_KEY,
+    LLM_MAX_CONCURRENCY_PER_KEY, LLM_AIMD_INCREASE, LLM_AIMD_DECREASE, LLM_RATE_LIMIT_COOLDOWN,
+    LLM_MAX_RETRIES, LLM_BACKOFF_FACTOR, LLM_TIMEOUT, LLM_CACHE_ENABLED, LLM_CACHE_PATH
+)
+from src.services.llm_cache import ResponseCache, cache_key
+from src.utils.http_transport import get_session, upstream_settings
+from src.utils.json_repair import JSONRepairError, extract_json, repair_json, salvage_items, validate
+from src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Rate limits and server errors are retried (on another key when there is one)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# How often async callers re-check for a free key slot
+ASYNC_POLL_INTERVAL = 0.05
+
+# Rate-limit reset values come as seconds or Go-style durations ("1m30s", "250ms")
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+class LLMError(Exception):
+    """A completion request failed; ``status`` is the last HTTP status, if any."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LLMResponseError(LLMError):
+    """
+    The completion arrived but its content was not the JSON the caller asked for;
+    ``errors`` lists the fields that failed schema validation, if any.
+    """
+
+    def __init__(self, message: str, content: str, errors: Optional[List[str]] = None):
+        super().__init__(message)
+        self.content = content
+        self.errors = errors or []
+
+
+def message_content(response: Dict) -> str:
+    """Return the first choice's message content from a chat-completion response."""
+    return (response.get('choices') or [{}])[0].get('message', {}).get('content') or ''
+
+
+def parse_json_content(content: str, expect: Optional[type] = None, schema: Any = None) -> Any:
+    """
+    Parse the JSON a model returned, tolerating code fences, text around it, common
+    syntax slips and truncation (see json_repair.extract_json).
+
+    ``expect`` (list or dict) is the JSON type wanted. With a ``schema`` (see
+    json_repair.validate), list items that fail it are dropped and logged, while an
+    object that fails raises. Raises LLMResponseError, with the failed fields in
+    ``errors``, when nothing usable can be read.
+    """
+    try:
+        data = extract_json(content, expect)
+    except JSONRepairError as e:
+        raise LLMResponseError(str(e), content)
+    if schema is None:
+        return data
+    if isinstance(data, list):
+        data, failures = salvage_items(data, schema)
+        for position, errors in failures.items():
+            logger.warning(f"Dropping item {position} of the response: {'; '.join(errors)}")
+        return data
+    errors = validate(data, schema)
+    if errors:
+        raise LLMResponseError(f"Response failed validation: {'; '.join(errors)}", content, errors)
+    return data
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a JSON array that arrives in chunks.
+
+    feed() returns each object (or nested array) element of the top-level array as
+    soon as its closing bracket arrives, so callers can start on the first item while
+    the rest is still being generated. Text before the opening bracket (code fences,
+    chatter) is skipped; scalar elements are ignored. An element that is not valid
+    JSON is repaired (see json_repair), or logged and skipped if that fails.
+    """
+
+    def __init__(self):
+        self.content = []  # every chunk fed, for error reports
+        self.items = 0
+        self._buffer = ''
+        self._scan = 0  # position in _buffer the state below describes
+        self._start = None  # start of the element being read
+        self._depth = 0  # 0 before the array, 1 between elements
+        self._in_string = False
+        self._escape = False
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume the next chunk; returns the elements it completed."""
+        self.content.append(chunk)
+        if self._done:
+            return []
+        self._buffer += chunk
+        items = []
+        buffer = self._buffer
+        for index in range(self._scan, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char in '{[':
+                self._depth += 1
+                if self._depth == 2:
+                    self._start = index
+            elif char in '}]' and self._depth:
+                self._depth -= 1
+                if self._depth == 1 and self._start is not None:
+                    self._emit(buffer[self._start:index + 1], items)
+                    self._start = None
+                elif self._depth == 0:
+                    self._done = True
+                    break
+
+        # Keep only the unfinished element (nothing between elements matters)
+        keep = self._start if self._start is not None else len(buffer)
+        self._buffer = buffer[keep:]
+        self._scan = len(buffer) - keep
+        if self._start is not None:
+            self._start = 0
+        return items
+
+    def _emit(self, text: str, items: List[Any]):
+        try:
+            items.append(json.loads(text))
+        except json.JSONDecodeError:
+            try:
+                items.append(json.loads(repair_json(text, text[0])))
+            except ValueError as e:
+                logger.warning(f"Skipping unparseable array element: {e}")
+                return
+        self.items += 1
+
+    def close(self) -> List[Any]:
+        """
+        End the stream. Returns what can be salvaged of an element cut off by a
+        truncated response; raises LLMResponseError if there never was a JSON array.
+        """
+        if self._depth == 0 and not self._done:
+            raise LLMResponseError("No JSON array in response", ''.join(self.content))
+        if self._done:
+            return []
+        logger.warning(f"JSON array was cut off after {self.items} elements")
+        items = []
+        if self._start is not None and self._buffer:
+            self._emit(self._buffer, items)
+        return items
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from a rate-limit header value such as "12", "1.5", "250ms" or "1m30s"."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def rate_limit_headroom(headers) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Read (remaining, reset seconds) from rate-limit response headers.
+
+    The tightest of the request and token budgets is used; either value is None when
+    the upstream does not send it.
+    """
+    remaining, reset = None, None
+    for budget in ('requests', 'tokens'):
+        left = headers.get(f'x-ratelimit-remaining-{budget}')
+        try:
+            left = float(left) if left is not None else None
+        except ValueError:
+            left = None
+        if left is None or (remaining is not None and left >= remaining):
+            continue
+        remaining, reset = left, parse_duration(headers.get(f'x-ratelimit-reset-{budget}'))
+    return remaining, reset
+
+
+class KeyState:
+    """Adaptive concurrency state of one API key."""
+
+    def __init__(self, key: str, limit: float):
+        self.key = key
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.blocked_until = 0.0  # monotonic time before which the key gets no requests
+        self.completed = 0
+        self.rate_limited = 0
+
+    def free(self, now: float) -> int:
+        if self.blocked_until > now:
+            return 0
+        return int(self.limit) - self.in_flight
+
+
+class KeyPool:
+    """
+    Hands out API keys, adapting how many requests each key has in flight (AIMD).
+
+    Every successful response raises a key's limit by ``increase / limit``, so about
+    one slot per round of requests, unless its rate-limit headers show no room for
+    more. A 429 multiplies the limit by ``decrease`` and rests the key for its
+    Retry-After (or ``cooldown``); a spent budget rests it until the reset time. Limits
+    stay within [min_limit, max_limit].
+
+    The key with the most free slots is picked (round-robin among equals), so load
+    spreads across keys and a resting key is skipped. Sync callers block until a slot
+    frees up; async callers poll without blocking the event loop.
+    """
+
+    def __init__(self, keys: List[str], limit: float = LLM_CONCURRENCY_PER_KEY,
+                 min_limit: float = LLM_MIN_CONCURRENCY_PER_KEY, max_limit: float = LLM_MAX_CONCURRENCY_PER_KEY,
+                 increase: float = LLM_AIMD_INCREASE, decrease: float = LLM_AIMD_DECREASE,
+                 cooldown: float = LLM_RATE_LIMIT_COOLDOWN):
+        if isinstance(keys, str):
+            keys = [keys]
+        self.keys = [key for key in dict.fromkeys(keys) if key]
+        if not self.keys:
+            raise ValueError("No API keys configured")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.states = {key: KeyState(key, min(max(limit, min_limit), max_limit)) for key in self.keys}
+        self._next = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> Dict[str, int]:
+        return {key: state.in_flight for key, state in self.states.items()}
+
+    def _take(self, now: float) -> Optional[str]:
+        # Ties go round-robin, so a retry lands on a different key than the failed attempt
+        ordered = self.keys[self._next:] + self.keys[:self._next]
+        state = self.states[max(ordered, key=lambda key: self.states[key].free(now))]
+        if state.free(now) <= 0:
+            return None
+        state.in_flight += 1
+        self._next = (self.keys.index(state.key) + 1) % len(self.keys)
+        return state.key
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """Seconds until a resting key wakes up, or None to wait for a release."""
+        resting = [state.blocked_until - now for state in self.states.values() if state.blocked_until > now]
+        return min(resting) if resting else None
+
+    def acquire(self) -> str:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                key = self._take(now)
+                if key is not None:
+                    return key
+                self._condition.wait(self._wait_time(now))
+
+    async def acquire_async(self) -> str:
+        while True:
+            with self._condition:
+                key = self._take(time.monotonic())
+            if key is not None:
+                return key
+            await asyncio.sleep(ASYNC_POLL_INTERVAL)
+
+    def release(self, key: str, status: Optional[int] = None, headers=None):
+        """Return a slot; ``status`` and ``headers`` of the response (if any) adapt the key's limit."""
+        with self._condition:
+            state = self.states[key]
+            state.in_flight -= 1
+            if status is not None:
+                self._adapt(state, status, headers or {})
+            self._condition.notify_all()
+
+    def _adapt(self, state: KeyState, status: int, headers):
+        now = time.monotonic()
+        if status == 429:
+            state.rate_limited += 1
+            # Only the first 429 of a burst cuts the limit; the rest were already in flight
+            if state.blocked_until <= now:
+                state.limit = max(self.min_limit, state.limit * self.decrease)
+            rest = parse_duration(headers.get('retry-after'))
+            state.blocked_until = max(state.blocked_until, now + (rest if rest is not None else self.cooldown))
+            return
+
+        state.completed += 1
+        remaining, reset = rate_limit_headroom(headers)
+        if remaining is not None and remaining <= 0:
+            state.blocked_until = max(state.blocked_until, now + (reset if reset is not None else self.cooldown))
+        elif status == 200 and (remaining is None or remaining > state.limit):
+            state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+
+    def capacity(self) -> int:
+        """Most requests the pool can ever have in flight."""
+        return int(self.max_limit) * len(self.keys)
+
+    def summary(self) -> Dict:
+        """Per-key limit and counters, keyed by the key's last four characters."""
+        with self._condition:
+            return {
+                f"...{key[-4:]}": {
+                    'limit': round(state.limit, 2),
+                    'in_flight': state.in_flight,
+                    'completed': state.completed,
+                    'rate_limited': state.rate_limited
+                }
+                for key, state in self.states.items()
+            }
+
+
+class LLMClient:
+    """
+    Chat-completion client shared by every Grok (and DeepSeek) caller.
+
+    Requests go through the pooled keep-alive transport for ``upstream`` (sync) or a
+    per-event-loop aiohttp session (async). Keys come from a KeyPool, which adapts
+    each key's concurrency to its rate limits. 429s are retried at once on another
+    key; 5xx and connection errors after exponential backoff; other errors raise
+    LLMError at once.
+
+    With a ResponseCache, deterministic (temperature 0) completions are answered from
+    it when the same request was made before. Per call, ``use_cache=False`` bypasses
+    the cache, ``use_cache=True`` caches a non-deterministic request too, and
+    ``refresh=True`` skips the lookup but stores the new response.
+
+    Identical requests made while one is in flight share its upstream call (see
+    SingleFlight); ``coalesce=False`` opts a call out.
+    """
+
+    def __init__(self, api_keys: List[str], url: str = GROK_API_URL, model: str = GROK_MODEL,
+                 upstream: str = 'grok', concurrency_per_key: int = LLM_CONCURRENCY_PER_KEY,
+                 max_retries: int = LLM_MAX_RETRIES, backoff_factor: float = LLM_BACKOFF_FACTOR,
+                 timeout: float = LLM_TIMEOUT, cache: Optional[ResponseCache] = None):
+        self.url = url
+        self.model = model
+        self.upstream = upstream
+        self.keys = KeyPool(api_keys, concurrency_per_key)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cache = cache
+        self.inflight = SingleFlight()
+        self._async_sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0}
+
+    def _payload(self, messages: List[Dict], params: Dict) -> Dict:
+        return {'messages': messages, 'model': params.pop('model', None) or self.model, 'stream': False, **params}
+
+    def _cache_key(self, payload: Dict, use_cache: Optional[bool]) -> Optional[str]:
+        """Cache key for a request, or None when it should not be cached."""
+        if self.cache is None or use_cache is False:
+            return None
+        if use_cache is None and payload.get('temperature') != 0:
+            return None
+        return cache_key(payload)
+
+    def _headers(self, key: str) -> Dict:
+        return {'Content-Type': 'application/json', 'Authorization': f"Bearer {key}"}
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff_factor * 2 ** (attempt - 1)
+
+    def _check(self, status: int, text: str) -> Optional[Dict]:
+        """Return the parsed body of a successful response, None if it should be retried, or raise."""
+        if status == 200:
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError as e:
+                raise LLMError(f"{self.upstream} returned invalid JSON: {e}", status)
+        if status == 429:
+            self._count('rate_limited')
+        if status not in RETRY_STATUSES:
+            raise LLMError(f"{self.upstream} API error {status}: {text[:500]}", status)
+        logger.warning(f"{self.upstream} API returned {status}, retrying")
+        return None
+
+    def complete(self, messages: List[Dict], use_cache: Optional[bool] = None, refresh: bool = False,
+                 coalesce: bool = True, **params) -> Dict:
+        """
+        Send a chat completion and return the response body. ``params`` override the
+        model and sampling; see the class docstring for the cache and coalescing switches.
+        """
+        payload = self._payload(messages, params)
+        key = self._cache_key(payload, use_cache)
+        if key is not None and not refresh:
+            body = self.cache.get(key)
+            if body is not None:
+                return body
+
+        def fetch():
+            body = self._post(payload)
+            if key is not None:
+                self.cache.put(key, body)
+            return body
+
+        return self.inflight.do(cache_key(payload), fetch) if coalesce else fetch()
+
+    def _post(self, payload: Dict) -> Dict:
+        status, error = None, None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+                # Rate-limited keys rest in the pool; other failures back off here
+                if status != 429:
+                    time.sleep(self._backoff(attempt))
+            self._count('requests')
+            key = self.keys.acquire()
+            status, headers = None, None
+            try:
+                response = get_session(self.upstream).post(
+                    self.url, headers=self._headers(key), json=payload, timeout=self.timeout
+                )
+                status, headers, error = response.status_code, response.headers, response.text
+            except requests.exceptions.RequestException as e:
+                error = f"request failed: {e}"
+                logger.warning(f"{self.upstream} {error}, retrying")
+                continue
+            finally:
+                self.keys.release(key, status, headers)
+            body = self._check(status, error)
+            if body is not None:
+                return body
+        self._count('failures')
+        raise LLMError(f"{self.upstream} request failed after {self.max_retries + 1} attempts: {error}", status)
+
+    def chat(self, messages: List[Dict], **params) -> str:
+        """Send a chat completion and return the message content."""
+        return message_content(self.complete(messages, **params))
+
+    def chat_json(self, messages: List[Dict], expect: Optional[type] = None, schema: Any = None, **params) -> Any:
+        """Send a chat completion and parse its content as JSON (see parse_json_content)."""
+        return parse_json_content(self.chat(messages, **params), expect, schema)
+
+    def stream(self, messages: List[Dict], use_cache: Optional[bool] = None, refresh: bool = False,
+               **params) -> Iterator[str]:
+        """
+        Send a streaming chat completion and yield the content as it is generated.
+
+        Failures before the first chunk are retried like complete(); a stream that
+        reached [DONE] is stored in the response cache, and a cached answer is yielded in one piece.
+        Streams are not coalesced.
+        """
+        payload = {**self._payload(messages, params), 'stream': True}
+        key = self._cache_key({**payload, 'stream': False}, use_cache)
+        if key is not None and not refresh:
+            body = self.cache.get(key)
+            if body is not None:
+                yield message_content(body)
+                return
+
+        api_key, response = self._open_stream(payload)
+        content, done = [], False
+        response.encoding = response.encoding or 'utf-8'
+        try:
+            # chunk_size=None hands over data as it arrives instead of in 512-byte blocks
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    done = True
+                    break
+                delta = (json.loads(data).get('choices') or [{}])[0].get('delta', {}).get('content')
+                if delta:
+                    content.append(delta)
+                    yield delta
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            self._count('failures')
+            raise LLMError(f"{self.upstream} stream failed: {e}", 200)
+        finally:
+            response.close()
+            # Only a stream that reached [DONE] counts as a success for the key's limit
+            self.keys.release(api_key, 200 if done else None, response.headers)
+
+        if key is not None and done:
+            self.cache.put(key, {'model': payload['model'], 'choices': [
+                {'message': {'role': 'assistant', 'content': ''.join(content)}}
+            ]})
+
+    def _open_stream(self, payload: Dict) -> Tuple[str, requests.Response]:
+        """Start a streaming request; returns the key slot it holds and the 200 response."""
+        status, error = None, None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+                if status != 429:
+                    time.sleep(self._backoff(attempt))
+            self._count('requests')
+            key = self.keys.acquire()
+            status, headers = None, None
+            try:
+                response = get_session(self.upstream).post(
+                    self.url, headers=self._headers(key), json=payload, timeout=self.timeout, stream=True
+                )
+            except requests.exceptions.RequestException as e:
+                self.keys.release(key)
+                error = f"request failed: {e}"
+                logger.warning(f"{self.upstream} {error}, retrying")
+                continue
+            if response.status_code == 200:
+                return key, response
+            status, headers, error = response.status_code, response.headers, response.text
+            response.close()
+            self.keys.release(key, status, headers)
+            self._check(status, error)
+        self._count('failures')
+        raise LLMError(f"{self.upstream} request failed after {self.max_retries + 1} attempts: {error}", status)
+
+    def stream_json_array(self, messages: List[Dict], schema: Any = None, **params) -> Iterator[Any]:
+        """
+        Stream a completion whose content is a JSON array and yield each element as
+        soon as it is complete (see JsonArrayStream). Elements failing ``schema`` are
+        logged and dropped. Raises LLMResponseError if the content holds no array.
+        """
+        parser = JsonArrayStream()
+        for chunk in self.stream(messages, **params):
+            yield from self._checked(parser.feed(chunk), schema)
+        yield from self._checked(parser.close(), schema)
+
+    @staticmethod
+    def _checked(items: List[Any], schema: Any) -> List[Any]:
+        if schema is None:
+            return items
+        valid, failures = salvage_items(items, schema)
+        for errors in failures.values():
+            logger.warning(f"Dropping streamed item: {'; '.join(errors)}")
+        return valid
+
+    def _async_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=upstream_settings(self.upstream)['pool_size'])
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._async_sessions[loop] = session
+        return session
+
+    async def complete_async(self, messages: List[Dict], use_cache: Optional[bool] = None, refresh: bool = False,
+                             coalesce: bool = True, **params) -> Dict:
+        """Async variant of complete()."""
+        payload = self._payload(messages, params)
+        key = self._cache_key(payload, use_cache)
+        if key is not None and not refresh:
+            body = self.cache.get(key)
+            if body is not None:
+                return body
+
+        async def fetch():
+            body = await self._post_async(payload)
+            if key is not None:
+                self.cache.put(key, body)
+            return body
+
+        return await (self.inflight.do_async(cache_key(payload), fetch) if coalesce else fetch())
+
+    async def _post_async(self, payload: Dict) -> Dict:
+        status, error = None, None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+                if status != 429:
+                    await asyncio.sleep(self._backoff(attempt))
+            self._count('requests')
+            key = await self.keys.acquire_async()
+            status, headers = None, None
+            try:
+                async with self._async_session().post(self.url, headers=self._headers(key), json=payload) as response:
+                    status, headers, error = response.status, response.headers, await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"request failed: {e}"
+                logger.warning(f"{self.upstream} {error}, retrying")
+                continue
+            finally:
+                self.keys.release(key, status, headers)
+            body = self._check(status, error)
+            if body is not None:
+                return body
+        self._count('failures')
+        raise LLMError(f"{self.upstream} request failed after {self.max_retries + 1} attempts: {error}", status)
+
+    async def chat_async(self, messages: List[Dict], **params) -> str:
+        """Async variant of chat()."""
+        return message_content(await self.complete_async(messages, **params))
+
+    async def chat_json_async(self, messages: List[Dict], expect: Optional[type] = None, schema: Any = None,
+                              **params) -> Any:
+        """Async variant of chat_json()."""
+        return parse_json_content(await self.chat_async(messages, **params), expect, schema)
+
+    async def stream_async(self, messages: List[Dict], use_cache: Optional[bool] = None, refresh: bool = False,
+                           **params) -> AsyncIterator[str]:
+        """Async variant of stream()."""
+        payload = {**self._payload(messages, params), 'stream': True}
+        key = self._cache_key({**payload, 'stream': False}, use_cache)
+        if key is not None and not refresh:
+            body = self.cache.get(key)
+            if body is not None:
+                yield message_content(body)
+                return
+
+        api_key, response = await self._open_stream_async(payload)
+        content, done = [], False
+        try:
+            async for raw in response.content:
+                line = raw.decode(response.charset or 'utf-8').strip()
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    done = True
+                    break
+                delta = (json.loads(data).get('choices') or [{}])[0].get('delta', {}).get('content')
+                if delta:
+                    content.append(delta)
+                    yield delta
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+            self._count('failures')
+            raise LLMError(f"{self.upstream} stream failed: {e}", 200)
+        finally:
+            response.release()
+            self.keys.release(api_key, 200 if done else None, response.headers)
+
+        if key is not None and done:
+            self.cache.put(key, {'model': payload['model'], 'choices': [
+                {'message': {'role': 'assistant', 'content': ''.join(content)}}
+            ]})
+
+    async def _open_stream_async(self, payload: Dict) -> Tuple[str, aiohttp.ClientResponse]:
+        """Async variant of _open_stream()."""
+        # The session's total timeout would cut off long generations; bound each read instead
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=self.timeout)
+        status, error = None, None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+                if status != 429:
+                    await asyncio.sleep(self._backoff(attempt))
+            self._count('requests')
+            key = await self.keys.acquire_async()
+            status, headers = None, None
+            try:
+                response = await self._async_session().post(
+                    self.url, headers=self._headers(key), json=payload, timeout=timeout
+                )
+                if response.status == 200:
+                    return key, response
+                status, headers, error = response.status, response.headers, await response.text()
+                response.release()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"request failed: {e}"
+                logger.warning(f"{self.upstream} {error}, retrying")
+                self.keys.release(key)
+                continue
+            except BaseException:
+                self.keys.release(key)
+                raise
+            self.keys.release(key, status, headers)
+            self._check(status, error)
+        self._count('failures')
+        raise LLMError(f"{self.upstream} request failed after {self.max_retries + 1} attempts: {error}", status)
+
+    async def stream_json_array_async(self, messages: List[Dict], schema: Any = None,
+                                      **params) -> AsyncIterator[Any]:
+        """Async variant of stream_json_array()."""
+        parser = JsonArrayStream()
+        async for chunk in self.stream_async(messages, **params):
+            for item in self._checked(parser.feed(chunk), schema):
+                yield item
+        for item in self._checked(parser.close(), schema):
+            yield item
+
+    def summary(self) -> Dict:
+        """Request counters, coalesced calls, per-key concurrency and cache stats, for run logs."""
+        with self._lock:
+            stats = dict(self.stats)
+        summary = {**stats, 'coalesced': self.inflight.stats['coalesced'], 'keys': self.keys.summary()}
+        if self.cache is not None:
+            summary['cache'] = self.cache.summary()
+        return summary
+
+    async def aclose(self):
+        """Close the aiohttp session of the running event loop."""
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMClient:
+    """Return the shared Grok client, pooling every key in GROK_API_KEYS (cached if LLM_CACHE is set)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(GROK_API_KEYS, cache=ResponseCache(LLM_CACHE_PATH) if LLM_CACHE_ENABLED else None)
+    return _client
@@ -1,7 +1,8 @@
 import os
-import requests
+from src.utils.http_transport import get_session
 from dotenv import load_dotenv
 from src.services.hunter_service import HunterService
+from src.utils.validation_pipeline import email_pipeline
 from src.config.config import (
     MAILGUN_API_KEY,
     MAILGUN_DOMAIN,
@@ -21,13 +22,16 @@ class MailgunService:
         self.base_url = f"https://api.mailgun.net/v3/{self.domain}"
         self.auth = ("api", self.api_key)
         self.hunter_service = HunterService()
+        # Hunter quota is only spent on addresses that pass the format, blocklist and MX checks
+        self.validation = email_pipeline(hunter=self.hunter_service)
 
     def send_email(self, to_email, subject, html_content):
         """Send an email using Mailgun API."""
         try:
-            # Verify email using Hunter.io
-            if not self.hunter_service.verify_email(to_email):
-                print(f"Email verification failed for {to_email}")
+            # Verify email (format, domain, then Hunter.io)
+            result = self.validation.check(to_email)
+            if not result.valid:
+                print(f"Email verification failed for {to_email}: {result.message}")
                 return False
 
             print(f"DEBUG: Using Mailgun domain: {self.domain}")
@@ -45,7 +49,7 @@ class MailgunService:
             print(f"DEBUG: Sending email with data: {data}")
             
             # Send the email
-            response = requests.post(
+            response = get_session('mailgun').post(
                 f"{self.base_url}/messages",
                 auth=self.auth,
                 data=data
@@ -68,12 +72,7 @@ class MailgunService:
     def send_personalized_email(self, to_email, business_data=None):
         """Send a personalized email using Mailgun API."""
         try:
-            # Verify email using Hunter.io
-            if not self.hunter_service.verify_email(to_email):
-                print(f"Email verification failed for {to_email}")
-                return False
-
-            # Generate email content
+            # Generate email content (send_email verifies the address)
             subject = f"Custom Software Solutions for {business_data['name'] if business_data else 'Your Business'}"
             
             # Create HTML content
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-import requests
+import asyncio
 import json
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, AsyncIterator, Optional, Tuple
 from datetime import datetime
 import time
 import argparse
@@ -20,10 +20,39 @@ from src.config.config import (
     FIREBASE_URL,
     GOOGLE_PLACES_API_KEY,
     DEEPSEEK_API_KEY,
+    DEEPSEEK_API_URL,
     MIN_RATING,
     MIN_REVIEWS
 )
 from src.scrapers.business_scraper import MAJOR_CITIES, BUSINESS_TYPES
+from src.utils.http_transport import get_session
+from src.services.llm_client import LLMClient, LLMError, LLMResponseError
+from src.utils.json_repair import Field
+
+# Response schemas (see json_repair.validate); numbers and booleans sent as strings are converted
+SEARCH_SCHEMA = {'name': str, 'website': str, 'confidence_score': (int, float)}
+SCORED_SECTION = {'score': Field((int, float), required=False)}
+ANALYSIS_SCHEMA = {
+    'tech_stack': SCORED_SECTION,
+    'operations': SCORED_SECTION,
+    'growth_potential': SCORED_SECTION,
+    'software_opportunity': SCORED_SECTION,
+    'decision_maker': SCORED_SECTION,
+    'sales_conversation': dict
+}
+VALIDATION_SCHEMA = {
+    'is_legitimate': bool,
+    'confidence_score': (int, float),
+    'validation_points': [str],
+    'red_flags': [str],
+    'analysis_accuracy': {
+        'tech_stack': (int, float),
+        'operations': (int, float),
+        'growth_potential': (int, float),
+        'software_opportunity': (int, float)
+    },
+    'recommendation': str
+}
 
 # Update MAJOR_CITIES to focus on American cities
 MAJOR_CITIES = [
@@ -82,21 +111,12 @@ class PhoneLeadScraper:
     def __init__(self, grok_api_keys: List[str]):
         """Initialize the phone lead scraper with multiple API keys."""
         self.grok_api_keys = grok_api_keys
-        self.current_key_index = 0
+        # Pools the keys: bounded concurrency per key, retries and fenced-JSON parsing
+        self.llm = LLMClient(grok_api_keys)
         self.google_headers = {
             "Content-Type": "application/json"
         }
-        self.deepseek_headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
-        }
-        self.grok_headers_list = [
-            {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {key}"
-            }
-            for key in grok_api_keys
-        ]
+        self.deepseek = LLMClient([DEEPSEEK_API_KEY], url=DEEPSEEK_API_URL, model="deepseek-chat", upstream='deepseek')
         self.logger = self._setup_logger()
         
         # Store Firebase URL
@@ -130,42 +150,6 @@ class PhoneLeadScraper:
         
         return logger
 
-    def _get_next_grok_headers(self):
-        """Get the next Grok API headers in a round-robin fashion."""
-        headers = self.grok_headers_list[self.current_key_index]
-        self.current_key_index = (self.current_key_index + 1) % len(self.grok_headers_list)
-        return headers
-
-    def _make_grok_request(self, endpoint: str, payload: Dict) -> Optional[Dict]:
-        """Make a request to Grok API with automatic retry and key rotation."""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                headers = self._get_next_grok_headers()
-                response = requests.post(
-                    endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=REQUEST_TIMEOUT
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:  # Rate limit
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    self.logger.error(f"Grok API error: {response.status_code}")
-                    self.logger.error(f"Response: {response.text}")
-                    return None
-                    
-            except Exception as e:
-                self.logger.error(f"Error making Grok request: {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    return None
-        return None
-
     def _analyze_business_with_grok(self, business_info: Dict, category_info: Dict) -> Dict:
         """Use Grok to analyze a business and determine if it's a good candidate for custom software."""
         try:
@@ -232,10 +216,9 @@ You must respond with a valid JSON object containing the following sections:
 Make the analysis actionable for a sales conversation. Each section must be present and contain the specified fields.
 """
 
-            response = self._make_grok_request(
-                "https://api.x.ai/v1/chat/completions",
-                {
-                    "messages": [
+            try:
+                parsed_analysis = self.llm.chat_json(
+                    [
                         {
                             "role": "system",
                             "content": "You are a business technology analyst specializing in identifying opportunities for custom software solutions. Provide detailed, actionable insights for sales conversations. Always respond with valid JSON matching the exact structure specified in the prompt."
@@ -245,58 +228,36 @@ Make the analysis actionable for a sales conversation. Each section must be pres
                             "content": prompt
                         }
                     ],
-                    "model": "grok-2",
-                    "temperature": 0.7,
-                    "max_tokens": 1500
-                }
-            )
+                    expect=dict,
+                    schema=ANALYSIS_SCHEMA,
+                    model="grok-2",
+                    temperature=0.7,
+                    max_tokens=1500
+                )
+            except LLMResponseError as e:
+                self.logger.error(f"Failed to parse Grok analysis as JSON: {str(e)}")
+                self.logger.error(f"Raw response: {e.content}")
+                return {}
+            except LLMError as e:
+                self.logger.error(f"Grok analysis failed: {str(e)}")
+                return {}
+
+            # Validate scores are between 1-10 (the schema checked sections and types)
+            for section in ANALYSIS_SCHEMA:
+                score = parsed_analysis[section].get("score")
+                if score is not None and not 1 <= score <= 10:
+                    self.logger.error(f"Invalid score in {section}: {score}")
+                    return {}
             
-            if response:
-                try:
-                    analysis = response["choices"][0]["message"]["content"]
-                    # Clean up the response to ensure it's valid JSON
-                    analysis = analysis.strip()
-                    if not analysis.startswith('{'):
-                        analysis = analysis[analysis.find('{'):]
-                    if not analysis.endswith('}'):
-                        analysis = analysis[:analysis.rfind('}')+1]
-                    
-                    parsed_analysis = json.loads(analysis)
-                    
-                    # Validate required fields and data types
-                    required_sections = [
-                        "tech_stack", "operations", "growth_potential",
-                        "software_opportunity", "decision_maker", "sales_conversation"
-                    ]
-                    
-                    for section in required_sections:
-                        if section not in parsed_analysis:
-                            self.logger.error(f"Missing required section: {section}")
+            # Validate lists are actually lists
+            for section in parsed_analysis:
+                for key, value in parsed_analysis[section].items():
+                    if isinstance(value, list):
+                        if not all(isinstance(item, str) for item in value):
+                            self.logger.error(f"Invalid list items in {section}.{key}")
                             return {}
-                        
-                        # Validate scores are numbers between 1-10
-                        if "score" in parsed_analysis[section]:
-                            score = parsed_analysis[section]["score"]
-                            if not isinstance(score, (int, float)) or score < 1 or score > 10:
-                                self.logger.error(f"Invalid score in {section}: {score}")
-                                return {}
-                    
-                    # Validate lists are actually lists
-                    for section in parsed_analysis:
-                        for key, value in parsed_analysis[section].items():
-                            if isinstance(value, list):
-                                if not all(isinstance(item, str) for item in value):
-                                    self.logger.error(f"Invalid list items in {section}.{key}")
-                                    return {}
-                    
-                    return parsed_analysis
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse Grok analysis as JSON: {str(e)}")
-                    self.logger.error(f"Raw response: {analysis}")
-                    return {}
-            else:
-                self.logger.error("Grok analysis failed")
-                return {}
+            
+            return parsed_analysis
                 
         except Exception as e:
             self.logger.error(f"Error during business analysis: {str(e)}")
@@ -315,7 +276,7 @@ Make the analysis actionable for a sales conversation. Each section must be pres
                 "key": GOOGLE_PLACES_API_KEY
             }
             
-            response = requests.get(search_url, params=params, timeout=REQUEST_TIMEOUT)
+            response = get_session('google_places').get(search_url, params=params, timeout=REQUEST_TIMEOUT)
             if response.status_code != 200:
                 self.logger.error(f"Google Places search failed: {response.status_code}")
                 return []
@@ -337,7 +298,7 @@ Make the analysis actionable for a sales conversation. Each section must be pres
                         "key": GOOGLE_PLACES_API_KEY
                     }
                     
-                    details_response = requests.get(details_url, params=details_params, timeout=REQUEST_TIMEOUT)
+                    details_response = get_session('google_places').get(details_url, params=details_params, timeout=REQUEST_TIMEOUT)
                     if details_response.status_code == 200:
                         details = details_response.json().get("result", {})
                         
@@ -369,10 +330,9 @@ Make the analysis actionable for a sales conversation. Each section must be pres
             self.logger.error(f"Error fetching businesses from Google Places: {str(e)}")
             return []
 
-    def _validate_with_deepseek(self, business: Dict, analysis: Dict) -> Dict:
-        """Validate business data and analysis using DeepSeek."""
-        try:
-            prompt = f"""Validate this business lead and its analysis for accuracy and potential. The business data comes from real website analysis.
+    def _validation_request(self, business: Dict, analysis: Dict) -> Dict:
+        """DeepSeek request (messages and parameters) validating a business and its analysis."""
+        prompt = f"""Validate this business lead and its analysis for accuracy and potential. The business data comes from real website analysis.
 
 Business Information:
 {json.dumps(business, indent=2)}
@@ -436,75 +396,54 @@ Example response:
 
 Provide ONLY the JSON object, nothing else."""
 
-            response = requests.post(
-                "https://api.deepseek.com/v1/chat/completions",
-                headers=self.deepseek_headers,
-                json={
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a business validation expert specializing in verifying sales leads and opportunities. Always respond with valid JSON objects matching the exact structure specified."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "model": "deepseek-chat",
-                    "temperature": 0.3
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a business validation expert specializing in verifying sales leads and opportunities. Always respond with valid JSON objects matching the exact structure specified."
                 },
-                timeout=REQUEST_TIMEOUT
-            )
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "expect": dict,
+            "schema": VALIDATION_SCHEMA,
+            "temperature": 0.3
+        }
 
-            if response.status_code == 200:
-                try:
-                    content = response.json()["choices"][0]["message"]["content"]
-                    # Clean up the response to ensure it's valid JSON
-                    content = content.strip()
-                    if not content.startswith('{'):
-                        content = content[content.find('{'):]
-                    if not content.endswith('}'):
-                        content = content[:content.rfind('}')+1]
-                    
-                    validation = json.loads(content)
-                    
-                    # Validate required fields
-                    required_fields = [
-                        "is_legitimate", "confidence_score", "validation_points",
-                        "red_flags", "analysis_accuracy", "recommendation"
-                    ]
-                    
-                    if not all(field in validation for field in required_fields):
-                        self.logger.error("Missing required fields in validation")
-                        return {}
-                        
-                    # Validate analysis_accuracy structure
-                    required_accuracy_fields = [
-                        "tech_stack", "operations", "growth_potential", "software_opportunity"
-                    ]
-                    
-                    if not all(field in validation["analysis_accuracy"] for field in required_accuracy_fields):
-                        self.logger.error("Missing required fields in analysis_accuracy")
-                        return {}
-                    
-                    return validation
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse DeepSeek validation as JSON: {str(e)}")
-                    self.logger.error(f"Raw response: {content}")
-                    return {}
-            else:
-                self.logger.error(f"DeepSeek validation failed: {response.status_code}")
-                self.logger.error(f"Response: {response.text}")
-                return {}
+    def _validate_with_deepseek(self, business: Dict, analysis: Dict) -> Dict:
+        """Validate business data and analysis using DeepSeek."""
+        try:
+            return self.deepseek.chat_json(**self._validation_request(business, analysis))
+        except Exception as e:
+            return self._validation_failed(e)
 
+    async def _validate_with_deepseek_async(self, business: Dict, analysis: Dict) -> Dict:
+        """Async variant of _validate_with_deepseek()."""
+        try:
+            return await self.deepseek.chat_json_async(**self._validation_request(business, analysis))
         except Exception as e:
+            return self._validation_failed(e)
+
+    def _validation_failed(self, e: Exception) -> Dict:
+        if isinstance(e, LLMResponseError):
+            # e.errors names the missing or mistyped fields when the JSON itself was readable
+            self.logger.error(f"Failed to parse DeepSeek validation: {str(e)}")
+            self.logger.error(f"Raw response: {e.content}")
+        elif isinstance(e, LLMError):
+            self.logger.error(f"DeepSeek validation failed: {str(e)}")
+        else:
             self.logger.error(f"Error during DeepSeek validation: {str(e)}")
-            return {}
+        return {}
 
     def _search_businesses_with_grok(self, city: str, state: str, business_type: str) -> List[Dict]:
         """Use Grok to search for businesses and analyze their websites."""
-        try:
-            prompt = f"""Search for real, established {business_type} businesses in {city}, {state} that would be good candidates for custom software solutions.
+        return list(self._stream_businesses_with_grok(city, state, business_type))
+
+    def _search_request(self, city: str, state: str, business_type: str) -> Dict:
+        """Grok request (messages and parameters) searching for candidate businesses."""
+        prompt = f"""Search for real, established {business_type} businesses in {city}, {state} that would be good candidates for custom software solutions.
 
 IMPORTANT: You must respond with a valid JSON array containing business objects. Do not include any text before or after the JSON array.
 
@@ -544,61 +483,54 @@ Example response format:
 
 Search for businesses and return ONLY the JSON array, nothing else."""
 
-            response = self._make_grok_request(
-                "https://api.x.ai/v1/chat/completions",
+        return {
+            "messages": [
                 {
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a business research expert specializing in identifying companies that need custom software solutions. You must always respond with valid JSON arrays containing business objects."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "model": "grok-2",
-                    "temperature": 0.7,
-                    "max_tokens": 2000
+                    "role": "system",
+                    "content": "You are a business research expert specializing in identifying companies that need custom software solutions. You must always respond with valid JSON arrays containing business objects."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
                 }
-            )
+            ],
+            "schema": SEARCH_SCHEMA,
+            "model": "grok-2",
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
 
-            if response:
-                try:
-                    content = response["choices"][0]["message"]["content"]
-                    # Clean up the response to ensure it's valid JSON
-                    content = content.strip()
-                    if not content.startswith('['):
-                        content = content[content.find('['):]
-                    if not content.endswith(']'):
-                        content = content[:content.rfind(']')+1]
-                    
-                    businesses = json.loads(content)
-                    
-                    # Validate each business object
-                    valid_businesses = []
-                    for business in businesses:
-                        if all(key in business for key in ["name", "website", "confidence_score"]):
-                            if business.get("confidence_score", 0) >= 7:
-                                valid_businesses.append(business)
-                    
-                    return valid_businesses
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse Grok business search results: {str(e)}")
-                    self.logger.error(f"Raw response: {content}")
-                    return []
-            else:
-                self.logger.error("Grok business search failed")
-                return []
+    def _stream_businesses_with_grok(self, city: str, state: str, business_type: str) -> Iterator[Dict]:
+        """Like _search_businesses_with_grok, but yields each qualifying business as soon as Grok has generated it."""
+        try:
+            # Keep confident matches as they arrive (the schema drops incomplete entries)
+            for business in self.llm.stream_json_array(**self._search_request(city, state, business_type)):
+                if business["confidence_score"] >= 7:
+                    yield business
+        except Exception as e:
+            self._search_failed(e)
 
+    async def _stream_businesses_with_grok_async(self, city: str, state: str, business_type: str) -> AsyncIterator[Dict]:
+        """Async variant of _stream_businesses_with_grok()."""
+        try:
+            async for business in self.llm.stream_json_array_async(**self._search_request(city, state, business_type)):
+                if business["confidence_score"] >= 7:
+                    yield business
         except Exception as e:
+            self._search_failed(e)
+
+    def _search_failed(self, e: Exception):
+        if isinstance(e, LLMResponseError):
+            self.logger.error(f"Failed to parse Grok business search results: {str(e)}")
+            self.logger.error(f"Raw response: {e.content}")
+        elif isinstance(e, LLMError):
+            self.logger.error(f"Grok business search failed: {str(e)}")
+        else:
             self.logger.error(f"Error during business search: {str(e)}")
-            return []
 
-    def _analyze_website_with_grok(self, business: Dict) -> Dict:
-        """Use Grok to analyze a business's website in detail."""
-        try:
-            prompt = f"""Visit and analyze this business's website to identify software needs and opportunities.
+    def _website_analysis_request(self, business: Dict) -> Dict:
+        """Grok request (messages and parameters) analyzing a business's website."""
+        prompt = f"""Visit and analyze this business's website to identify software needs and opportunities.
 
 Business Information:
 {json.dumps(business, indent=2)}
@@ -671,101 +603,109 @@ Example response:
 
 Visit their website at {business['website']} and provide ONLY the JSON object, nothing else."""
 
-            response = self._make_grok_request(
-                "https://api.x.ai/v1/chat/completions",
+        return {
+            "messages": [
                 {
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a business technology analyst specializing in identifying opportunities for custom software solutions. Visit websites and provide detailed analysis in JSON format only."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "model": "grok-2",
-                    "temperature": 0.7,
-                    "max_tokens": 2000
+                    "role": "system",
+                    "content": "You are a business technology analyst specializing in identifying opportunities for custom software solutions. Visit websites and provide detailed analysis in JSON format only."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
                 }
-            )
+            ],
+            "expect": dict,
+            "schema": ANALYSIS_SCHEMA,
+            "model": "grok-2",
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
 
-            if response:
-                try:
-                    content = response["choices"][0]["message"]["content"]
-                    # Clean up the response to ensure it's valid JSON
-                    content = content.strip()
-                    if not content.startswith('{'):
-                        content = content[content.find('{'):]
-                    if not content.endswith('}'):
-                        content = content[:content.rfind('}')+1]
-                    
-                    analysis = json.loads(content)
-                    
-                    # Validate required sections
-                    required_sections = [
-                        "tech_stack", "operations", "growth_potential",
-                        "software_opportunity", "decision_maker", "sales_conversation"
-                    ]
-                    
-                    if not all(section in analysis for section in required_sections):
-                        self.logger.error("Missing required sections in analysis")
-                        return {}
-                        
-                    return analysis
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse Grok website analysis: {str(e)}")
-                    self.logger.error(f"Raw response: {content}")
-                    return {}
-            else:
-                self.logger.error("Grok website analysis failed")
-                return {}
+    def _analyze_website_with_grok(self, business: Dict) -> Dict:
+        """Use Grok to analyze a business's website in detail."""
+        try:
+            return self.llm.chat_json(**self._website_analysis_request(business))
+        except Exception as e:
+            return self._analysis_failed(e)
 
+    async def _analyze_website_with_grok_async(self, business: Dict) -> Dict:
+        """Async variant of _analyze_website_with_grok()."""
+        try:
+            return await self.llm.chat_json_async(**self._website_analysis_request(business))
         except Exception as e:
+            return self._analysis_failed(e)
+
+    def _analysis_failed(self, e: Exception) -> Dict:
+        if isinstance(e, LLMResponseError):
+            # e.errors names the missing sections or mistyped scores when the JSON itself was readable
+            self.logger.error(f"Failed to parse Grok website analysis: {str(e)}")
+            self.logger.error(f"Raw response: {e.content}")
+        elif isinstance(e, LLMError):
+            self.logger.error(f"Grok website analysis failed: {str(e)}")
+        else:
             self.logger.error(f"Error during website analysis: {str(e)}")
-            return {}
+        return {}
+
+    def _build_lead(self, business: Dict, analysis: Dict, validation: Dict, city: str, state: str,
+                    business_type: str) -> Optional[Dict]:
+        """Turn an analyzed business into a lead if DeepSeek confirms it and it scores well enough."""
+        if not (validation.get("is_legitimate", False) and validation.get("confidence_score", 0) >= 70):
+            self.logger.info(f"Lead rejected by DeepSeek validation: {business['name']}")
+            return None
+
+        # Calculate overall score
+        scores = [
+            analysis.get("tech_stack", {}).get("score", 0),
+            analysis.get("operations", {}).get("score", 0),
+            analysis.get("growth_potential", {}).get("score", 0),
+            analysis.get("software_opportunity", {}).get("score", 0),
+            analysis.get("decision_maker", {}).get("score", 0)
+        ]
+        overall_score = sum(scores) / len(scores)
+
+        # Add to leads if score is promising
+        if overall_score < 6.0:  # Threshold for good leads
+            return None
+        lead = {
+            **business,
+            "analysis": analysis,
+            "validation": validation,
+            "overall_score": overall_score,
+            "category": business_type,
+            "city": city,
+            "state": state
+        }
+        self.logger.info(f"Added validated lead: {business['name']} with score {overall_score}")
+        return lead
 
     def _process_business_parallel(self, business: Dict, city: str, state: str, business_type: str) -> Optional[Dict]:
         """Process a single business in parallel."""
         try:
             # Analyze website with Grok
             analysis = self._analyze_website_with_grok(business)
-            
-            if analysis:
-                # Validate with DeepSeek
-                validation = self._validate_with_deepseek(business, analysis)
-                
-                if validation.get("is_legitimate", False) and validation.get("confidence_score", 0) >= 70:
-                    # Calculate overall score
-                    scores = [
-                        analysis.get("tech_stack", {}).get("score", 0),
-                        analysis.get("operations", {}).get("score", 0),
-                        analysis.get("growth_potential", {}).get("score", 0),
-                        analysis.get("software_opportunity", {}).get("score", 0),
-                        analysis.get("decision_maker", {}).get("score", 0)
-                    ]
-                    overall_score = sum(scores) / len(scores)
-                    
-                    # Add to leads if score is promising
-                    if overall_score >= 6.0:  # Threshold for good leads
-                        lead = {
-                            **business,
-                            "analysis": analysis,
-                            "validation": validation,
-                            "overall_score": overall_score,
-                            "category": business_type,
-                            "city": city,
-                            "state": state
-                        }
-                        self.logger.info(f"Added validated lead: {business['name']} with score {overall_score}")
-                        return lead
-                else:
-                    self.logger.info(f"Lead rejected by DeepSeek validation: {business['name']}")
-            else:
+            if not analysis:
                 self.logger.warning(f"No analysis returned for {business['name']}")
-            
+                return None
+
+            # Validate with DeepSeek
+            validation = self._validate_with_deepseek(business, analysis)
+            return self._build_lead(business, analysis, validation, city, state, business_type)
+
+        except Exception as e:
+            self.logger.error(f"Error processing business {business.get('name', 'Unknown')}: {str(e)}")
             return None
-            
+
+    async def _process_business_async(self, business: Dict, city: str, state: str, business_type: str) -> Optional[Dict]:
+        """Async variant of _process_business_parallel()."""
+        try:
+            analysis = await self._analyze_website_with_grok_async(business)
+            if not analysis:
+                self.logger.warning(f"No analysis returned for {business['name']}")
+                return None
+
+            validation = await self._validate_with_deepseek_async(business, analysis)
+            return self._build_lead(business, analysis, validation, city, state, business_type)
+
         except Exception as e:
             self.logger.error(f"Error processing business {business.get('name', 'Unknown')}: {str(e)}")
             return None
@@ -779,14 +719,14 @@ Visit their website at {business['website']} and provide ONLY the JSON object, n
             self.logger.info(f"Skipping non-target business type: {business_type}")
             return []
         
-        # Search for businesses using Grok
-        businesses = self._search_businesses_with_grok(city, state, business_type)
-        
         leads = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.grok_api_keys)) as executor:
+        # The key pool caps in-flight Grok calls per key at each key's current rate limit,
+        # and identical prompts in flight at once (e.g. a business listed twice) share one call
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.llm.keys.capacity()) as executor:
+            # Search for businesses using Grok; each one is analyzed as soon as it streams in
             future_to_business = {
                 executor.submit(self._process_business_parallel, business, city, state, business_type): business
-                for business in businesses
+                for business in self._stream_businesses_with_grok(city, state, business_type)
             }
             
             for future in concurrent.futures.as_completed(future_to_business):
@@ -799,6 +739,52 @@ Visit their website at {business['website']} and provide ONLY the JSON object, n
                     self.logger.error(f"Error processing business {business.get('name', 'Unknown')}: {str(e)}")
         
         self.logger.info(f"Found {len(leads)} qualified leads")
+        self.logger.info(f"Grok calls so far: {self.llm.inflight.summary()}")
+        return leads
+
+    async def get_phone_leads_async(self, city: str, state: str, business_type: str) -> List[Dict]:
+        """Async variant of get_phone_leads(); each business is analyzed as its own task as soon as it streams in."""
+        self.logger.info(f"Getting phone leads for {business_type} in {city}, {state}")
+
+        if not any(btype[0] == business_type for btype in BUSINESS_TYPES):
+            self.logger.info(f"Skipping non-target business type: {business_type}")
+            return []
+
+        tasks = []
+        async for business in self._stream_businesses_with_grok_async(city, state, business_type):
+            tasks.append(asyncio.create_task(self._process_business_async(business, city, state, business_type)))
+        leads = [lead for lead in await asyncio.gather(*tasks) if lead]
+
+        self.logger.info(f"Found {len(leads)} qualified leads for {business_type} in {city}, {state}")
+        return leads
+
+    async def scrape_async(self, combinations: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Get phone leads for every (city, state, business_type) in one event loop.
+
+        Searches, website analyses and validations for all combinations overlap. Each
+        client keeps at most its upstream's pool size (HTTP_UPSTREAMS) of connections
+        open, each only while a request or stream is on the wire, so parsing a reply
+        never holds up another call; the key pool still caps each key at its current
+        rate limit.
+        """
+        try:
+            results = await asyncio.gather(
+                *(self.get_phone_leads_async(city, state, business_type) for city, state, business_type in combinations),
+                return_exceptions=True
+            )
+        finally:
+            await self.llm.aclose()
+            await self.deepseek.aclose()
+
+        leads = []
+        for (city, state, business_type), result in zip(combinations, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error getting leads for {business_type} in {city}, {state}: {str(result)}")
+            else:
+                leads.extend(result)
+        self.logger.info(f"Found {len(leads)} qualified leads across {len(combinations)} searches")
+        self.logger.info(f"Grok calls: {self.llm.summary()}")
         return leads
 
     def save_to_firebase(self, leads):
@@ -848,7 +834,7 @@ Visit their website at {business['website']} and provide ONLY the JSON object, n
                     
                     # Save to Firebase using REST API
                     url = f"{self.firebase_url}/phoneLeads/{city}/{business_type}/{batch_key}.json"
-                    response = requests.put(url, json=data)
+                    response = get_session('firebase').put(url, json=data)
                     
                     if response.status_code == 200:
                         self.logger.info(f"Saved {len(city_leads)} leads for {business_type} in {city}")
@@ -867,6 +853,8 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape phone leads for businesses')
     parser.add_argument('--num-cities', type=int, default=5, help='Number of cities to scrape')
     parser.add_argument('--num-business-types', type=int, default=3, help='Number of business types to scrape per city')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Scrape all cities and business types concurrently in one event loop')
     args = parser.parse_args()
 
     # Initialize scraper with all available API keys
@@ -882,11 +870,20 @@ def main():
     selected_business_types = random.sample(BUSINESS_TYPES, min(args.num_business_types, len(BUSINESS_TYPES)))
 
     all_leads = []
-    for city, state in selected_cities:
-        for business_type, description in selected_business_types:
-            print(f"Scraping leads for {business_type} in {city}, {state}")
-            leads = scraper.get_phone_leads(city, state, business_type)
-            all_leads.extend(leads)
+    if args.use_async:
+        combinations = [
+            (city, state, business_type)
+            for city, state in selected_cities
+            for business_type, description in selected_business_types
+        ]
+        print(f"Scraping leads for {len(combinations)} city and business type combinations concurrently")
+        all_leads = asyncio.run(scraper.scrape_async(combinations))
+    else:
+        for city, state in selected_cities:
+            for business_type, description in selected_business_types:
+                print(f"Scraping leads for {business_type} in {city}, {state}")
+                leads = scraper.get_phone_leads(city, state, business_type)
+                all_leads.extend(leads)
 
     # Save all leads to Firebase
     if all_leads:
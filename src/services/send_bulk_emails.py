@@ -50,10 +50,22 @@ class BulkEmailSender:
             
         print(f"Found {len(businesses)} businesses to email")
         
+        # Validate every unsent address up front as one batch: format, blocklist and MX
+        # once per domain, then Hunter for the survivors. Sends below hit the caches.
+        pending = [email for email in dict.fromkeys(b.get('email') for b in businesses)
+                   if email and email not in self.sent_emails]
+        validation = dict(zip(pending, self.mailgun_service.validation.run(pending)))
+        print(f"Validation results: {self.mailgun_service.validation.summary()}")
+        
         for business in businesses:
             email = business.get('email')
             if not email or email in self.sent_emails:
                 continue
+            
+            result = validation[email]
+            if not result.valid:
+                print(f"Skipping {business.get('name')} ({email}): {result.message}")
+                continue
                 
             print(f"\nSending email to {business['name']} ({email})")
             
@@ -73,6 +85,7 @@ class BulkEmailSender:
         
         print("\nBulk email sending completed!")
         print(f"Total emails sent: {len(self.sent_emails)}")
+        print(f"Verification cache: {self.mailgun_service.hunter_service.cache_stats()}")
 
 def main():
     sender = BulkEmailSender()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from src.config.config import HUNTER_CACHE_PATH, HUNTER_CACHE_TTL
+
+
+class Verification(NamedTuple):
+    email: str
+    status: Optional[str]
+    score: int
+    checked_at: float
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class VerificationCache:
+    """
+    Persistent cache of Hunter email verifications, stored in SQLite.
+
+    Results are keyed by normalized email and reused for ``ttl`` seconds, so retries,
+    re-runs and repeat sends to the same address cost no Hunter quota. The store is
+    shared by every process that sends mail.
+    """
+
+    def __init__(self, path: str = HUNTER_CACHE_PATH, ttl: float = HUNTER_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across forked processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS verifications (
+                    email TEXT PRIMARY KEY,
+                    status TEXT,
+                    score INTEGER NOT NULL,
+                    checked_at REAL NOT NULL
+                )
+            """)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, email: str) -> Optional[Verification]:
+        """Return a fresh verification for the address, or None."""
+        key = normalize_email(email)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT status, score, checked_at FROM verifications WHERE email = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[2] >= self.ttl:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+        return Verification(key, row[0], row[1], row[2])
+
+    def put(self, email: str, status: Optional[str], score: int) -> Verification:
+        """Store a verification result."""
+        verification = Verification(normalize_email(email), status, int(score or 0), time.time())
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO verifications VALUES (?, ?, ?, ?)", verification
+            )
+            self.stats['stores'] += 1
+        return verification
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def summary(self) -> Dict:
+        """Stats plus the hit rate, for logs."""
+        return {**self.stats, 'hit_rate': f"{self.hit_rate() * 100:.2f}%"}
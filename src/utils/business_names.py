@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import difflib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config import EXCLUSION_PROMPT_TOKENS, NAME_MATCH_THRESHOLD
+
+# Words that do not tell two businesses apart ("The Corner Bakery LLC" is "corner bakery")
+LEADING_WORDS = ('the',)
+LEGAL_SUFFIXES = ('llc', 'inc', 'incorporated', 'co', 'corp', 'corporation', 'company', 'ltd', 'pllc', 'lp')
+NON_WORD = re.compile(r'[^a-z0-9 ]+')
+
+Location = Tuple[str, str]  # (city, state), lower-cased
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a business name and drop punctuation, a leading "the" and legal suffixes."""
+    words = NON_WORD.sub(' ', name.lower().replace('&', ' and ').replace("'", '')).split()
+    if len(words) > 1 and words[0] in LEADING_WORDS:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words = words[:-1]
+    return ' '.join(words)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of prompt text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class ExistingNames:
+    """
+    Names of businesses already saved, checked locally instead of being sent to Grok.
+
+    A found business matches a saved one when their normalized names are equal, or
+    when difflib rates them at least ``threshold`` alike and they are in the same
+    city. prompt_names() picks the few names worth mentioning in a discovery prompt
+    (same city and type first, newest first) within a token budget, so the prompt
+    stays the same size however many businesses have been saved.
+    """
+
+    def __init__(self, threshold: float = NAME_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._names: Dict[str, str] = {}  # normalized -> name as saved
+        self._by_city: Dict[Location, List[Tuple[str, str]]] = {}  # -> [(normalized, business type)]
+
+    def add(self, name: str, city: str = '', state: str = '', business_type: str = ''):
+        """Record a saved business; later additions count as newer."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return
+        with self._lock:
+            self._names.setdefault(normalized, name.strip())
+            self._by_city.setdefault(self._location(city, state), []).append((normalized, business_type.lower()))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.match(name) is not None
+
+    @staticmethod
+    def _location(city: str, state: str) -> Location:
+        return city.lower().strip(), state.lower().strip()
+
+    def match(self, name: str, city: str = '', state: str = '') -> Optional[str]:
+        """The saved name a business duplicates (exactly, or fuzzily within its city), or None."""
+        normalized = normalize_name(name)
+        with self._lock:
+            if normalized in self._names:
+                return self._names[normalized]
+            candidates = {saved for saved, _ in self._by_city.get(self._location(city, state), [])}
+        close = difflib.get_close_matches(normalized, candidates, n=1, cutoff=self.threshold)
+        return self._names[close[0]] if close else None
+
+    def prompt_names(self, city: str, state: str, business_type: str,
+                     max_tokens: int = EXCLUSION_PROMPT_TOKENS) -> List[str]:
+        """Saved names of this city to list in a prompt: this business type first, newest first, within max_tokens."""
+        with self._lock:
+            entries = list(reversed(self._by_city.get(self._location(city, state), [])))
+            same_type = [saved for saved, saved_type in entries if saved_type == business_type.lower()]
+            other_types = [saved for saved, saved_type in entries if saved_type != business_type.lower()]
+
+            names, seen, budget = [], set(), max_tokens
+            for saved in same_type + other_types:
+                if saved in seen:
+                    continue
+                cost = estimate_tokens(self._names[saved] + '; ')
+                if cost > budget:
+                    break
+                names.append(self._names[saved])
+                seen.add(saved)
+                budget -= cost
+        return names
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+from src.config.config import (
+    DNS_CACHE_PATH, DNS_MIN_TTL, DNS_MAX_TTL, DNS_NEGATIVE_TTL, DNS_ERROR_TTL
+)
+
+# Answer statuses; everything except TIMEOUT (timeouts and other failures) is cached
+OK = 'ok'
+NXDOMAIN = 'nxdomain'
+NO_ANSWER = 'no_answer'
+NO_NAMESERVERS = 'no_nameservers'
+TIMEOUT = 'timeout'
+
+
+class DnsAnswer(NamedTuple):
+    status: str
+    records: List[str]  # rdata as text, e.g. "10 mx.example.com." for MX
+    expires_at: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK and bool(self.records)
+
+
+class DnsCache:
+    """
+    TTL-aware cache of DNS answers, shared by every process through SQLite.
+
+    Positive answers are kept for their record TTL (clamped to ``min_ttl``/``max_ttl``);
+    NXDOMAIN and empty answers for ``negative_ttl``; lookups no nameserver answered for
+    ``error_ttl``. Timeouts are never cached. A small in-process map sits in front of
+    the store so repeated lookups within a page do not touch the disk.
+    """
+
+    def __init__(self, path: str = DNS_CACHE_PATH, min_ttl: float = DNS_MIN_TTL, max_ttl: float = DNS_MAX_TTL,
+                 negative_ttl: float = DNS_NEGATIVE_TTL, error_ttl: float = DNS_ERROR_TTL,
+                 resolver: Optional[dns.resolver.Resolver] = None):
+        self.path = path
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.resolver = resolver
+        self._memory: Dict[Tuple[str, str], DnsAnswer] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'negative_hits': 0, 'timeouts': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across forked processes
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    name TEXT NOT NULL,
+                    rdtype TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    records TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (name, rdtype)
+                )
+            """)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            self._memory.clear()
+        return self._conn
+
+    def lookup(self, name: str, rdtype: str) -> Optional[DnsAnswer]:
+        """Return a cached, unexpired answer, or None."""
+        key = (name.lower().rstrip('.'), rdtype.upper())
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            answer = self._memory.get(key)
+            if answer is not None and answer.expires_at > now:
+                self._count_hit('memory_hits', answer)
+                return answer
+
+            row = conn.execute(
+                "SELECT status, records, expires_at FROM answers WHERE name = ? AND rdtype = ?", key
+            ).fetchone()
+            if row is None or row[2] <= now:
+                self.stats['misses'] += 1
+                return None
+            answer = DnsAnswer(row[0], json.loads(row[1]), row[2])
+            self._memory[key] = answer
+            self._count_hit('disk_hits', answer)
+            return answer
+
+    def _count_hit(self, kind: str, answer: DnsAnswer):
+        self.stats[kind] += 1
+        if answer.status != OK:
+            self.stats['negative_hits'] += 1
+
+    def store(self, name: str, rdtype: str, status: str, records: List[str], ttl: float) -> DnsAnswer:
+        """Cache an answer for ``ttl`` seconds and return it."""
+        key = (name.lower().rstrip('.'), rdtype.upper())
+        answer = DnsAnswer(status, records, time.time() + ttl)
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                (*key, status, json.dumps(records), answer.expires_at)
+            )
+            self._memory[key] = answer
+        return answer
+
+    def resolve(self, name: str, rdtype: str, resolver=None) -> DnsAnswer:
+        """
+        Resolve a record through the cache; never raises for DNS failures.
+        ``resolver`` (a dns.resolver.Resolver) overrides the cache's own for this query.
+        """
+        name, rdtype = name.lower().rstrip('.'), rdtype.upper()
+        cached = self.lookup(name, rdtype)
+        if cached is not None:
+            return cached
+
+        resolver = resolver or self.resolver
+        try:
+            if resolver is not None:
+                result = resolver.resolve(name, rdtype)
+            else:
+                result = dns.resolver.resolve(name, rdtype)
+        except dns.exception.DNSException as e:
+            return self._store_error(name, rdtype, e)
+        return self._store_result(name, rdtype, result)
+
+    async def resolve_async(self, name: str, rdtype: str, resolver: dns.asyncresolver.Resolver,
+                            check_cache: bool = True) -> DnsAnswer:
+        """
+        Async variant of resolve() for batch lookups; shares the same cache.
+        Pass check_cache=False when the caller has already looked the name up.
+        """
+        name, rdtype = name.lower().rstrip('.'), rdtype.upper()
+        cached = self.lookup(name, rdtype) if check_cache else None
+        if cached is not None:
+            return cached
+
+        try:
+            result = await resolver.resolve(name, rdtype)
+        except dns.exception.DNSException as e:
+            return self._store_error(name, rdtype, e)
+        return self._store_result(name, rdtype, result)
+
+    def _store_result(self, name: str, rdtype: str, result) -> DnsAnswer:
+        ttl = min(max(result.rrset.ttl if result.rrset is not None else 0, self.min_ttl), self.max_ttl)
+        return self.store(name, rdtype, OK, [record.to_text() for record in result], ttl)
+
+    def _store_error(self, name: str, rdtype: str, error: dns.exception.DNSException) -> DnsAnswer:
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            return self.store(name, rdtype, NXDOMAIN, [], self.negative_ttl)
+        if isinstance(error, dns.resolver.NoAnswer):
+            return self.store(name, rdtype, NO_ANSWER, [], self.negative_ttl)
+        if isinstance(error, dns.resolver.NoNameservers):
+            return self.store(name, rdtype, NO_NAMESERVERS, [], self.error_ttl)
+        # Timeouts and anything unexpected are retried on the next lookup
+        self.stats['timeouts'] += 1
+        return DnsAnswer(TIMEOUT, [], time.time())
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def summary(self) -> Dict:
+        """Stats plus the hit rate, for run logs."""
+        return {**self.stats, 'hit_rate': f"{self.hit_rate() * 100:.2f}%"}
+
+
+# Shared by the validators in this process; other processes reach the same store on disk
+dns_cache = DnsCache()
+
+
+def resolve(name: str, rdtype: str) -> DnsAnswer:
+    """Resolve a record through the shared DNS cache."""
+    return dns_cache.resolve(name, rdtype)
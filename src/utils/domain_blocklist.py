@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.config import DOMAIN_BLOCKLIST_PATH, DOMAIN_BLOCKLIST_SOURCES
+
+# Compiled file layout, little-endian:
+#   header   magic b'DBL1', bucket count, entry count            (uint32s)
+#   offsets  bucket count + 1 entry indexes                       (uint32 each)
+#   entries  64-bit domain hash + 1 byte kind, sorted by bucket   (9 bytes each)
+# There are at least as many buckets as entries, so a lookup reads about one entry.
+MAGIC = b'DBL1'
+HEADER = struct.Struct('<4sII')
+OFFSET = struct.Struct('<I')
+ENTRY = struct.Struct('<QB')
+
+# Entry kinds stored in the file
+KINDS = {'disposable': 1, 'role': 2}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+
+def domain_hash(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def normalize_domain(domain: str) -> str:
+    return domain.strip().lower().strip('.')
+
+
+def read_domain_list(path: str) -> List[str]:
+    """Read a plain-text domain list, skipping blank lines and comments."""
+    domains = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                domains.append(normalize_domain(line))
+    return domains
+
+
+def build_blocklist(domains_by_kind: Dict[str, Iterable[str]], path: str) -> int:
+    """Compile domain lists into the binary blocklist at ``path``; returns the entry count."""
+    entries: Dict[int, int] = {}
+    for kind, domains in domains_by_kind.items():
+        code = KINDS[kind]
+        for domain in domains:
+            domain = normalize_domain(domain)
+            if domain:
+                # The first kind listed wins for domains that appear in several lists
+                entries.setdefault(domain_hash(domain), code)
+
+    bucket_count = 1
+    while bucket_count < len(entries):
+        bucket_count *= 2
+    ordered = sorted(entries.items(), key=lambda item: (item[0] % bucket_count, item[0]))
+
+    offsets = [0] * (bucket_count + 1)
+    for hashed, _ in ordered:
+        offsets[hashed % bucket_count + 1] += 1
+    for bucket in range(bucket_count):
+        offsets[bucket + 1] += offsets[bucket]
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file and swap it in, so readers never see a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, bucket_count, len(ordered)))
+        f.write(struct.pack(f'<{bucket_count + 1}I', *offsets))
+        f.write(b''.join(ENTRY.pack(hashed, code) for hashed, code in ordered))
+    os.replace(temp_path, path)
+    return len(ordered)
+
+
+class DomainBlocklist:
+    """
+    Read-only, memory-mapped view of a compiled blocklist file.
+
+    Mapping the file keeps startup cheap and lets every worker process share the same
+    pages. Exact lookups hash the domain to one bucket; parent domains are tried label
+    by label, so "x.mailinator.com" matches a "mailinator.com" entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bucket_count, self.entry_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a domain blocklist")
+        self._offsets_at = HEADER.size
+        self._entries_at = self._offsets_at + (self.bucket_count + 1) * OFFSET.size
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def exact(self, domain: str) -> Optional[str]:
+        """Return the kind of an exactly listed domain, or None."""
+        hashed = domain_hash(domain)
+        position = self._offsets_at + (hashed % self.bucket_count) * OFFSET.size
+        start, end = struct.unpack_from('<II', self._map, position)
+        for index in range(start, end):
+            entry_hash, code = ENTRY.unpack_from(self._map, self._entries_at + index * ENTRY.size)
+            if entry_hash == hashed:
+                return KIND_NAMES.get(code)
+        return None
+
+    def match(self, domain: str) -> Optional[Tuple[str, str]]:
+        """Return (listed domain, kind) for the domain or its closest listed parent, or None."""
+        labels = normalize_domain(domain).split('.')
+        # Stop before the bare TLD
+        for start in range(len(labels) - 1):
+            candidate = '.'.join(labels[start:])
+            kind = self.exact(candidate)
+            if kind:
+                return candidate, kind
+        return None
+
+    def close(self):
+        self._map.close()
+
+
+def manifest_path(path: str) -> str:
+    """Where the description of the sources a compiled blocklist was built from is kept."""
+    return f"{path}.sources.json"
+
+
+def source_manifest(sources: Dict[str, List[str]]) -> Dict[str, List]:
+    """Each kind's source lists with their size and mtime (None for a missing file)."""
+    manifest = {}
+    for kind, paths in sources.items():
+        entries = []
+        for source in paths:
+            stat = os.stat(source) if os.path.exists(source) else None
+            entries.append([os.path.abspath(source), [stat.st_size, stat.st_mtime_ns] if stat else None])
+        manifest[kind] = entries
+    return manifest
+
+
+def sources_changed(path: str, sources: Dict[str, List[str]]) -> bool:
+    """True if the compiled file is missing or was built from other lists, or other versions of them."""
+    if not os.path.exists(path):
+        return True
+    try:
+        with open(manifest_path(path), 'r', encoding='utf-8') as f:
+            built_from = json.load(f)
+    except (OSError, ValueError):
+        return True
+    return built_from != source_manifest(sources)
+
+
+def build_from_sources(path: str = DOMAIN_BLOCKLIST_PATH,
+                       sources: Dict[str, List[str]] = DOMAIN_BLOCKLIST_SOURCES) -> int:
+    """Compile the configured source lists into ``path``, recording them next to it."""
+    manifest = source_manifest(sources)
+    domains_by_kind = {
+        kind: [domain for source in paths if os.path.exists(source) for domain in read_domain_list(source)]
+        for kind, paths in sources.items()
+    }
+    count = build_blocklist(domains_by_kind, path)
+    temp_path = f"{manifest_path(path)}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, manifest_path(path))
+    return count
+
+
+_blocklist: Optional[DomainBlocklist] = None
+_blocklist_lock = threading.Lock()
+
+
+def get_blocklist() -> DomainBlocklist:
+    """Return the shared blocklist, compiling it first if it is missing or a source list changed."""
+    global _blocklist
+    if _blocklist is None:
+        with _blocklist_lock:
+            if _blocklist is None:
+                if sources_changed(DOMAIN_BLOCKLIST_PATH, DOMAIN_BLOCKLIST_SOURCES):
+                    build_from_sources(DOMAIN_BLOCKLIST_PATH, DOMAIN_BLOCKLIST_SOURCES)
+                _blocklist = DomainBlocklist(DOMAIN_BLOCKLIST_PATH)
+    return _blocklist
+
+
+def blocked_domain_kind(domain: str) -> Optional[str]:
+    """Return 'disposable' or 'role' if the domain (or a parent) is blocklisted, else None."""
+    if not domain:
+        return None
+    match = get_blocklist().match(domain)
+    return match[1] if match else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the disposable / role-only domain blocklist "
+                                                 "from the lists in DOMAIN_BLOCKLIST_SOURCES")
+    parser.add_argument('--output', default=DOMAIN_BLOCKLIST_PATH, help='Compiled blocklist path')
+    args = parser.parse_args()
+
+    count = build_from_sources(args.output)
+    print(f"Wrote {count} domains to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
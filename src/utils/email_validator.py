@@ -1,6 +1,20 @@
-import dns.resolver
+import asyncio
 import re
-from typing import Tuple
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import dns.asyncresolver
+import dns.resolver
+
+from src.config.config import DNS_BULK_CONCURRENCY, DNS_QUERY_TIMEOUT
+from src.utils.dns_cache import NO_ANSWER, NXDOMAIN, TIMEOUT, DnsAnswer, dns_cache, resolve
+from src.utils.domain_blocklist import blocked_domain_kind
+
+BLOCKED_DOMAIN_MESSAGES = {
+    'disposable': "Disposable email domain not allowed",
+    'role': "Role-only email domain not allowed"
+}
 
 def is_valid_email_format(email: str) -> bool:
     """Check if email follows valid format."""
@@ -15,37 +29,50 @@ def is_valid_email_format(email: str) -> bool:
     return bool(re.match(pattern, email))
 
 def check_dns_records(domain: str) -> Tuple[bool, str]:
-    """Check if domain has valid MX records."""
+    """Check if domain has valid MX records (answers are cached, see dns_cache)."""
     try:
         # Check for MX records
-        mx_records = dns.resolver.resolve(domain, 'MX')
-        if mx_records:
-            return True, "Valid MX records found"
-        return False, "No MX records found"
-    except dns.resolver.NoAnswer:
-        return False, "No MX records found"
-    except dns.resolver.NXDOMAIN:
-        return False, "Domain does not exist"
+        answer = resolve(domain, 'MX')
     except Exception as e:
         return False, f"Error checking DNS: {str(e)}"
+    return mx_result(answer)
 
-def validate_email(email: str) -> Tuple[bool, str]:
-    """Validate email address using multiple methods."""
-    # First check format
+def mx_result(answer: DnsAnswer) -> Tuple[bool, str]:
+    """Turn an MX answer into the (valid, message) pair check_dns_records returns."""
+    if answer.ok:
+        return True, "Valid MX records found"
+    if answer.status == NXDOMAIN:
+        return False, "Domain does not exist"
+    if answer.status == NO_ANSWER:
+        return False, "No MX records found"
+    if answer.status == TIMEOUT:
+        return False, "Error checking DNS: lookup timed out"
+    return False, "Error checking DNS: no nameservers answered"
+
+def precheck_email(email: str) -> Optional[Tuple[bool, str]]:
+    """Run the checks that need no network; returns a failure, or None if DNS should decide."""
     if not email or not isinstance(email, str):
         return False, "No email provided"
         
     if not is_valid_email_format(email):
         return False, "Invalid email format"
     
+    # Skip validation for disposable and role-only domains (see domain_blocklist)
+    blocked = blocked_domain_kind(email.split('@')[1])
+    if blocked:
+        return False, BLOCKED_DOMAIN_MESSAGES[blocked]
+    return None
+
+def validate_email(email: str) -> Tuple[bool, str]:
+    """Validate email address using multiple methods."""
+    # First check format and disposable domains
+    failure = precheck_email(email)
+    if failure:
+        return failure
+    
     # Extract domain
     domain = email.split('@')[1]
     
-    # Skip validation for common disposable email domains
-    disposable_domains = {'tempmail.com', 'throwawaymail.com', 'tempmailaddress.com'}
-    if domain in disposable_domains:
-        return False, "Disposable email domain not allowed"
-    
     # Check DNS records
     dns_valid, dns_message = check_dns_records(domain)
     if not dns_valid:
@@ -65,21 +92,247 @@ def validate_business_email(email: str, business_name: str) -> Tuple[bool, str]:
     
     # Check if email domain matches business name
     domain = email.split('@')[1]
-    business_domain = business_name.lower().replace(' ', '').replace('&', 'and')
     
     # Common business email patterns
-    common_patterns = [
-        f"{business_domain}.com",
-        f"{business_domain}.org",
-        f"{business_domain}.net",
-        f"{business_domain}.biz"
-    ]
-    
-    if domain not in common_patterns:
+    if domain not in business_email_domains(business_name):
         return False, "Email domain does not match business name pattern"
     
     return True, "Business email appears valid"
 
+def website_domain(url: str) -> Optional[str]:
+    """Return the domain a website URL should resolve, without a leading www."""
+    if not url or not isinstance(url, str):
+        return None
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    domain = parsed.netloc
+    return domain[4:] if domain.startswith('www.') else domain
+
+def _split_cached(domains: Iterable[str], rdtype: str) -> Tuple[Dict[str, DnsAnswer], List[str]]:
+    """Answer what the DNS cache can; returns (answers, unique domains still to resolve)."""
+    answers: Dict[str, DnsAnswer] = {}
+    misses = []
+    for domain in dict.fromkeys(domain.lower().rstrip('.') for domain in domains if domain):
+        cached = dns_cache.lookup(domain, rdtype)
+        if cached is not None:
+            answers[domain] = cached
+        else:
+            misses.append(domain)
+    return answers, misses
+
+_thread_state = threading.local()
+
+def _sync_resolver(timeout: float) -> dns.resolver.Resolver:
+    """This thread's blocking resolver, created (and resolv.conf read) once per thread."""
+    resolver = getattr(_thread_state, 'resolver', None)
+    if resolver is None:
+        resolver = _thread_state.resolver = dns.resolver.Resolver()
+    resolver.timeout = timeout
+    resolver.lifetime = timeout
+    return resolver
+
+async def _resolve_uncached(domains: List[str], rdtype: str, concurrency: int, timeout: float) -> Dict[str, DnsAnswer]:
+    """Query domains the cache could not answer, at most ``concurrency`` at a time."""
+    resolver = dns.asyncresolver.Resolver()
+    resolver.timeout = timeout
+    resolver.lifetime = timeout
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve_one(domain: str) -> Tuple[str, DnsAnswer]:
+        async with semaphore:
+            return domain, await dns_cache.resolve_async(domain, rdtype, resolver, check_cache=False)
+
+    return dict(await asyncio.gather(*[resolve_one(domain) for domain in domains]))
+
+async def resolve_domains_async(domains: Iterable[str], rdtype: str = 'MX',
+                                concurrency: int = DNS_BULK_CONCURRENCY,
+                                timeout: float = DNS_QUERY_TIMEOUT) -> Dict[str, DnsAnswer]:
+    """
+    Resolve one record type for many domains concurrently.
+
+    Each unique domain is queried once, at most ``concurrency`` at a time, and a query
+    gives up after ``timeout`` seconds. Answers go through the shared DNS cache.
+    Returns {domain: DnsAnswer} keyed by the lowercased domain.
+    """
+    answers, misses = _split_cached(domains, rdtype)
+    if misses:
+        answers.update(await _resolve_uncached(misses, rdtype, concurrency, timeout))
+    return answers
+
+def resolve_domains(domains: Iterable[str], rdtype: str = 'MX', concurrency: int = DNS_BULK_CONCURRENCY,
+                    timeout: float = DNS_QUERY_TIMEOUT) -> Dict[str, DnsAnswer]:
+    """
+    Blocking variant of resolve_domains_async(). A single uncached domain (the usual
+    case when one email is checked) is queried directly with this thread's resolver;
+    an event loop is only started for several. Must be called without a running event loop.
+    """
+    answers, misses = _split_cached(domains, rdtype)
+    if len(misses) == 1:
+        answers[misses[0]] = dns_cache.resolve(misses[0], rdtype, _sync_resolver(timeout))
+    elif misses:
+        answers.update(asyncio.run(_resolve_uncached(misses, rdtype, concurrency, timeout)))
+    return answers
+
+async def resolve_websites_async(domains: Iterable[str], concurrency: int = DNS_BULK_CONCURRENCY,
+                                 timeout: float = DNS_QUERY_TIMEOUT) -> Dict[str, DnsAnswer]:
+    """Resolve A records for many domains, falling back to CNAME for those without any."""
+    answers = await resolve_domains_async(domains, 'A', concurrency, timeout)
+    missing = [domain for domain, answer in answers.items() if answer.status == NO_ANSWER]
+    if missing:
+        answers.update(await resolve_domains_async(missing, 'CNAME', concurrency, timeout))
+    return answers
+
+def resolve_websites(domains: Iterable[str], concurrency: int = DNS_BULK_CONCURRENCY,
+                     timeout: float = DNS_QUERY_TIMEOUT) -> Dict[str, DnsAnswer]:
+    """Blocking variant of resolve_websites_async()."""
+    answers = resolve_domains(domains, 'A', concurrency, timeout)
+    missing = [domain for domain, answer in answers.items() if answer.status == NO_ANSWER]
+    if missing:
+        answers.update(resolve_domains(missing, 'CNAME', concurrency, timeout))
+    return answers
+
+# Same rule as is_valid_email_format, anchored per line so a whole batch is checked in one scan
+EMAIL_FORMAT_LINE_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.MULTILINE)
+
+def business_email_domains(business_name: str) -> List[str]:
+    """Domains a business's own email is expected to use (see validate_business_email)."""
+    business_domain = business_name.lower().replace(' ', '').replace('&', 'and')
+    return [f"{business_domain}.{tld}" for tld in ('com', 'org', 'net', 'biz')]
+
+def format_mask(emails: List[str]) -> List[bool]:
+    """Check is_valid_email_format for a whole list with a single regex scan."""
+    usable = [isinstance(email, str) and bool(email) and '\n' not in email and '..' not in email for email in emails]
+    lines = [email if ok else '' for email, ok in zip(emails, usable)]
+    text = '\n'.join(lines)
+
+    # Map each line's start offset back to its row
+    row_at = {}
+    offset = 0
+    for row, line in enumerate(lines):
+        row_at[offset] = row
+        offset += len(line) + 1
+
+    mask = [False] * len(emails)
+    for match in EMAIL_FORMAT_LINE_PATTERN.finditer(text):
+        mask[row_at[match.start()]] = True
+    return mask
+
+class EmailValidationTable:
+    """
+    Compact, columnar result of validate_email_batch(): one row per input address.
+
+    Rows keep the input order. Messages are stored once in ``reasons`` and referenced
+    by index from ``codes``. Iterating yields (email, valid, message) rows.
+    """
+
+    def __init__(self, emails: List[str], valid: List[bool], codes: List[int], reasons: List[str]):
+        self.emails = emails
+        self.valid = valid
+        self.codes = codes
+        self.reasons = reasons
+        self._rows = {email.lower(): row for row, email in enumerate(emails) if isinstance(email, str)}
+
+    def __len__(self) -> int:
+        return len(self.emails)
+
+    def __iter__(self):
+        for email, valid, code in zip(self.emails, self.valid, self.codes):
+            yield email, valid, self.reasons[code]
+
+    def lookup(self, email: str) -> Optional[Tuple[bool, str]]:
+        """Return (valid, message) for an address in the batch, or None if it was not in it."""
+        row = self._rows.get(email.lower()) if isinstance(email, str) else None
+        if row is None:
+            return None
+        return self.valid[row], self.reasons[self.codes[row]]
+
+    def valid_emails(self) -> List[str]:
+        """Addresses that passed, in input order."""
+        return [email for email, valid in zip(self.emails, self.valid) if valid]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of addresses per result message."""
+        counts: Dict[str, int] = {}
+        for code in self.codes:
+            counts[self.reasons[code]] = counts.get(self.reasons[code], 0) + 1
+        return counts
+
+def validate_email_batch(emails: Iterable[str], business_names: Optional[Iterable[str]] = None,
+                         concurrency: int = DNS_BULK_CONCURRENCY,
+                         timeout: float = DNS_QUERY_TIMEOUT) -> EmailValidationTable:
+    """
+    Validate many addresses at once and return an EmailValidationTable.
+
+    Format is checked for the whole list in one scan, addresses are grouped by domain
+    so blocklist and MX checks run once per domain, and domains are resolved
+    concurrently. Results match validate_email(), or validate_business_email() when
+    ``business_names`` (one per address) is given. Must be called without a running
+    event loop.
+    """
+    emails = list(emails)
+    names = list(business_names) if business_names is not None else None
+    mask = format_mask(emails)
+
+    reasons: List[str] = []
+    reason_codes: Dict[str, int] = {}
+
+    def code(message: str) -> int:
+        if message not in reason_codes:
+            reason_codes[message] = len(reasons)
+            reasons.append(message)
+        return reason_codes[message]
+
+    # Group well-formed addresses by domain
+    by_domain: Dict[str, List[int]] = {}
+    results: List[Tuple[bool, str]] = [(False, "")] * len(emails)
+    for row, (email, ok) in enumerate(zip(emails, mask)):
+        if not email or not isinstance(email, str):
+            results[row] = (False, "No email provided")
+        elif not ok:
+            results[row] = (False, "Invalid email format")
+        else:
+            by_domain.setdefault(email.split('@')[1], []).append(row)
+
+    blocked = {domain: blocked_domain_kind(domain) for domain in by_domain}
+    lookups = [domain for domain in by_domain if not blocked[domain]]
+    answers = resolve_domains(lookups, 'MX', concurrency, timeout)
+
+    for domain, rows in by_domain.items():
+        if blocked[domain]:
+            result = (False, BLOCKED_DOMAIN_MESSAGES[blocked[domain]])
+        else:
+            dns_valid, dns_message = mx_result(answers[domain.lower()])
+            result = (True, "Email appears valid") if dns_valid else (False, dns_message)
+        for row in rows:
+            results[row] = result
+            if names is not None and result[0]:
+                if domain in business_email_domains(names[row]):
+                    results[row] = (True, "Business email appears valid")
+                else:
+                    results[row] = (False, "Email domain does not match business name pattern")
+
+    return EmailValidationTable(emails, [valid for valid, _ in results], [code(message) for _, message in results], reasons)
+
+def validate_emails(emails: Iterable[str], concurrency: int = DNS_BULK_CONCURRENCY,
+                    timeout: float = DNS_QUERY_TIMEOUT) -> List[Tuple[bool, str]]:
+    """
+    Validate many emails at once; returns one (valid, message) per email, in order.
+    Results match validate_email(), but each domain is resolved once and concurrently.
+    Must be called without a running event loop.
+    """
+    return [(valid, message) for _, valid, message in validate_email_batch(emails, None, concurrency, timeout)]
+
+def validate_websites(urls: Iterable[str], concurrency: int = DNS_BULK_CONCURRENCY,
+                      timeout: float = DNS_QUERY_TIMEOUT) -> List[bool]:
+    """Check many website URLs resolve (A, else CNAME); one bool per URL, in order."""
+    domains = [website_domain(url) for url in urls]
+    answers = resolve_websites([domain for domain in domains if domain], concurrency, timeout)
+    return [bool(domain) and answers[domain.lower()].ok for domain in domains]
+
 if __name__ == "__main__":
     # Test the validation
     test_emails = [
@@ -89,8 +342,7 @@ if __name__ == "__main__":
         "invalid-email"
     ]
     
-    for email in test_emails:
-        is_valid, message = validate_email(email)
+    for email, (is_valid, message) in zip(test_emails, validate_emails(test_emails)):
         print(f"Email: {email}")
         print(f"Valid: {is_valid}")
         print(f"Message: {message}")
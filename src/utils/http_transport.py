@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import os
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config.config import (
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, REQUEST_TIMEOUT, HTTP_UPSTREAMS
+)
+
+# Server errors worth retrying; 429s are left to the callers' own rate-limit handling
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller does not pass one."""
+
+    def __init__(self, *args, timeout: float = REQUEST_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def upstream_settings(upstream: str) -> Dict:
+    """Return pool size, retries and timeout for an upstream, falling back to the defaults."""
+    settings = {
+        'pool_size': HTTP_POOL_SIZE,
+        'max_retries': HTTP_MAX_RETRIES,
+        'backoff_factor': HTTP_BACKOFF_FACTOR,
+        'timeout': REQUEST_TIMEOUT
+    }
+    settings.update(HTTP_UPSTREAMS.get(upstream, {}))
+    return settings
+
+
+def create_session(upstream: str) -> requests.Session:
+    """Create a keep-alive session with a connection pool sized for the given upstream."""
+    settings = upstream_settings(upstream)
+    retry = Retry(
+        total=settings['max_retries'],
+        backoff_factor=settings['backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=settings['pool_size'],
+        pool_maxsize=settings['pool_size'],
+        max_retries=retry,
+        timeout=settings['timeout']
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_sessions: Dict = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(upstream: str) -> requests.Session:
+    """
+    Return the shared session for an upstream (e.g. 'grok', 'firebase', 'mailgun').
+
+    Sessions are created once per process, so connections are reused across every call
+    to the same upstream. Worker processes forked from a parent get their own sessions.
+    """
+    key = (os.getpid(), upstream)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = create_session(upstream)
+                _sessions[key] = session
+    return session
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+import json
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Bare words models write in place of JSON literals
+LITERALS = {'true': 'true', 'false': 'false', 'null': 'null', 'True': 'true', 'False': 'false',
+            'None': 'null', 'NaN': 'null', 'undefined': 'null'}
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', '/': '/', '\\': '\\', '"': '"', "'": "'"}
+TOKEN_END = set(' \t\r\n,:[]{}"\'')
+NUMBER = re.compile(r'-?\d+(\.\d+)?([eE][+-]?\d+)?')
+
+
+class JSONRepairError(ValueError):
+    """The text holds no JSON that can be salvaged."""
+
+
+def strip_code_fence(content: str) -> str:
+    """Remove a surrounding ```json ... ``` fence, if any."""
+    content = content.strip()
+    if content.startswith('```'):
+        content = content.split('\n', 1)[1] if '\n' in content else content[3:]
+        if content.lstrip().lower().startswith('json'):
+            content = content.lstrip()[4:]
+    if content.endswith('```'):
+        content = content[:-3]
+    return content.strip()
+
+
+def _opener(text: str, expect: Optional[type]) -> str:
+    if expect is list:
+        return '['
+    if expect is dict:
+        return '{'
+    starts = [index for index in (text.find('['), text.find('{')) if index >= 0]
+    return text[min(starts)] if starts else '['
+
+
+def _read_string(text: str, start: int) -> Tuple[Optional[str], int]:
+    """Decode the quoted string at ``start``; returns (value, end) or (None, len) if it is cut off."""
+    quote, chars, index = text[start], [], start + 1
+    while index < len(text):
+        char = text[index]
+        if char == quote:
+            return ''.join(chars), index + 1
+        if char == '\\' and index + 1 < len(text):
+            code = text[index + 1]
+            if code == 'u' and index + 6 <= len(text):
+                try:
+                    chars.append(chr(int(text[index + 2:index + 6], 16)))
+                    index += 6
+                    continue
+                except ValueError:
+                    pass
+            chars.append(ESCAPES.get(code, code))
+            index += 2
+            continue
+        chars.append(char)
+        index += 1
+    return None, len(text)
+
+
+def _scalar(token: str) -> Optional[str]:
+    """JSON text of a bare number or literal, or None if the token is neither."""
+    if token in LITERALS:
+        return LITERALS[token]
+    return token if NUMBER.fullmatch(token) else None
+
+
+def repair_json(text: str, opener: Optional[str] = None) -> str:
+    """
+    Rewrite the first JSON array or object in ``text`` as valid JSON.
+
+    Fixes what models commonly get wrong: text around the JSON, trailing or missing
+    commas, single-quoted strings, raw newlines in strings, Python literals and
+    unquoted keys. A value cut off mid-way (a truncated response) is dropped and the
+    open brackets are closed, so every complete element survives. Raises
+    JSONRepairError if there is no bracket to start from.
+    """
+    text = strip_code_fence(text)
+    opener = opener or _opener(text, None)
+    start = text.find(opener)
+    if start < 0:
+        raise JSONRepairError(f"No JSON {'array' if opener == '[' else 'object'} in text")
+
+    out: List[str] = []
+    # One [kind, state, safe before it opened, has a complete value] per open container.
+    # Objects move key -> colon -> value -> next, arrays value -> next; 'next' follows a
+    # complete value
+    stack: List[List] = []
+    safe = 0  # len(out) at the last point where closing every open bracket gives valid JSON
+
+    def begin_value() -> bool:
+        """Fix up separators before a value; False if the value sits where a key belongs."""
+        kind, state = stack[-1][:2]
+        if state == 'next':
+            out.append(',')
+            state = stack[-1][1] = 'key' if kind == '{' else 'value'
+        if kind == '{':
+            if state == 'key':
+                return False
+            if state == 'colon':
+                out.append(':')
+        return True
+
+    def add_value(value: str):
+        nonlocal safe
+        if stack and not begin_value():
+            out.append(json.dumps(json.loads(value) if value.startswith('"') else value))
+            stack[-1][1] = 'colon'
+            return
+        out.append(value)
+        if stack:
+            stack[-1][1] = 'next'
+            stack[-1][3] = True
+        safe = len(out)
+
+    index = start
+    while index < len(text):
+        char = text[index]
+        if char.isspace():
+            index += 1
+        elif char in '"\'':
+            value, index = _read_string(text, index)
+            if value is None:
+                break
+            add_value(json.dumps(value, ensure_ascii=False))
+        elif char in '[{':
+            if stack and not begin_value():
+                # A container where a key belongs: give it an empty key
+                out.append('"":')
+            opened_at = safe
+            out.append(char)
+            stack.append([char, 'key' if char == '{' else 'value', opened_at, False])
+            safe = len(out)
+            index += 1
+        elif char in ']}':
+            if not stack:
+                break
+            del out[safe:]
+            kind = stack.pop()[0]
+            out.append(']' if kind == '[' else '}')
+            index += 1
+            if not stack:
+                safe = len(out)
+                break
+            stack[-1][1] = 'next'
+            stack[-1][3] = True
+            safe = len(out)
+        elif char == ',':
+            kind, state = stack[-1][:2]
+            if state == 'next':
+                out.append(',')
+                stack[-1][1] = 'key' if kind == '{' else 'value'
+            index += 1
+        elif char == ':':
+            if stack[-1][:2] == ['{', 'colon']:
+                out.append(':')
+                stack[-1][1] = 'value'
+            index += 1
+        else:
+            end = index
+            while end < len(text) and text[end] not in TOKEN_END:
+                end += 1
+            if end == len(text):
+                break  # a bare token at the very end may be cut off
+            token = text[index:end]
+            value = _scalar(token)
+            if value is not None:
+                add_value(value)
+            elif stack[-1][:2] == ['{', 'key']:
+                add_value(json.dumps(token))  # unquoted key
+            index = end
+
+    del out[safe:]
+    # A nested container cut off before any of its values completed is dropped whole
+    while len(stack) > 1 and not stack[-1][3]:
+        del out[stack.pop()[2]:]
+    for kind, *_ in reversed(stack):
+        out.append(']' if kind == '[' else '}')
+    return ''.join(out)
+
+
+def extract_json(text: str, expect: Optional[type] = None) -> Any:
+    """
+    Parse the JSON a model returned, repairing it if needed.
+
+    Valid JSON between the outer brackets takes the fast path (one json.loads); only
+    text that fails is run through repair_json(). ``expect`` (list or dict) picks the
+    bracket to start from; an object wrapping a single array (``{"businesses": [...]}``)
+    is unwrapped when a list is expected. Raises JSONRepairError when nothing of the
+    expected type can be salvaged.
+    """
+    stripped = strip_code_fence(text)
+    opener = _opener(stripped, expect)
+    closer = ']' if opener == '[' else '}'
+    start, end = stripped.find(opener), stripped.rfind(closer)
+    try:
+        if start < 0 or end < start:
+            raise ValueError
+        data = json.loads(stripped[start:end + 1])
+    except ValueError:
+        if expect is list and start < 0 and '{' in stripped:
+            opener = '{'
+        try:
+            data = json.loads(repair_json(stripped, opener))
+        except json.JSONDecodeError as e:
+            raise JSONRepairError(f"Unrepairable JSON: {e}")
+
+    if expect is list and isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list)]
+        if len(lists) == 1:
+            data = lists[0]
+    if expect is not None and not isinstance(data, expect):
+        raise JSONRepairError(f"Expected a JSON {expect.__name__}, got {type(data).__name__}")
+    return data
+
+
+class Field(NamedTuple):
+    """
+    Schema entry: ``spec`` is a type or tuple of types, a nested schema dict, or a
+    one-item list ``[spec]`` for a list of such values. ``check`` is an extra test of
+    the value, e.g. a range.
+    """
+    spec: Any
+    required: bool = True
+    check: Optional[Callable[[Any], bool]] = None
+
+
+def _coerce(value: Any, types: Tuple[type, ...]) -> Any:
+    """Convert the string forms models use for numbers and booleans, when that is what is expected."""
+    if isinstance(value, str):
+        text = value.strip()
+        if bool in types and text.lower() in ('true', 'false'):
+            return text.lower() == 'true'
+        if int in types or float in types:
+            try:
+                number = float(text)
+            except ValueError:
+                return value
+            return int(number) if int in types and number.is_integer() else number
+    return value
+
+
+def validate(data: Any, schema: Any, path: str = '') -> List[str]:
+    """
+    Check ``data`` against a schema (see Field); returns one message per failed field,
+    such as "tech_stack.score: failed check". Numbers and booleans sent as strings are
+    converted in place. Keys the schema does not mention are allowed.
+    """
+    field = schema if isinstance(schema, Field) else Field(schema)
+    spec, label = field.spec, path or 'value'
+    errors = []
+    if isinstance(spec, dict):
+        if not isinstance(data, dict):
+            return [f"{label}: expected object, got {type(data).__name__}"]
+        for key, child in spec.items():
+            child = child if isinstance(child, Field) else Field(child)
+            child_path = f"{path}.{key}" if path else key
+            if data.get(key) is None:
+                if child.required:
+                    errors.append(f"{child_path}: missing")
+                continue
+            if isinstance(child.spec, (type, tuple)):
+                data[key] = _coerce(data[key], child.spec if isinstance(child.spec, tuple) else (child.spec,))
+            errors.extend(validate(data[key], child, child_path))
+    elif isinstance(spec, list):
+        if not isinstance(data, list):
+            return [f"{label}: expected list, got {type(data).__name__}"]
+        for position, item in enumerate(data):
+            if isinstance(spec[0], (type, tuple)):
+                item = data[position] = _coerce(item, spec[0] if isinstance(spec[0], tuple) else (spec[0],))
+            errors.extend(validate(item, spec[0], f"{path}[{position}]"))
+    else:
+        types = spec if isinstance(spec, tuple) else (spec,)
+        if not isinstance(data, types) or isinstance(data, bool) and bool not in types:
+            names = '/'.join(kind.__name__ for kind in types)
+            return [f"{label}: expected {names}, got {type(data).__name__}"]
+    if not errors and field.check is not None and not field.check(data):
+        errors.append(f"{label}: failed check")
+    return errors
+
+
+def salvage_items(items: List, schema: Any) -> Tuple[List, Dict[int, List[str]]]:
+    """Keep the list items that pass the schema; returns (valid items, {position: errors})."""
+    valid, failures = [], {}
+    for position, item in enumerate(items):
+        errors = validate(item, schema)
+        if errors:
+            failures[position] = errors
+        else:
+            valid.append(item)
+    return valid, failures
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import asyncio
+import copy
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight call that other threads can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls into one.
+
+    The first caller for a key (the leader) runs the function; callers arriving with
+    the same key while it is in flight wait and receive its result (a deep copy, so
+    callers cannot see each other's mutations) or its exception. The key is forgotten
+    once the call finishes, so later calls run again. Threads and event-loop tasks are
+    tracked separately: a coroutine call is only shared within its own loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures = weakref.WeakKeyDictionary()  # event loop -> {key: Future}
+        self.stats = {'calls': 0, 'coalesced': 0}
+
+    def _join(self, calls: Dict, key: Hashable, new: Callable[[], Any]):
+        """Return (call, is_leader) for a key, registering a new call if none is in flight."""
+        with self._lock:
+            call = calls.get(key)
+            if call is not None:
+                self.stats['coalesced'] += 1
+                return call, False
+            call = calls[key] = new()
+            self.stats['calls'] += 1
+            return call, True
+
+    def _forget(self, calls: Dict, key: Hashable):
+        with self._lock:
+            calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn()`` unless an identical call is in flight; either way return its result."""
+        call, leader = self._join(self._calls, key, _Call)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._forget(self._calls, key)
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of do(); ``fn`` returns the awaitable to run."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            futures = self._futures.setdefault(loop, {})
+        future, leader = self._join(futures, key, loop.create_future)
+        if not leader:
+            # shield: a cancelled follower must not cancel the leader's call
+            return copy.deepcopy(await asyncio.shield(future))
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve it here so a call nobody joined does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._forget(futures, key)
+
+    def summary(self) -> Dict:
+        """Calls made, calls that joined one in flight, and the share coalesced, for logs."""
+        with self._lock:
+            calls, coalesced = self.stats['calls'], self.stats['coalesced']
+        total = calls + coalesced
+        return {
+            'calls': calls,
+            'coalesced': coalesced,
+            'coalesced_rate': f"{coalesced / total * 100:.2f}%" if total else "0%"
+        }
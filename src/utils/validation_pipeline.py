@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from src.config.config import DNS_BULK_CONCURRENCY, DNS_QUERY_TIMEOUT
+from src.utils.domain_blocklist import blocked_domain_kind
+from src.utils import email_validator
+from src.utils.email_validator import BLOCKED_DOMAIN_MESSAGES, format_mask, mx_result, website_domain
+
+# MX hosts with these words are catch-all or spam sinks rather than real mailboxes
+SPAM_MX_INDICATORS = ('spam', 'catch-all', 'bounce', 'invalid')
+
+
+class Tier(NamedTuple):
+    name: str
+    # Checks a batch of items; returns one failure message (or None if the item passed) per item
+    check: Callable[[List], List[Optional[str]]]
+
+
+class ValidationResult(NamedTuple):
+    valid: bool
+    tier: Optional[str]  # tier that rejected the item, None when it passed
+    message: str
+
+
+class ValidationPipeline:
+    """
+    Runs validation tiers over a batch, cheapest first.
+
+    Each tier only sees the items every earlier tier passed, so an address with a bad
+    format never costs a DNS query and one without MX records never costs a Hunter
+    call. Tiers check their whole batch at once, which lets network tiers resolve or
+    verify items concurrently. Per-tier item counts, rejections and time are kept in
+    ``stats``.
+    """
+
+    def __init__(self, tiers: List[Tier], valid_message: str = "Valid"):
+        self.tiers = tiers
+        self.valid_message = valid_message
+        self._lock = threading.Lock()
+        self.stats = {tier.name: {'checked': 0, 'rejected': 0, 'seconds': 0.0} for tier in tiers}
+
+    def run(self, items: Iterable) -> List[ValidationResult]:
+        """Validate a batch; returns one ValidationResult per item, in order."""
+        items = list(items)
+        results = [ValidationResult(True, None, self.valid_message)] * len(items)
+        survivors = list(range(len(items)))
+        for tier in self.tiers:
+            if not survivors:
+                break
+            started = time.perf_counter()
+            failures = tier.check([items[row] for row in survivors])
+            elapsed = time.perf_counter() - started
+
+            passed = []
+            for row, failure in zip(survivors, failures):
+                if failure:
+                    results[row] = ValidationResult(False, tier.name, failure)
+                else:
+                    passed.append(row)
+            with self._lock:
+                stats = self.stats[tier.name]
+                stats['checked'] += len(survivors)
+                stats['rejected'] += len(survivors) - len(passed)
+                stats['seconds'] += elapsed
+            survivors = passed
+        return results
+
+    def check(self, item) -> ValidationResult:
+        """Validate a single item."""
+        return self.run([item])[0]
+
+    def summary(self) -> Dict:
+        """Per-tier counts, rejection rate and mean time per item, for run logs."""
+        with self._lock:
+            return {
+                name: {
+                    'checked': stats['checked'],
+                    'rejected': stats['rejected'],
+                    'rejection_rate': f"{stats['rejected'] / stats['checked'] * 100:.2f}%" if stats['checked'] else "0%",
+                    'ms_per_item': round(stats['seconds'] * 1000 / stats['checked'], 3) if stats['checked'] else 0.0
+                }
+                for name, stats in self.stats.items()
+            }
+
+
+def _email_domain(email: str) -> str:
+    return email.split('@')[1].lower()
+
+
+def check_email_format(emails: List) -> List[Optional[str]]:
+    """Format tier: one regex scan over the whole batch."""
+    return [
+        None if ok else ("Invalid email format" if email and isinstance(email, str) else "No email provided")
+        for email, ok in zip(emails, format_mask(emails))
+    ]
+
+
+def check_email_blocklist(emails: List[str]) -> List[Optional[str]]:
+    """Blocklist tier: one memory-mapped lookup per unique domain."""
+    kinds = {domain: blocked_domain_kind(domain) for domain in map(_email_domain, emails)}
+    return [BLOCKED_DOMAIN_MESSAGES.get(kinds[_email_domain(email)]) for email in emails]
+
+
+def mx_checker(reject_suspicious_mx: bool = False, concurrency: int = DNS_BULK_CONCURRENCY,
+               timeout: float = DNS_QUERY_TIMEOUT) -> Callable[[List[str]], List[Optional[str]]]:
+    """MX tier: resolves every unique domain concurrently through the DNS cache."""
+    def check(emails: List[str]) -> List[Optional[str]]:
+        answers = email_validator.resolve_domains(map(_email_domain, emails), 'MX', concurrency, timeout)
+        failures = []
+        for email in emails:
+            answer = answers[_email_domain(email)]
+            valid, message = mx_result(answer)
+            if valid and reject_suspicious_mx and any(indicator in answer.records[0].lower()
+                                                      for indicator in SPAM_MX_INDICATORS):
+                valid, message = False, "Suspicious MX record"
+            failures.append(None if valid else message)
+        return failures
+    return check
+
+
+def hunter_checker(hunter) -> Callable[[List[str]], List[Optional[str]]]:
+    """Hunter tier: bulk or concurrent verification through a HunterService."""
+    def check(emails: List[str]) -> List[Optional[str]]:
+        verified = hunter.verify_emails(emails)
+        return [None if verified.get(email.strip().lower()) else "Hunter verification failed" for email in emails]
+    return check
+
+
+def email_pipeline(reject_suspicious_mx: bool = False, hunter=None,
+                   concurrency: int = DNS_BULK_CONCURRENCY, timeout: float = DNS_QUERY_TIMEOUT) -> ValidationPipeline:
+    """
+    Format -> blocklist -> MX -> (optionally) Hunter.
+
+    ``reject_suspicious_mx`` also rejects domains whose first MX host looks like a
+    catch-all or spam sink. Pass a HunterService as ``hunter`` to add the paid tier.
+    Must be run without a running event loop.
+    """
+    tiers = [
+        Tier('format', check_email_format),
+        Tier('blocklist', check_email_blocklist),
+        Tier('mx', mx_checker(reject_suspicious_mx, concurrency, timeout)),
+    ]
+    if hunter is not None:
+        tiers.append(Tier('hunter', hunter_checker(hunter)))
+    return ValidationPipeline(tiers, "Email appears valid")
+
+
+def _site_domain(url: str) -> str:
+    return (website_domain(url) or '').lower().rstrip('.')
+
+
+def check_website_url(urls: List) -> List[Optional[str]]:
+    """URL tier: the URL must have a scheme and a host."""
+    return [None if _site_domain(url) else "Invalid website URL" for url in urls]
+
+
+def website_dns_checker(concurrency: int = DNS_BULK_CONCURRENCY,
+                        timeout: float = DNS_QUERY_TIMEOUT) -> Callable[[List[str]], List[Optional[str]]]:
+    """DNS tier: A records, else CNAME, resolved concurrently through the DNS cache."""
+    def check(urls: List[str]) -> List[Optional[str]]:
+        domains = [_site_domain(url) for url in urls]
+        answers = email_validator.resolve_websites(domains, concurrency, timeout)
+        return [None if answers[domain].ok else "Website domain does not resolve" for domain in domains]
+    return check
+
+
+def website_pipeline(concurrency: int = DNS_BULK_CONCURRENCY, timeout: float = DNS_QUERY_TIMEOUT) -> ValidationPipeline:
+    """URL -> DNS. Must be run without a running event loop."""
+    return ValidationPipeline([
+        Tier('url', check_website_url),
+        Tier('dns', website_dns_checker(concurrency, timeout)),
+    ], "Website resolves")
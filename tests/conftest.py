@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import sys
+
+import pytest
+
+from src.services import llm_client
+from src.utils import dns_cache, domain_blocklist, email_validator
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """
+    Keep the shared on-disk stores (DNS cache, domain blocklist, LLM response cache)
+    in each test's tmp_path, so no test reads or writes .cache/ in the checkout or
+    depends on what an earlier run stored there.
+    """
+    cache = dns_cache.DnsCache(str(tmp_path / 'dns.sqlite3'))
+    monkeypatch.setattr(dns_cache, 'dns_cache', cache)
+    monkeypatch.setattr(email_validator, 'dns_cache', cache)
+    parallel = sys.modules.get('src.scrapers.business_scraper_parallel')
+    if parallel is not None:
+        monkeypatch.setattr(parallel, 'dns_cache', cache)
+
+    monkeypatch.setattr(domain_blocklist, 'DOMAIN_BLOCKLIST_PATH', str(tmp_path / 'domain_blocklist.bin'))
+    monkeypatch.setattr(domain_blocklist, '_blocklist', None)
+
+    monkeypatch.setattr(llm_client, 'LLM_CACHE_PATH', str(tmp_path / 'llm_responses.sqlite3'))
+    monkeypatch.setattr(llm_client, '_client', None)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import asyncio
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from src.utils import email_validator
+from src.utils.dns_cache import DnsCache
+from tests.test_dns_cache import FakeAnswer
+
+ZONE = {
+    ('shop.com', 'MX'): (['10 mx.shop.com.'], 300),
+    ('cafe.org', 'MX'): (['10 mx.cafe.org.'], 300),
+    ('shop.com', 'A'): (['1.2.3.4'], 300),
+    ('alias.net', 'A'): dns.resolver.NoAnswer(),
+    ('alias.net', 'CNAME'): (['shop.com.'], 300),
+    ('slow.io', 'MX'): dns.exception.Timeout(),
+}
+
+
+def answer(name, rdtype):
+    """Answer a query from ZONE the way dnspython would."""
+    result = ZONE.get((name, rdtype))
+    if isinstance(result, Exception):
+        raise result
+    if result is None:
+        raise dns.resolver.NXDOMAIN()
+    return FakeAnswer(*result)
+
+
+class FakeAsyncResolver:
+    """Async resolver stand-in that records queries and peak concurrency."""
+    queries = []
+    in_flight = 0
+    peak = 0
+
+    async def resolve(self, name, rdtype):
+        cls = FakeAsyncResolver
+        cls.queries.append((name, rdtype))
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        return answer(name, rdtype)
+
+
+class FakeSyncResolver:
+    """Blocking resolver stand-in answering from the same zone."""
+    created = 0
+
+    def __init__(self):
+        FakeSyncResolver.created += 1
+
+    def resolve(self, name, rdtype):
+        FakeAsyncResolver.queries.append((name, rdtype))
+        return answer(name, rdtype)
+
+
+@pytest.fixture(autouse=True)
+def fake_dns(tmp_path, monkeypatch):
+    FakeAsyncResolver.queries = []
+    FakeAsyncResolver.peak = 0
+    monkeypatch.setattr(email_validator, 'dns_cache', DnsCache(str(tmp_path / 'dns.sqlite3')))
+    monkeypatch.setattr(email_validator.dns.asyncresolver, 'Resolver', FakeAsyncResolver)
+    monkeypatch.setattr(email_validator.dns.resolver, 'Resolver', FakeSyncResolver)
+    monkeypatch.setattr(email_validator, '_thread_state', email_validator.threading.local())
+
+
+def test_validate_emails_resolves_each_domain_once():
+    """Test that results come back per email, in order, with one query per unique domain."""
+    emails = ['a@shop.com', 'b@shop.com', 'bad-email', 'c@cafe.org', 'd@gone.biz', 'e@slow.io', 'x@tempmail.com']
+    assert email_validator.validate_emails(emails) == [
+        (True, "Email appears valid"),
+        (True, "Email appears valid"),
+        (False, "Invalid email format"),
+        (True, "Email appears valid"),
+        (False, "Domain does not exist"),
+        (False, "Error checking DNS: lookup timed out"),
+        (False, "Disposable email domain not allowed"),
+    ]
+    assert sorted(FakeAsyncResolver.queries) == [
+        ('cafe.org', 'MX'), ('gone.biz', 'MX'), ('shop.com', 'MX'), ('slow.io', 'MX')
+    ]
+
+
+def test_validate_websites_falls_back_to_cname():
+    """Test that websites without A records are checked for a CNAME."""
+    urls = ['https://www.shop.com/menu', 'http://alias.net', 'https://gone.biz', 'not a url']
+    assert email_validator.validate_websites(urls) == [True, True, False, False]
+
+
+def test_bulk_resolution_is_bounded():
+    """Test that no more than ``concurrency`` queries are in flight."""
+    domains = [f'site{i}.com' for i in range(50)]
+    answers = asyncio.run(email_validator.resolve_domains_async(domains, 'MX', concurrency=5))
+    assert len(answers) == 50
+    assert FakeAsyncResolver.peak == 5
+
+
+def test_format_mask_matches_single_checks():
+    """Test that the one-scan format check agrees with is_valid_email_format."""
+    emails = ['a@shop.com', 'a..b@shop.com', 'no-at.com', 'a@b.c', 'x@y.io\nz@w.io', '', 'UP@Case.ORG', ' a@shop.com']
+    assert email_validator.format_mask(emails) == [email_validator.is_valid_email_format(e) for e in emails]
+
+
+def test_validate_email_batch_builds_compact_table():
+    """Test that the table keeps input order, shares messages and checks each domain once."""
+    emails = ['info@shop.com', 'sales@shop.com', 'hi@cafe.org', None, 'oops']
+    table = email_validator.validate_email_batch(emails, ['Shop', 'Other', 'Cafe', 'X', 'Y'])
+
+    assert table.valid == [True, False, True, False, False]
+    assert table.lookup('SALES@shop.com') == (False, "Email domain does not match business name pattern")
+    assert table.valid_emails() == ['info@shop.com', 'hi@cafe.org']
+    assert table.counts() == {
+        "Business email appears valid": 2,
+        "Email domain does not match business name pattern": 1,
+        "No email provided": 1,
+        "Invalid email format": 1,
+    }
+    assert len(table.reasons) == 4
+    assert sorted(FakeAsyncResolver.queries) == [('cafe.org', 'MX'), ('shop.com', 'MX')]
+
+
+def test_single_lookup_does_not_start_an_event_loop(monkeypatch):
+    """Test that one uncached domain is resolved with the thread's reused resolver, not asyncio.run()."""
+    def no_loop(coroutine):
+        coroutine.close()
+        raise AssertionError('event loop started for a single lookup')
+
+    FakeSyncResolver.created = 0
+    monkeypatch.setattr(email_validator.asyncio, 'run', no_loop)
+
+    assert email_validator.validate_emails(['a@shop.com']) == [(True, "Email appears valid")]
+    assert email_validator.validate_emails(['b@gone.biz']) == [(False, "Domain does not exist")]
+    assert email_validator.validate_emails(['c@shop.com']) == [(True, "Email appears valid")]
+    assert FakeAsyncResolver.queries == [('shop.com', 'MX'), ('gone.biz', 'MX')]
+    assert FakeSyncResolver.created == 1
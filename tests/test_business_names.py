@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+from src.scrapers.business_scraper import get_existing_business_names
+from src.utils.business_names import ExistingNames, estimate_tokens, normalize_name
+
+
+def test_normalize_name_drops_noise():
+    """Test that case, punctuation, a leading "the" and legal suffixes do not tell names apart."""
+    assert normalize_name("The Corner Bakery, LLC") == "corner bakery"
+    assert normalize_name("Joe's Auto & Tire Co.") == "joes auto and tire"
+    assert normalize_name("The Co") == "co"
+
+
+def test_match_is_exact_everywhere_and_fuzzy_within_a_city():
+    """Test exact matches across cities and close variants only within the same city."""
+    names = ExistingNames()
+    names.add("Smith Family Plumbing LLC", "Boston", "MA", "Plumbers")
+
+    assert names.match("smith family plumbing", "Denver", "CO") == "Smith Family Plumbing LLC"
+    assert names.match("Smith Famly Plumbing", "Boston", "MA") == "Smith Family Plumbing LLC"
+    assert names.match("Smith Famly Plumbing", "Denver", "CO") is None
+    assert names.match("Jones Electric", "Boston", "MA") is None
+    assert "The Smith Family Plumbing" in names
+
+
+def test_prompt_names_prefer_relevant_and_fit_the_budget():
+    """Test that prompt names come from the city, same type and newest first, and stop at the token budget."""
+    sites = {
+        f"site{i}": {"name": f"Boston Bakery {i}", "city": "Boston", "state": "MA",
+                     "business_type": "Bakeries", "timestamp": f"2024-01-01T{i // 60:02d}:{i % 60:02d}:00"}
+        for i in range(200)
+    }
+    sites["florist"] = {"name": "Boston Flowers", "city": "Boston", "state": "MA",
+                        "business_type": "Florists", "timestamp": "2025-01-01"}
+    sites["elsewhere"] = {"name": "Denver Bakery", "city": "Denver", "state": "CO",
+                          "business_type": "Bakeries", "timestamp": "2025-01-01"}
+    names = get_existing_business_names(sites)
+
+    prompt_names = names.prompt_names("Boston", "MA", "Bakeries", max_tokens=40)
+    assert prompt_names[0] == "Boston Bakery 199"
+    assert "Denver Bakery" not in prompt_names and "Boston Flowers" not in prompt_names
+    assert sum(estimate_tokens(name + '; ') for name in prompt_names) <= 40
+
+    # The prompt does not grow with the number of saved businesses
+    for i in range(1000):
+        names.add(f"Another Bakery {i}", "Boston", "MA", "Bakeries")
+    prompt_names = names.prompt_names("Boston", "MA", "Bakeries", max_tokens=40)
+    assert prompt_names[0] == "Another Bakery 999"
+    assert sum(estimate_tokens(name + '; ') for name in prompt_names) <= 40
+    assert names.prompt_names("Boston", "MA", "Florists", max_tokens=40)[0] == "Boston Flowers"
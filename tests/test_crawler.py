@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.scrapers.crawler import AsyncCrawler, EmailStreamScanner
+from src.scrapers.page_cache import PageCache
+from src.scrapers.politeness import HostScheduler
+from src.scrapers.site_index import SiteIndex
+
+PAGES = {
+    '/': '<html><body><a href="/contact">Contact us</a></body></html>',
+    '/contact': '<html><body>Reach us at hello@example.com</body></html>',
+    '/plain': '<html><body>Nothing here</body></html>',
+    '/loop': '<a href="/team">Our team</a><a href="/about">About</a><a href="/contact-us">Contact</a>',
+    '/team': '<a href="/contact-us">Contact</a><a href="/about">About</a>',
+    '/about': '<a href="/contact-us">Contact</a><a href="/team">Team</a>',
+    '/contact-us': '<a href="/about">About</a> Write to team@example.com',
+    '/hidden-home': '<html><body>Welcome</body></html>',
+    '/private-contact': 'secret@example.com',
+    '/reach-out': 'Write to owner@example.com',
+    '/big': '<html><body><a href="mailto:owner@example.com">Email</a>' + 'x' * 500000 + '</body></html>',
+}
+
+
+# Served only to requests for "localhost", so other tests on 127.0.0.1 see a site without them
+SITE_FILES = {
+    '/robots.txt': 'User-agent: *\nDisallow: /private\n',
+    '/sitemap.xml': ('<?xml version="1.0"?><urlset>'
+                     '<url><loc>http://{host}/private-contact</loc></url>'
+                     '<url><loc>http://{host}/reach-out</loc></url>'
+                     '<url><loc>http://{host}/blog/first-post</loc></url></urlset>'),
+}
+
+REQUESTS = []
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        REQUESTS.append(self.path)
+        host = self.headers.get('Host', '')
+        if self.path in SITE_FILES:
+            body = SITE_FILES[self.path].replace('{host}', host) if host.startswith('localhost') else None
+        else:
+            body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{len(body)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+CRAWLERS = []
+
+
+@pytest.fixture(autouse=True)
+def close_crawlers():
+    """Stop the background loop and session of every crawler a test made."""
+    yield
+    while CRAWLERS:
+        CRAWLERS.pop().close()
+
+
+def make_crawler(tmp_path, ttl=3600, **kwargs):
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'), ttl=ttl)
+    site_index = SiteIndex(str(tmp_path / 'sites.sqlite3'))
+    crawler = AsyncCrawler(find_email, dict, scheduler=HostScheduler(min_interval=0), cache=cache,
+                           site_index=site_index, **kwargs)
+    CRAWLERS.append(crawler)
+    return crawler
+
+
+def find_email(soup, business_name):
+    """Minimal email finder that accepts any address in the page text."""
+    text = soup.get_text()
+    if '@' in text:
+        return text.split()[-1], "Valid email found in text content"
+    return None, "No valid email found on page"
+
+
+def test_crawl_follows_contact_page(site_url, tmp_path):
+    """Test that the crawler finds an email on a linked contact page."""
+    crawler = make_crawler(tmp_path)
+    results = crawler.crawl([(site_url + '/', 'Example')])
+    assert results == [('hello@example.com', "Valid email found in text content")]
+
+
+def test_crawl_preserves_target_order(site_url, tmp_path):
+    """Test that concurrent results come back in target order."""
+    crawler = make_crawler(tmp_path)
+    results = crawler.crawl([
+        (site_url + '/plain', 'Plain'),
+        (site_url + '/missing', 'Missing'),
+        (site_url + '/contact', 'Contact'),
+    ])
+    assert results[0] == (None, "No valid email found after checking all pages")
+    assert results[1][0] is None and results[1][1].startswith("Network error")
+    assert results[2][0] == 'hello@example.com'
+
+
+def test_crawl_revalidates_stale_pages(site_url, tmp_path):
+    """Test that a second crawl revalidates cached pages with a conditional GET."""
+    crawler = make_crawler(tmp_path, ttl=0)
+    first = crawler.crawl([(site_url + '/contact', 'Contact')])
+    second = crawler.crawl([(site_url + '/contact', 'Contact')])
+    assert first == second
+    assert crawler.cache.stats['stores'] == 1
+    assert crawler.cache.stats['revalidated'] == 1
+
+
+def test_streaming_fetch_stops_at_first_valid_email(site_url, tmp_path):
+    """Test that streaming stops once a validated email is seen and nothing is cached."""
+    crawler = make_crawler(tmp_path, validate_email=lambda email: True)
+    results = crawler.crawl([(site_url + '/big', 'Big')])
+    assert results == [('owner@example.com', "Valid email found in mailto link")]
+    assert crawler.cache.stats['stores'] == 0
+
+
+def test_crawl_fetches_each_contact_page_once(site_url, tmp_path):
+    """Test that pages linked from several places are fetched once, best-ranked first."""
+    REQUESTS.clear()
+    crawler = make_crawler(tmp_path)
+    results = crawler.crawl([(site_url + '/loop', 'Loop')])
+    assert results == [('team@example.com', "Valid email found in text content")]
+    pages = [path for path in REQUESTS if path not in SITE_FILES]
+    assert sorted(pages) == sorted(set(pages))
+    assert pages[:2] == ['/loop', '/contact-us']
+
+
+def test_crawl_uses_cached_sitemap_and_robots(site_url, tmp_path):
+    """Test that sitemap contact pages are fetched directly, robots.txt is honored and both are cached."""
+    url = site_url.replace('127.0.0.1', 'localhost') + '/hidden-home'
+    REQUESTS.clear()
+    assert make_crawler(tmp_path).crawl([(url, 'Hidden')]) == [
+        ('owner@example.com', "Valid email found in text content")
+    ]
+    assert REQUESTS == ['/hidden-home', '/robots.txt', '/sitemap.xml', '/reach-out']
+
+    REQUESTS.clear()
+    make_crawler(tmp_path, ttl=0).crawl([(url, 'Hidden')])
+    assert '/robots.txt' not in REQUESTS and '/sitemap.xml' not in REQUESTS
+
+
+def test_stream_scanner_handles_split_addresses():
+    """Test that addresses split across chunks are reported once and whole."""
+    scanner = EmailStreamScanner(overlap=8)
+    assert scanner.feed("write to info@exam") == []
+    assert scanner.feed("ple.com today") == []
+    scanner = EmailStreamScanner(overlap=64)
+    assert scanner.feed("write to info@exam") == []
+    assert scanner.feed("ple.com today") == [("info@example.com", "page content")]
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serves a page without an email after a short delay, recording the most requests in flight at once."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.active += 1
+            SlowHandler.peak = max(SlowHandler.peak, SlowHandler.active)
+        time.sleep(0.05)
+        with SlowHandler.lock:
+            SlowHandler.active -= 1
+        body = b'<html><body>Nothing here</body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_crawls_from_many_threads_share_one_bound(tmp_path):
+    """Test that max_in_flight bounds the fetches of all threads calling crawl() together."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    crawler = make_crawler(tmp_path, max_in_flight=2)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda worker: crawler.crawl([(f"{url}/page-{worker}-{i}", 'Slow') for i in range(3)]), range(4)
+            ))
+    finally:
+        server.shutdown()
+
+    assert all(email is None for batch in results for email, _ in batch)
+    assert SlowHandler.peak == 2
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import pytest
+
+from src.scrapers import business_scraper_parallel
+from src.scrapers.business_scraper_parallel import BusinessScraper
+
+TYPES = [
+    ("Retail Boutiques", 8, "Small retail stores specializing in specific products"),
+    ("Legal Firms", 9, "Small law offices"),
+    ("Dental Offices", 8, "Independent dentists"),
+]
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    scraper = BusinessScraper('key', 0)
+    prompts = []
+
+    def chat_json(messages, expect=None, **params):
+        prompts.append((messages[-1]['content'], expect, params['max_tokens']))
+        if expect is dict:
+            return {
+                'retail boutiques': [{'name': 'Shop A', 'description': 'Gifts'}, {'name': 'Old Shop', 'description': 'Taken'}],
+                'Legal Firms ': [{'name': 'Law B', 'description': 'Wills'}, 'not a business'],
+            }
+        return [{'name': 'Dentist C', 'description': 'Teeth'}]
+
+    monkeypatch.setattr(scraper.llm, 'chat_json', chat_json)
+    monkeypatch.setattr(scraper, 'get_existing_businesses_by_type', lambda city, state, types: {
+        business_type: (['old shop'] if business_type == 'Retail Boutiques' else [], []) for business_type in types
+    })
+    monkeypatch.setattr(scraper, '_validate_contacts', lambda businesses: {'website': {}, 'email': {}})
+    scraper.prompts = prompts
+    return scraper
+
+
+def test_batched_prompt_is_split_per_business_type(scraper):
+    """Test that one batched answer yields per-type results, with missing types asked for alone."""
+    results = scraper.get_businesses_from_grok_batch("Boston", "MA", TYPES, [], None)
+
+    assert {business_type: [business['name'] for business in businesses]
+            for business_type, businesses in results.items()} == {
+        'Retail Boutiques': ['Shop A'], 'Legal Firms': ['Law B'], 'Dental Offices': ['Dentist C']
+    }
+    batch_prompt, expect, max_tokens = scraper.prompts[0]
+    assert expect is dict and max_tokens == 3 * 2000
+    assert all(f"- {business_type}: {description}" in batch_prompt for business_type, _, description in TYPES)
+    # Only the type the batched answer left out costs a second call
+    assert len(scraper.prompts) == 2 and "Dental Offices" in scraper.prompts[1][0]
+
+
+def test_failed_batch_is_not_retried_per_type(scraper, monkeypatch):
+    """Test that a failed batched call returns empty results instead of one call per business type."""
+    monkeypatch.setattr(scraper, '_ask_grok', lambda prompt, expect, max_tokens: scraper.prompts.append(prompt))
+    results = scraper.get_businesses_from_grok_batch("Boston", "MA", TYPES, [], None)
+
+    assert results == {business_type: [] for business_type, _, _ in TYPES}
+    assert len(scraper.prompts) == 1
+
+
+class FakeFirebase:
+    """Session stand-in that records what is PUT to Firebase."""
+
+    def __init__(self):
+        self.puts = []
+
+    def put(self, url, json=None, **kwargs):
+        self.puts.append((url, json))
+        return type('Response', (), {'status_code': 200})()
+
+
+def test_employee_counts_sent_as_strings_are_saved(scraper, monkeypatch):
+    """Test that an employee count validation turned into an int still reaches Firebase as text."""
+    firebase = FakeFirebase()
+    monkeypatch.setattr(business_scraper_parallel, 'get_session', lambda upstream: firebase)
+    businesses = scraper._process_grok_businesses([([
+        {'name': 'Shop A', 'description': 'Gifts', 'email': 'hello@shopa.com', 'employees': '50'}
+    ], [])])[0]
+
+    assert scraper.clean_business_data(businesses[0])['employees'] == '50'
+    assert scraper.save_to_firebase(businesses[0], 'Retail Boutiques', 'Boston', 'MA')
+    url, saved = firebase.puts[0]
+    assert url.endswith('/businesses/retail_boutiques_boston_ma_shop_a.json')
+    assert saved['employees'] == '50'
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import dns.exception
+import dns.resolver
+
+from src.utils.dns_cache import DnsCache, NXDOMAIN, OK, TIMEOUT
+
+
+class FakeRecord:
+    def __init__(self, text):
+        self.text = text
+
+    def to_text(self):
+        return self.text
+
+
+class FakeAnswer(list):
+    def __init__(self, records, ttl):
+        super().__init__(FakeRecord(record) for record in records)
+        self.rrset = type('RRset', (), {'ttl': ttl})()
+
+
+class FakeResolver:
+    """Resolver stand-in that counts queries instead of touching the network."""
+
+    def __init__(self, zone):
+        self.zone = zone
+        self.queries = []
+
+    def resolve(self, name, rdtype):
+        self.queries.append((name, rdtype))
+        result = self.zone.get((name, rdtype))
+        if isinstance(result, Exception):
+            raise result
+        if result is None:
+            raise dns.resolver.NXDOMAIN()
+        return FakeAnswer(*result)
+
+
+def make_cache(tmp_path, resolver, **kwargs):
+    return DnsCache(str(tmp_path / 'dns.sqlite3'), resolver=resolver, **kwargs)
+
+
+def test_positive_and_negative_answers_are_cached(tmp_path):
+    """Test that repeat lookups, including NXDOMAIN, are answered without a query."""
+    resolver = FakeResolver({('shop.com', 'MX'): (['10 mx.shop.com.'], 300)})
+    cache = make_cache(tmp_path, resolver)
+    for _ in range(3):
+        assert cache.resolve('shop.com', 'MX').records == ['10 mx.shop.com.']
+        assert cache.resolve('missing.com', 'MX').status == NXDOMAIN
+    assert len(resolver.queries) == 2
+    assert cache.hit_rate() == 4 / 6
+
+
+def test_cache_is_shared_between_instances(tmp_path):
+    """Test that another process (a second instance on the same file) reuses stored answers."""
+    make_cache(tmp_path, FakeResolver({('shop.com', 'A'): (['1.2.3.4'], 300)})).resolve('SHOP.com.', 'a')
+    resolver = FakeResolver({})
+    answer = make_cache(tmp_path, resolver).resolve('shop.com', 'A')
+    assert answer.status == OK and answer.records == ['1.2.3.4']
+    assert resolver.queries == []
+
+
+def test_ttl_is_honored_and_timeouts_are_not_cached(tmp_path):
+    """Test that expired answers and timeouts are looked up again."""
+    resolver = FakeResolver({
+        ('shop.com', 'A'): (['1.2.3.4'], 0),
+        ('slow.com', 'A'): dns.exception.Timeout(),
+    })
+    cache = make_cache(tmp_path, resolver, min_ttl=0)
+    cache.resolve('shop.com', 'A')
+    cache.resolve('shop.com', 'A')
+    assert cache.resolve('slow.com', 'A').status == TIMEOUT
+    assert cache.resolve('slow.com', 'A').status == TIMEOUT
+    assert len(resolver.queries) == 4
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import os
+
+from src.config.config import DOMAIN_BLOCKLIST_SOURCES
+from src.utils.domain_blocklist import (
+    DomainBlocklist, build_blocklist, build_from_sources, read_domain_list, sources_changed
+)
+
+
+def make_blocklist(tmp_path, disposable, role=()):
+    path = str(tmp_path / 'blocklist.bin')
+    build_blocklist({'disposable': disposable, 'role': role}, path)
+    return DomainBlocklist(path)
+
+
+def test_exact_and_parent_domain_matches(tmp_path):
+    """Test that listed domains and their subdomains match, and nothing else does."""
+    blocklist = make_blocklist(tmp_path, ['mailinator.com', 'Temp-Mail.org.'], ['example.com'])
+    assert blocklist.match('MAILINATOR.com') == ('mailinator.com', 'disposable')
+    assert blocklist.match('eu.inbox.mailinator.com') == ('mailinator.com', 'disposable')
+    assert blocklist.match('temp-mail.org') == ('temp-mail.org', 'disposable')
+    assert blocklist.match('shop.example.com') == ('example.com', 'role')
+    assert blocklist.match('notmailinator.com') is None
+    assert blocklist.match('com') is None
+
+
+def test_large_list_stays_compact(tmp_path):
+    """Test that 100k domains compile to a small file and every one is found."""
+    domains = [f'throwaway{i}.net' for i in range(100000)]
+    blocklist = make_blocklist(tmp_path, domains)
+    assert len(blocklist) == 100000
+    assert os.path.getsize(blocklist.path) < 2 * 1024 * 1024
+    assert all(blocklist.exact(domain) == 'disposable' for domain in domains[::997])
+    assert blocklist.exact('throwaway100000.net') is None
+
+
+def test_seed_lists_compile(tmp_path):
+    """Test that the shipped seed lists parse and include the old hard-coded domains."""
+    lists = {kind: [domain for path in paths for domain in read_domain_list(path)]
+             for kind, paths in DOMAIN_BLOCKLIST_SOURCES.items()}
+    blocklist = make_blocklist(tmp_path, lists['disposable'], lists['role'])
+    for domain in ('tempmail.com', 'throwawaymail.com', 'tempmailaddress.com'):
+        assert blocklist.exact(domain) == 'disposable'
+    assert blocklist.match('o123.ingest.sentry.io')[1] == 'role'
+    # Placeholder and hosting-platform domains are left to the other checks
+    for domain in ('example.com', 'test.com', 'company.com', 'wordpress.com', 'squarespace.com', 'godaddy.com'):
+        assert blocklist.match(domain) is None
+
+
+def test_rebuild_when_source_lists_are_added_or_removed(tmp_path):
+    """Test that adding a list older than the compiled file, or dropping one, triggers a rebuild."""
+    path = str(tmp_path / 'blocklist.bin')
+    old_list, seed_list = tmp_path / 'old.txt', tmp_path / 'seed.txt'
+    old_list.write_text('oldtrash.com\n')
+    seed_list.write_text('mailinator.com\n')
+    os.utime(old_list, (0, 0))
+    sources = {'disposable': [str(seed_list)], 'role': []}
+
+    build_from_sources(path, sources)
+    assert not sources_changed(path, sources)
+
+    with_old = {'disposable': [str(seed_list), str(old_list)], 'role': []}
+    assert sources_changed(path, with_old)
+    build_from_sources(path, with_old)
+    assert DomainBlocklist(path).exact('oldtrash.com') == 'disposable'
+
+    assert sources_changed(path, sources)
+    build_from_sources(path, sources)
+    assert DomainBlocklist(path).exact('oldtrash.com') is None
+
+    seed_list.write_text('mailinator.com\nguerrillamail.com\n')
+    assert sources_changed(path, sources)
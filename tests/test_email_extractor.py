@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+from bs4 import BeautifulSoup
+
+from src.scrapers.email_extractor import extract_emails, find_email
+
+
+def test_extract_emails_normalizes_obfuscations():
+    """Test that every obfuscation variant is found and normalized in one pass."""
+    text = "a@x.com, b [at] y.org, c(at)z.net, d @ w.io and A@X.com again"
+    assert extract_emails(text) == ["a@x.com", "b@y.org", "c@z.net", "d@w.io"]
+
+
+def test_find_email_checks_sources_in_order():
+    """Test that meta tags win over mailto links and text."""
+    soup = BeautifulSoup(
+        '<meta content="meta@shop.com"><a href="mailto:link@shop.com">x</a><p>text@shop.com</p>',
+        'html.parser'
+    )
+    assert find_email(soup, lambda email: True) == ("meta@shop.com", "Valid email found in meta tags")
+
+
+def test_find_email_validates_each_candidate_once():
+    """Test that a repeated candidate is only validated once."""
+    soup = BeautifulSoup(
+        '<p>bad@shop.com bad@shop.com good@shop.com </p><a href="mailto:bad@shop.com">x</a>',
+        'html.parser'
+    )
+    checked = []
+
+    def validate(email):
+        checked.append(email)
+        return email.startswith("good")
+
+    assert find_email(soup, validate) == ("good@shop.com", "Valid email found in text content")
+    assert checked == ["bad@shop.com", "good@shop.com"]
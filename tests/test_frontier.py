@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+from bs4 import BeautifulSoup
+
+from src.scrapers.frontier import CrawlFrontier, resolve_link
+
+
+def page(markup):
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def test_resolve_link_canonicalizes():
+    """Test that relative, fragment and non-web links are resolved or dropped."""
+    assert resolve_link('https://Shop.com/about/', '../contact#form') == 'https://shop.com/contact'
+    assert resolve_link('https://shop.com/', 'mailto:a@shop.com') is None
+    assert resolve_link('https://shop.com/', '/contact/menu.pdf') is None
+
+
+def test_frontier_ranks_and_deduplicates():
+    """Test that duplicate links are queued once and the best candidates come first."""
+    frontier = CrawlFrontier('https://shop.com/', top_k=2)
+    frontier.add_links(page(
+        '<a href="/about">About</a><a href="/contact">Contact us</a><a href="contact">Contact</a>'
+        '<a href="https://other.com/contact">Partner</a><a href="/menu">Menu</a>'
+    ), 'https://shop.com/', 0)
+    assert [link.url for link in frontier.next_batch()] == ['https://shop.com/contact', 'https://shop.com/about']
+    assert frontier.next_batch() == []
+
+
+def test_frontier_respects_depth_and_page_budget():
+    """Test that links are not followed past max_depth or the per-site page budget."""
+    frontier = CrawlFrontier('https://shop.com/', max_depth=1, max_pages=3, top_k=5)
+    frontier.add_links(page(''.join(f'<a href="/contact-{i}">Contact</a>' for i in range(5))), 'https://shop.com/', 0)
+    batch = frontier.next_batch()
+    assert len(batch) == 2 and all(link.depth == 1 for link in batch)
+
+    frontier.add_links(page('<a href="/contact-deep">Contact</a>'), batch[0].url, batch[0].depth)
+    assert frontier.next_batch() == []
+
+
+def test_frontier_prefers_sitemap_urls_and_honors_robots():
+    """Test that sitemap pages outrank guessed links and disallowed pages are skipped."""
+    frontier = CrawlFrontier('https://shop.com/', can_fetch=lambda url: '/private' not in url)
+    frontier.add_urls(['https://www.shop.com/about-us', 'https://shop.com/private/contact'])
+    frontier.add_links(page('<a href="/about">About</a>'), 'https://shop.com/', 0)
+    assert [link.url for link in frontier.next_batch()] == [
+        'https://www.shop.com/about-us', 'https://shop.com/about'
+    ]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.scrapers.email_extractor import extract_emails, find_email
+from src.scrapers.frontier import CrawlFrontier
+from src.scrapers.html_parsing import ParsedPage, parse_page, resolve_parser, visible_text
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+CORPUS = sorted(name for name in os.listdir(CORPUS_DIR) if name.endswith('.html'))
+PARSERS = ['html.parser', resolve_parser('lxml')]
+
+
+def load_page(name):
+    with open(os.path.join(CORPUS_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def reject_all(email):
+    return False
+
+
+def contact_links(page):
+    frontier = CrawlFrontier('https://example.com/', max_pages=100, top_k=100)
+    frontier.add_links(page, 'https://example.com/', 0)
+    return frontier.next_batch()
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+@pytest.mark.parametrize('name', CORPUS)
+def test_strained_parse_matches_full_soup(name, parser):
+    """Test that the strained parse finds the same emails and contact links as a full html.parser soup."""
+    markup = load_page(name)
+    full = BeautifulSoup(markup, 'html.parser')
+    page = ParsedPage(markup, parser)
+
+    assert find_email(page, lambda email: True) == find_email(full, lambda email: True)
+    assert find_email(page, reject_all) == find_email(full, reject_all)
+    assert find_email(page, lambda email: True, ('text',)) == find_email(full, lambda email: True, ('text',))
+    assert extract_emails(page.get_text()) == extract_emails(full.get_text())
+    assert contact_links(page) == contact_links(full)
+
+
+def test_visible_text_skips_hidden_content():
+    """Test that scripts, styles, templates and comments are left out of the text."""
+    markup = ('<style>a{}</style><script>js@x.com</script><title>T</title>'
+              '<!-- c@x.com -->Hi &amp; <b>there</b><template>tp@x.com</template>')
+    assert visible_text(markup) == 'THi & there'
+
+
+def test_visible_text_keeps_bare_angle_brackets():
+    """Test that a bare '<' stays text and a quoted '>' does not end its tag."""
+    markup = '<p>Kids 5<10 eat free. Email info@shop.com</p><div title="x>y"> Open daily</div>'
+    assert visible_text(markup) == BeautifulSoup(markup, 'html.parser').get_text()
+    assert find_email(parse_page(markup), lambda email: True, ('text',))[0] == 'info@shop.com'
+
+
+def test_parse_page_can_build_full_soup():
+    """Test that strained parsing can be switched off."""
+    assert isinstance(parse_page('<p>x</p>', strained=True), ParsedPage)
+    assert isinstance(parse_page('<p>x</p>', 'html.parser', strained=False), BeautifulSoup)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.utils import http_transport
+from src.utils.http_transport import RETRY_STATUSES, create_session, get_session, upstream_settings
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in upstream: each GET pops the next status from ``script`` (200 once it is
+    empty), after ``delay`` seconds. Paths of all requests are recorded.
+    """
+    protocol_version = 'HTTP/1.1'
+    script = []
+    delay = 0
+    paths = []
+
+    def do_GET(self):
+        FlakyHandler.paths.append(self.path)
+        status = FlakyHandler.script.pop(0) if FlakyHandler.script else 200
+        time.sleep(FlakyHandler.delay)
+        body = str(status).encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream_url():
+    FlakyHandler.script = []
+    FlakyHandler.delay = 0
+    FlakyHandler.paths = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    """Point HTTP_UPSTREAMS at a test upstream that retries fast and times out quickly."""
+    monkeypatch.setattr(http_transport, 'HTTP_UPSTREAMS', {
+        'test': {'pool_size': 2, 'max_retries': 2, 'backoff_factor': 0, 'timeout': 0.2}
+    })
+    monkeypatch.setattr(http_transport, '_sessions', {})
+
+
+def test_upstream_settings_override_defaults(upstreams):
+    """Test that per-upstream settings are merged over the defaults."""
+    settings = upstream_settings('test')
+    assert settings['pool_size'] == 2 and settings['timeout'] == 0.2
+
+    defaults = upstream_settings('unknown')
+    assert defaults['pool_size'] == http_transport.HTTP_POOL_SIZE
+    assert defaults['max_retries'] == http_transport.HTTP_MAX_RETRIES
+    assert defaults['timeout'] == http_transport.REQUEST_TIMEOUT
+
+
+@pytest.mark.parametrize('status', RETRY_STATUSES)
+def test_server_errors_are_retried(upstreams, upstream_url, status):
+    """Test that 500-504 responses are retried and the request then succeeds."""
+    FlakyHandler.script = [status, status]
+    response = create_session('test').get(upstream_url)
+    assert response.status_code == 200
+    assert len(FlakyHandler.paths) == 3
+
+
+def test_client_errors_and_exhausted_retries_return_the_response(upstreams, upstream_url):
+    """Test that other errors are not retried and the last response is returned once retries run out."""
+    assert set(RETRY_STATUSES) == {500, 502, 503, 504}
+    FlakyHandler.script = [404]
+    assert create_session('test').get(upstream_url).status_code == 404
+    assert len(FlakyHandler.paths) == 1
+
+    FlakyHandler.script = [503, 503, 503]
+    assert create_session('test').get(upstream_url).status_code == 503
+    assert len(FlakyHandler.paths) == 4
+
+
+def test_default_timeout_applies_unless_caller_passes_one(upstreams, upstream_url):
+    """Test that the upstream's timeout is used when the caller gives none."""
+    FlakyHandler.delay = 0.5
+    session = create_session('test')
+    with pytest.raises(requests.exceptions.ConnectionError):
+        # The read times out on every attempt, which exhausts the retries
+        session.get(upstream_url)
+    assert len(FlakyHandler.paths) == 3
+
+    assert session.get(upstream_url, timeout=2).status_code == 200
+
+
+def test_get_session_is_shared_per_process_and_upstream(upstreams):
+    """Test that each (pid, upstream) gets one session."""
+    session = get_session('test')
+    assert get_session('test') is session
+    assert get_session('other') is not session
+    assert set(http_transport._sessions) == {(os.getpid(), 'test'), (os.getpid(), 'other')}
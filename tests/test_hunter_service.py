@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.services.hunter_service import HunterService
+from src.services.verification_cache import VerificationCache
+
+# Verification results the stand-in API returns, by address
+RESULTS = {
+    'good@shop.com': {'status': 'valid', 'score': 91},
+    'risky@shop.com': {'status': 'accept-all', 'score': 40},
+}
+
+
+def verification(email):
+    return {'email': email, **RESULTS.get(email, {'status': 'invalid', 'score': 0})}
+
+
+class HunterHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for the Hunter.io v2 API: single verifications plus bulk jobs,
+    whose results are released half per poll. Bulk jobs are only accepted when
+    ``bulk_enabled`` is set, and ``bulk_limit`` caps how many addresses a job covers.
+    """
+    requests = []
+    jobs = {}
+    bulk_enabled = True
+    bulk_limit = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        HunterHandler.requests.append(url.path)
+        if url.path == '/v2/email-verifier':
+            self.send_json(200, {'data': verification(parse_qs(url.query)['email'][0])})
+        elif url.path.startswith('/v2/bulk-verifications/'):
+            job = HunterHandler.jobs[url.path.rsplit('/', 1)[1]]
+            offset = int(parse_qs(url.query)['offset'][0])
+            job['released'] = min(len(job['emails']), job['released'] + len(job['emails']) // 2 + 1)
+            status = 'completed' if job['released'] == len(job['emails']) else 'running'
+            results = [verification(email) for email in job['emails'][offset:job['released']]]
+            self.send_json(200, {'data': {'id': job['id'], 'status': status, 'results': results}})
+        else:
+            self.send_json(404, {'errors': [{'details': 'Not found'}]})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        HunterHandler.requests.append(url.path)
+        if url.path == '/v2/bulk-verifications' and HunterHandler.bulk_enabled:
+            emails = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['emails']
+            job_id = str(len(HunterHandler.jobs) + 1)
+            HunterHandler.jobs[job_id] = {'id': job_id, 'emails': emails[:HunterHandler.bulk_limit], 'released': 0}
+            self.send_json(202, {'data': {'id': job_id}})
+        else:
+            self.send_json(404, {'errors': [{'details': 'Not found'}]})
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hunter(tmp_path):
+    HunterHandler.requests = []
+    HunterHandler.jobs = {}
+    HunterHandler.bulk_enabled = True
+    HunterHandler.bulk_limit = None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HunterHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    service = HunterService(cache=VerificationCache(str(tmp_path / 'hunter.sqlite3')))
+    service.base_url = f"http://127.0.0.1:{server.server_address[1]}/v2"
+    service.bulk_poll_interval = 0
+    yield service
+    server.shutdown()
+
+
+def test_verify_email_answers_repeats_from_cache(hunter):
+    """Test that repeat verifications of an address, in any case, cost one API call."""
+    assert hunter.verify_email('good@shop.com') is True
+    assert hunter.verify_email(' Good@Shop.com') is True
+    assert hunter.verify_email('risky@shop.com') is False
+    assert hunter.verify_email('risky@shop.com') is False
+    assert HunterHandler.requests == ['/v2/email-verifier', '/v2/email-verifier']
+    assert hunter.cache_stats()['hit_rate'] == '50.00%'
+
+
+def test_verify_email_refreshes_expired_entries(hunter, tmp_path):
+    """Test that entries older than the TTL are verified again."""
+    hunter.cache = VerificationCache(str(tmp_path / 'hunter.sqlite3'), ttl=0)
+    hunter.verify_email('good@shop.com')
+    hunter.verify_email('good@shop.com')
+    assert len(HunterHandler.requests) == 2
+
+
+def test_verify_emails_streams_bulk_job_into_cache(hunter):
+    """Test that a bulk job is polled until complete and every result lands in the cache."""
+    emails = ['good@shop.com', 'risky@shop.com'] + [f'user{i}@shop.com' for i in range(8)] + ['x@mailinator.com']
+    results = hunter.verify_emails(emails, min_bulk_size=5)
+
+    assert results['good@shop.com'] is True
+    assert results['risky@shop.com'] is False
+    assert results['x@mailinator.com'] is False
+    assert len(results) == 11
+    assert '/v2/email-verifier' not in HunterHandler.requests
+    assert len(HunterHandler.jobs['1']['emails']) == 10
+    assert hunter.cache.stats['stores'] == 10
+
+
+def test_verify_emails_falls_back_to_rate_limited_single_calls(hunter):
+    """Test that addresses a bulk job cannot cover are verified with single calls."""
+    HunterHandler.bulk_limit = 4
+    emails = [f'user{i}@shop.com' for i in range(6)] + ['good@shop.com']
+    results = hunter.verify_emails(emails, min_bulk_size=5)
+    assert results == {**{f'user{i}@shop.com': False for i in range(6)}, 'good@shop.com': True}
+    assert HunterHandler.requests.count('/v2/email-verifier') == 3
+    assert hunter.rate_limiter.stats()['requests'] == 3
+
+    HunterHandler.bulk_enabled = False
+    hunter.verify_emails([f'new{i}@shop.com' for i in range(5)], min_bulk_size=5)
+    assert HunterHandler.requests.count('/v2/email-verifier') == 8
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import pytest
+
+from src.utils.json_repair import Field, JSONRepairError, extract_json, repair_json, salvage_items, validate
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Prose and fences around the JSON, trailing commas, Python literals, single quotes
+    ('Here you go:\n```json\n[{"name": "A", "n": 1,}, {\'name\': \'B\', "ok": True,},]\n```\nHope it helps!',
+     [{'name': 'A', 'n': 1}, {'name': 'B', 'ok': True}]),
+    # Raw newline inside a string, missing comma between elements, unquoted key
+    ('[{"name": "A", "desc": "line1\nline2"} {name: "B"}]', [{'name': 'A', 'desc': 'line1\nline2'}, {'name': 'B'}]),
+    # Truncated mid-value: complete elements survive, the cut-off value is dropped
+    ('[{"name": "A"}, {"name": "B", "web', [{'name': 'A'}, {'name': 'B'}]),
+    ('[{"a": 1}, {"b": [1, 2, {"c": "d"}], "e": nul', [{'a': 1}, {'b': [1, 2, {'c': 'd'}]}]),
+    # An element cut off before any of its values completed is dropped, not left empty
+    ('[{"a": "x"}, {"a": "y', [{'a': 'x'}]),
+    ('[{"a": [1, {"b": 2, "c": [3', [{'a': [1, {'b': 2}]}]),
+    ('[1, -2, 3.5e3] and then ] more prose', [1, -2, 3500.0]),
+    # A wrapper object around the array
+    ('{"businesses": [{"name": "A"}]}', [{'name': 'A'}]),
+])
+def test_extract_json_repairs_common_slips(text, expected):
+    """Test that typical malformed model output is salvaged."""
+    assert extract_json(text, list) == expected
+
+
+def test_extract_json_fast_path_and_failures():
+    """Test valid JSON, dangling keys and text without any JSON."""
+    assert extract_json('{"a": [1, 2]}') == {'a': [1, 2]}
+    assert repair_json('{"a": 1, "b"}') == '{"a":1}'
+    with pytest.raises(JSONRepairError):
+        extract_json('no json here', dict)
+    with pytest.raises(JSONRepairError):
+        extract_json('{"a": 1}', list)
+
+
+def test_validate_reports_failed_fields_and_coerces():
+    """Test that failures name their field path and stringly-typed numbers are converted."""
+    schema = {
+        'score': Field(int, check=lambda score: 1 <= score <= 10),
+        'ok': bool,
+        'points': [str],
+        'accuracy': {'ops': (int, float), 'notes': Field(str, required=False)},
+        'name': str,
+    }
+    data = {'score': '8', 'ok': 'true', 'points': ['a', 3], 'accuracy': {'ops': None}}
+    assert validate(data, schema) == ['points[1]: expected str, got int', 'accuracy.ops: missing', 'name: missing']
+    assert data['score'] == 8 and data['ok'] is True
+    assert validate({'score': 11, 'ok': False, 'points': [], 'accuracy': {'ops': 1}, 'name': 'x'}, schema) == [
+        'score: failed check'
+    ]
+
+
+def test_salvage_items_keeps_valid_entries():
+    """Test that invalid list items are dropped with their errors, not the whole list."""
+    valid, failures = salvage_items([{'name': 'A'}, {'web': 'x'}, 'text'], {'name': str})
+    assert valid == [{'name': 'A'}]
+    assert failures == {1: ['name: missing'], 2: ['value: expected object, got str']}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import secrets
+
+import pytest
+
+from src.services.llm_cache import ResponseCache, cache_key
+from src.services.llm_client import LLMClient
+from tests.test_llm_client import ChatHandler, chat_url  # noqa: F401 (fixture)
+
+MESSAGES = [{'role': 'user', 'content': 'Find 5 bakeries in Boston, MA'}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'llm.sqlite3'))
+
+
+def test_cache_key_covers_request_not_transport():
+    """Test that the key depends on model, messages and sampling, not on field order or streaming."""
+    payload = {'model': 'grok-2', 'messages': MESSAGES, 'temperature': 0}
+    assert cache_key(payload) == cache_key({'temperature': 0, 'stream': False, **payload})
+    assert cache_key(payload) != cache_key({**payload, 'temperature': 0.7})
+    assert cache_key(payload) != cache_key({**payload, 'model': 'grok-1'})
+
+
+def test_entries_expire_and_evict_least_recently_used(tmp_path):
+    """Test TTL expiry and LRU eviction once the store is over budget."""
+    cache = ResponseCache(str(tmp_path / 'llm.sqlite3'), ttl=60, max_bytes=10 ** 6)
+    cache.put('a', {'answer': 1})
+    assert cache.get('a') == {'answer': 1}
+
+    cache.ttl = 0
+    assert cache.get('a') is None
+
+    cache = ResponseCache(str(tmp_path / 'small.sqlite3'), ttl=60)
+    cache.put('a', {'answer': secrets.token_hex(64)})
+    cache.put('b', {'answer': secrets.token_hex(64)})
+    # Room for two responses, not three
+    cache.max_bytes = cache._connection().execute("SELECT SUM(size) FROM responses").fetchone()[0] + 10
+    assert cache.get('a') is not None
+    cache.put('c', {'answer': secrets.token_hex(64)})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_client_caches_deterministic_completions(chat_url, cache):
+    """Test that temperature 0 calls are served from the cache, with per-call bypass and refresh."""
+    ChatHandler.reply = '[{"name": "Bakery"}]'
+    client = LLMClient(['key-a'], url=chat_url, backoff_factor=0, cache=cache)
+
+    assert client.chat_json(MESSAGES, expect=list, temperature=0) == [{'name': 'Bakery'}]
+    assert client.chat_json(MESSAGES, expect=list, temperature=0) == [{'name': 'Bakery'}]
+    assert len(ChatHandler.keys) == 1
+
+    client.chat(MESSAGES, temperature=0, use_cache=False)
+    client.chat(MESSAGES, temperature=0.7)
+    assert len(ChatHandler.keys) == 3
+
+    ChatHandler.reply = '[{"name": "New Bakery"}]'
+    assert client.chat_json(MESSAGES, expect=list, temperature=0, refresh=True) == [{'name': 'New Bakery'}]
+    assert client.chat_json(MESSAGES, expect=list, temperature=0) == [{'name': 'New Bakery'}]
+    assert len(ChatHandler.keys) == 4
+    assert client.summary()['cache']['hits'] == 2
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.llm_client import (
+    JsonArrayStream, KeyPool, LLMClient, LLMError, LLMResponseError, parse_duration, parse_json_content
+)
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for a chat-completions API. Each request pops the next
+    (status, content[, headers]) from ``script``; once it is empty every request
+    succeeds with ``reply``, after ``delay`` seconds. The bearer key of each
+    request is recorded. Streaming requests get ``reply`` as server-sent events of
+    ``chunk`` characters, ``delay`` seconds apart, ending in [DONE] unless ``done``
+    is False (a stream cut off early). ``peak`` is the most requests handled at once.
+    """
+    protocol_version = 'HTTP/1.1'
+    keys = []
+    script = []
+    reply = '[]'
+    delay = 0
+    chunk = 8
+    done = True
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        with ChatHandler.lock:
+            ChatHandler.active += 1
+            ChatHandler.peak = max(ChatHandler.peak, ChatHandler.active)
+        try:
+            self.handle_post()
+        finally:
+            with ChatHandler.lock:
+                ChatHandler.active -= 1
+
+    def handle_post(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        ChatHandler.keys.append(self.headers['Authorization'].split(' ', 1)[1])
+        status, content, *headers = ChatHandler.script.pop(0) if ChatHandler.script else (200, ChatHandler.reply)
+        if payload.get('stream') and status == 200:
+            return self.stream(content)
+        time.sleep(ChatHandler.delay)
+        body = json.dumps({'model': payload['model'], 'choices': [{'message': {'content': content}}]}).encode()
+        self.send_response(status)
+        for name, value in (headers[0] if headers else {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, content):
+        # Like the real APIs: one HTTP chunk per event
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        deltas = [content[start:start + ChatHandler.chunk] for start in range(0, len(content), ChatHandler.chunk)]
+        events = [f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n" for delta in deltas]
+        for event in events + (["data: [DONE]\n\n"] if ChatHandler.done else []):
+            data = event.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            time.sleep(ChatHandler.delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def chat_url():
+    ChatHandler.keys = []
+    ChatHandler.script = []
+    ChatHandler.reply = '[]'
+    ChatHandler.delay = 0
+    ChatHandler.chunk = 8
+    ChatHandler.done = True
+    ChatHandler.peak = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    server.shutdown()
+
+
+def make_client(url, keys=('key-a', 'key-b'), **kwargs):
+    return LLMClient(list(keys), url=url, backoff_factor=0, **kwargs)
+
+
+def test_parse_json_content_handles_fences_and_chatter():
+    """Test that fenced or chatty model output still yields the JSON payload."""
+    assert parse_json_content('```json\n[{"name": "A"}]\n```', list) == [{'name': 'A'}]
+    assert parse_json_content('Here you go: {"a": [1]} Hope it helps', dict) == {'a': [1]}
+    assert parse_json_content('```\n{"a": 1}\n```') == {'a': 1}
+    with pytest.raises(LLMResponseError) as error:
+        parse_json_content('{"a": 1}', list)
+    assert error.value.content == '{"a": 1}'
+
+
+def test_parse_json_content_applies_schema():
+    """Test that bad list items are dropped while a bad object raises with its failed fields."""
+    assert parse_json_content('[{"name": "A"}, {"site": "x"},]', list, {'name': str}) == [{'name': 'A'}]
+    with pytest.raises(LLMResponseError) as error:
+        parse_json_content('{"score": "high"}', dict, {'score': int, 'name': str})
+    assert error.value.errors == ['score: expected int, got str', 'name: missing']
+
+
+def test_chat_json_retries_rate_limits_on_another_key(chat_url):
+    """Test that a 429 is retried, spreading attempts over the pooled keys."""
+    ChatHandler.script = [(429, ''), (200, '```json\n[{"name": "Shop"}]\n```')]
+    client = make_client(chat_url)
+    assert client.chat_json([{'role': 'user', 'content': 'hi'}], expect=list) == [{'name': 'Shop'}]
+    assert ChatHandler.keys == ['key-a', 'key-b']
+    assert client.stats['rate_limited'] == 1 and client.stats['retries'] == 1
+
+
+def test_client_errors_are_not_retried(chat_url):
+    """Test that a 4xx other than 429 fails at once with its status."""
+    ChatHandler.script = [(401, 'bad key')]
+    client = make_client(chat_url)
+    with pytest.raises(LLMError) as error:
+        client.chat([{'role': 'user', 'content': 'hi'}])
+    assert error.value.status == 401
+    assert len(ChatHandler.keys) == 1
+
+
+def test_key_pool_bounds_concurrency_per_key():
+    """Test that no key ever has more than ``limit`` requests in flight."""
+    pool = KeyPool(['a', 'b'], limit=2)
+    peak = {'a': 0, 'b': 0}
+    lock = threading.Lock()
+
+    def work(_):
+        key = pool.acquire()
+        with lock:
+            peak[key] = max(peak[key], pool.in_flight[key])
+        threading.Event().wait(0.01)
+        pool.release(key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(40)))
+    assert peak == {'a': 2, 'b': 2}
+    assert pool.in_flight == {'a': 0, 'b': 0}
+
+
+def test_key_pool_adapts_limits_aimd():
+    """Test additive increase on successes with headroom and multiplicative decrease on a 429."""
+    pool = KeyPool(['a'], limit=4, max_limit=6, cooldown=0)
+    for _ in range(8):
+        pool.release(pool.acquire(), 200, {})
+    assert 5.5 < pool.states['a'].limit <= 6
+
+    pool.release(pool.acquire(), 429, {'retry-after': '0'})
+    assert 2.5 < pool.states['a'].limit < 3.5
+    # Responses that show no headroom hold the limit steady
+    limit = pool.states['a'].limit
+    pool.release(pool.acquire(), 200, {'x-ratelimit-remaining-requests': '1'})
+    assert pool.states['a'].limit == limit
+    assert pool.summary()['...a'] == {'limit': round(limit, 2), 'in_flight': 0, 'completed': 9, 'rate_limited': 1}
+
+
+def test_key_pool_rests_rate_limited_keys():
+    """Test that a key is skipped until its Retry-After or rate-limit reset passes."""
+    pool = KeyPool(['a', 'b'], limit=2)
+    pool.release(pool.acquire(), 429, {'retry-after': '30'})
+    pool.release(pool.acquire(), 200, {
+        'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '250ms'
+    })
+    started = time.monotonic()
+    assert pool.acquire() == 'b'
+    assert time.monotonic() - started >= 0.2
+    assert parse_duration('1m30s') == 90 and parse_duration('2') == 2 and parse_duration('soon') is None
+
+
+def test_rate_limited_retry_skips_backoff(chat_url):
+    """Test that a 429 is retried at once on another key instead of sleeping."""
+    ChatHandler.script = [(429, '', {'Retry-After': '30'})]
+    client = LLMClient(['key-a', 'key-b'], url=chat_url, backoff_factor=10)
+    started = time.monotonic()
+    client.chat([{'role': 'user', 'content': 'hi'}])
+    assert time.monotonic() - started < 5
+    assert ChatHandler.keys == ['key-a', 'key-b']
+    assert client.summary()['keys']['...ey-a']['rate_limited'] == 1
+
+
+def test_async_api_shares_the_key_pool(chat_url):
+    """Test that async completions run concurrently and parse like the sync API."""
+    ChatHandler.reply = '{"ok": true}'
+    client = make_client(chat_url, concurrency_per_key=1)
+
+    async def run():
+        try:
+            return await asyncio.gather(*[
+                client.chat_json_async([{'role': 'user', 'content': str(i)}], expect=dict) for i in range(6)
+            ])
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [{'ok': True}] * 6
+    assert sorted(set(ChatHandler.keys)) == ['key-a', 'key-b']
+    assert client.keys.in_flight == {'key-a': 0, 'key-b': 0}
+
+
+def test_async_connections_are_bounded_by_the_upstream_pool(chat_url, monkeypatch):
+    """Test that async calls and streams hold one of the upstream's pool_size connections only while on the wire."""
+    from src.services import llm_client
+    monkeypatch.setattr(llm_client, 'upstream_settings', lambda upstream: {'pool_size': 2})
+    ChatHandler.reply = '[{"name": "Shop"}]'
+    ChatHandler.delay = 0.05
+    client = make_client(chat_url, concurrency_per_key=10)
+
+    async def stream(i):
+        return [item async for item in client.stream_json_array_async([{'role': 'user', 'content': f's{i}'}])]
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *[client.chat_json_async([{'role': 'user', 'content': str(i)}], expect=list) for i in range(4)],
+                *[stream(i) for i in range(2)]
+            )
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [[{'name': 'Shop'}]] * 6
+    assert ChatHandler.peak == 2
+
+
+def test_identical_requests_in_flight_share_one_call(chat_url):
+    """Test that concurrent identical prompts cost one upstream call, unless coalescing is turned off."""
+    ChatHandler.reply = '[{"name": "Shop"}]'
+    ChatHandler.delay = 0.2
+    client = make_client(chat_url)
+    messages = [{'role': 'user', 'content': 'same prompt'}]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: client.chat_json(messages, expect=list), range(4)))
+    assert results == [[{'name': 'Shop'}]] * 4
+    assert len(ChatHandler.keys) == 1
+    assert client.summary()['coalesced'] == 3
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: client.chat(messages, coalesce=False), range(2)))
+    assert len(ChatHandler.keys) == 3
+
+
+def test_json_array_stream_emits_elements_as_they_close():
+    """Test that elements come out chunk by chunk, skipping fences and scalars and repairing broken elements."""
+    text = 'Sure!\n```json\n[{"name": "A ] }", "q": "\\"}"}, 3, {"bad": , }, {"name": "B", "tags": ["x",]}, {"name": "C", "ci'
+    parser = JsonArrayStream()
+    emitted = [(index, item) for index in range(0, len(text), 5) for item in parser.feed(text[index:index + 5])]
+    assert [item for _, item in emitted] == [{'name': 'A ] }', 'q': '"}'}, {}, {'name': 'B', 'tags': ['x']}]
+    # The first element is out long before the array ends
+    assert emitted[0][0] < text.index('"B"')
+    # A truncated last element is salvaged
+    assert parser.close() == [{'name': 'C'}]
+
+    with pytest.raises(LLMResponseError):
+        JsonArrayStream().close()
+
+
+def test_stream_json_array_yields_before_completion(chat_url, tmp_path):
+    """Test that the first streamed business is available before generation finishes, and caching of streams."""
+    from src.services.llm_cache import ResponseCache
+
+    ChatHandler.reply = json.dumps([{'name': f"Shop {i}"} for i in range(4)])
+    ChatHandler.delay = 0.02
+    client = make_client(chat_url, cache=ResponseCache(str(tmp_path / 'llm.sqlite3')))
+    messages = [{'role': 'user', 'content': 'hi'}]
+
+    started = time.monotonic()
+    stream = client.stream_json_array(messages, temperature=0)
+    first = next(stream)
+    first_after = time.monotonic() - started
+    rest = list(stream)
+    assert [first] + rest == [{'name': f"Shop {i}"} for i in range(4)]
+    assert first_after < (time.monotonic() - started) / 2
+    assert client.keys.in_flight == {'key-a': 0, 'key-b': 0}
+
+    # A completed stream is cached like a regular completion
+    assert client.chat_json(messages, expect=list, temperature=0) == [first] + rest
+    assert list(client.stream_json_array(messages, temperature=0)) == [first] + rest
+    assert len(ChatHandler.keys) == 1
+
+
+def test_stream_cut_off_before_done_is_not_cached_or_counted(chat_url, tmp_path):
+    """Test that a stream without [DONE] is neither cached nor counted as a success for its key."""
+    from src.services.llm_cache import ResponseCache
+
+    ChatHandler.reply = 'partial answer'
+    ChatHandler.done = False
+    client = make_client(chat_url, keys=('key-a',), cache=ResponseCache(str(tmp_path / 'llm.sqlite3')))
+    limit = client.keys.states['key-a'].limit
+    messages = [{'role': 'user', 'content': 'hi'}]
+
+    assert ''.join(client.stream(messages, temperature=0)) == 'partial answer'
+    assert client.keys.states['key-a'].limit == limit
+    assert client.keys.in_flight == {'key-a': 0}
+
+    ChatHandler.done = True
+    assert ''.join(client.stream(messages, temperature=0)) == 'partial answer'
+    assert len(ChatHandler.keys) == 2
+    assert client.keys.states['key-a'].limit > limit
+
+
+def test_stream_json_array_async_yields_and_retries(chat_url):
+    """Test that the async stream retries a rate-limited start, yields every element and frees its key."""
+    ChatHandler.script = [(429, 'slow down')]
+    ChatHandler.reply = '```json\n[{"name": "Shop 0"}, {"name": "Shop 1"}]\n```'
+    client = make_client(chat_url)
+
+    async def run():
+        try:
+            return [item async for item in client.stream_json_array_async([{'role': 'user', 'content': 'hi'}])]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [{'name': 'Shop 0'}, {'name': 'Shop 1'}]
+    assert ChatHandler.keys == ['key-a', 'key-b']
+    assert client.keys.in_flight == {'key-a': 0, 'key-b': 0}
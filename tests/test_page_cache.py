@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+from src.scrapers.page_cache import PageCache, canonical_url
+
+
+def test_canonical_url():
+    """Test that equivalent URLs share one cache key."""
+    assert canonical_url("HTTPS://Example.com:443?b=2&a=1#top") == "https://example.com/?a=1&b=2"
+
+
+def test_put_and_get_round_trip(tmp_path):
+    """Test that stored pages come back with their validators."""
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'), ttl=60)
+    cache.put("https://example.com/", "<html>hi</html>", "text/html", '"abc"', None)
+    page = cache.get("https://example.com")
+    assert page.body == "<html>hi</html>"
+    assert cache.is_fresh(page)
+    assert cache.conditional_headers(page) == {'If-None-Match': '"abc"'}
+    assert cache.get("https://example.com/other") is None
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used page is evicted when over budget."""
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'), max_bytes=40)
+    cache.put("https://a.com/", "a" * 1000)
+    cache.put("https://b.com/", "b" * 1000)
+    cache.get("https://a.com/")
+    cache.put("https://c.com/", "c" * 1000)
+    assert cache.get("https://b.com/") is None
+    assert cache.get("https://a.com/") is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_running_total_tracks_stores_and_evicts_in_one_pass(tmp_path):
+    """Test that the stored-bytes total follows inserts, replacements and deletes, and one put can evict several pages."""
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'), max_bytes=10 ** 6)
+    conn = cache._connection()
+
+    def total():
+        return conn.execute("SELECT value FROM cache_meta WHERE name = 'total_bytes'").fetchone()[0]
+
+    for name in 'abc':
+        cache.put(f"https://{name}.com/", name * 1000)
+    cache.put("https://a.com/", "different " * 500)
+    assert total() == conn.execute("SELECT SUM(size) FROM pages").fetchone()[0]
+
+    # Room for little more than one page: the put evicts the three older ones together
+    cache.max_bytes = max(size for (size,) in conn.execute("SELECT size FROM pages")) + 5
+    cache.put("https://d.com/", "d" * 1000)
+    assert [url for (url,) in conn.execute("SELECT url FROM pages")] == ["https://d.com/"]
+    assert cache.stats['evictions'] == 3
+    assert total() == conn.execute("SELECT SUM(size) FROM pages").fetchone()[0]
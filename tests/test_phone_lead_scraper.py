@@ -4,6 +4,7 @@ from src.services.phone_lead_scraper import PhoneLeadScraper
 from src.config.config import GROK_API_KEYS
 from unittest.mock import patch, MagicMock
 import json
+import asyncio
 
 def test_phone_lead_scraper_initialization():
     """Test that PhoneLeadScraper initializes correctly."""
@@ -250,5 +251,57 @@ def test_firebase_error_handling(mock_patch, scraper):
     
     assert success is False
 
+class FakeLLM:
+    """Async stand-in for an LLMClient that records how many calls overlap."""
+
+    def __init__(self, reply, items=(), delay=0.01):
+        self.reply = reply
+        self.items = items
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def _call(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+
+    async def stream_json_array_async(self, messages, **params):
+        await self._call()
+        for item in self.items:
+            yield item
+
+    async def chat_json_async(self, messages, **params):
+        await self._call()
+        return self.reply
+
+    def summary(self):
+        return {}
+
+    async def aclose(self):
+        pass
+
+def test_scrape_async_overlaps_calls_across_combinations(monkeypatch):
+    """Test that all combinations run in one loop, with no per-scraper cap queueing the calls."""
+    import src.services.phone_lead_scraper as module
+    monkeypatch.setattr(module, 'FIREBASE_URL', 'https://example.firebaseio.com')
+    scraper = PhoneLeadScraper(["key-a"])
+
+    businesses = [{"name": f"Shop {i}", "website": "https://shop.example", "confidence_score": 8} for i in range(4)]
+    sections = ("tech_stack", "operations", "growth_potential", "software_opportunity", "decision_maker")
+    scraper.llm = FakeLLM({section: {"score": 8} for section in sections}, items=businesses)
+    scraper.deepseek = FakeLLM({"is_legitimate": True, "confidence_score": 90})
+
+    business_type = module.BUSINESS_TYPES[0][0]
+    combinations = [("Boston", "MA", business_type), ("Denver", "CO", business_type), ("Austin", "TX", "Not A Target")]
+    leads = asyncio.run(scraper.scrape_async(combinations))
+
+    assert len(leads) == 8
+    assert {lead["city"] for lead in leads} == {"Boston", "Denver"}
+    assert all(lead["overall_score"] == 8 for lead in leads)
+    # The clients' connection pools are the only bound; the stand-ins have none
+    assert scraper.deepseek.peak == 8
+
 if __name__ == "__main__":
     pytest.main([__file__, '-v']) 
\ No newline at end of file
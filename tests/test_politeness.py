@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+from src.scrapers.politeness import HostScheduler, host_key
+
+
+def test_host_key_ignores_www_and_path():
+    """Test that URLs on the same site share a host key."""
+    assert host_key("https://www.Example.com/contact") == host_key("http://example.com/")
+
+
+def test_repeat_hits_to_same_host_wait():
+    """Test that only repeat requests to the same host are delayed."""
+    scheduler = HostScheduler(min_interval=10, burst=1)
+    assert scheduler.reserve("https://a.com/") == 0
+    assert scheduler.reserve("https://b.com/") == 0
+    assert 9 < scheduler.reserve("https://a.com/about") <= 10
+    assert 19 < scheduler.reserve("https://a.com/contact") <= 20
+
+
+def test_stats_report_wait_time():
+    """Test that wait statistics are collected."""
+    scheduler = HostScheduler(min_interval=5, burst=2)
+    for _ in range(3):
+        scheduler.reserve("https://a.com/")
+    stats = scheduler.stats()
+    assert stats['requests'] == 3
+    assert stats['delayed_requests'] == 1
+    assert stats['hosts'] == 1
+    assert stats['queue_depth'] == {}
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    """Test that threads asking for the same key while it is in flight share the leader's call."""
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def fetch():
+        runs.append(1)
+        release.wait(5)
+        return {'rows': [1, 2]}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(flight.do, 'key', fetch) for _ in range(4)]
+        while flight.stats['coalesced'] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert runs == [1]
+    assert results == [{'rows': [1, 2]}] * 4
+    # Followers get copies, not the leader's object
+    assert len({id(result) for result in results}) == 4
+    assert flight.summary() == {'calls': 1, 'coalesced': 3, 'coalesced_rate': "75.00%"}
+
+    # Once finished the key is forgotten
+    flight.do('key', fetch)
+    assert runs == [1, 1]
+
+
+def test_errors_reach_every_waiter():
+    """Test that the leader's exception is raised to the callers that joined it."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(flight.do, 'key', fail) for _ in range(2)]
+        while flight.stats['coalesced'] < 1:
+            threading.Event().wait(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_async_calls_share_one_result():
+    """Test coalescing of identical coroutine calls within one event loop."""
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return 'answer'
+
+    async def run():
+        return await asyncio.gather(*[flight.do_async('key', fetch) for _ in range(5)],
+                                    flight.do_async('other', fetch))
+
+    assert asyncio.run(run()) == ['answer'] * 6
+    assert runs == [1, 1]
+    assert flight.stats == {'calls': 2, 'coalesced': 4}
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+from src.scrapers.site_index import (
+    SiteIndex, SiteInfo, can_fetch, contact_candidates, parse_sitemap, rank_child_sitemaps, sitemap_locations
+)
+
+
+def test_parse_sitemap_splits_pages_and_children():
+    """Test that url and sitemap index entries are told apart."""
+    xml = ('<sitemapindex><sitemap><loc>https://shop.com/post-sitemap.xml</loc></sitemap>'
+           '<sitemap><loc>https://shop.com/page-sitemap.xml</loc></sitemap></sitemapindex>'
+           '<urlset><url><loc><![CDATA[https://shop.com/contact?a=1&amp;b=2]]></loc></url></urlset>')
+    pages, children = parse_sitemap(xml)
+    assert pages == ['https://shop.com/contact?a=1&b=2']
+    assert rank_child_sitemaps(children) == ['https://shop.com/page-sitemap.xml', 'https://shop.com/post-sitemap.xml']
+
+
+def test_robots_sitemaps_and_rules():
+    """Test that declared sitemaps are used, with /sitemap.xml as the fallback."""
+    robots = "User-agent: *\nDisallow: /admin\nSitemap: https://shop.com/sm.xml\n"
+    assert sitemap_locations(robots, 'https://shop.com') == ['https://shop.com/sm.xml']
+    assert sitemap_locations('', 'https://shop.com') == ['https://shop.com/sitemap.xml']
+
+    info = SiteInfo('shop.com', robots, [], 0)
+    assert not can_fetch(info, 'https://shop.com/admin/contact')
+    assert can_fetch(info, 'https://shop.com/contact')
+
+
+def test_contact_candidates_ranks_same_site_pages():
+    """Test that only same-site, contact-like sitemap URLs are kept, best first."""
+    urls = ['https://shop.com/blog/hello', 'https://shop.com/about', 'https://www.shop.com/contact',
+            'https://other.com/contact']
+    assert contact_candidates(urls, 'https://shop.com/') == ['https://www.shop.com/contact', 'https://shop.com/about']
+
+
+def test_site_index_persists_and_expires(tmp_path):
+    """Test that hosts are shared between instances and expire after the TTL."""
+    path = str(tmp_path / 'sites.sqlite3')
+    SiteIndex(path).put('https://www.shop.com/', 'User-agent: *', ['https://shop.com/contact'])
+
+    info = SiteIndex(path).get('https://shop.com/menu')
+    assert info.contact_urls == ['https://shop.com/contact']
+    assert SiteIndex(path, ttl=0).get('https://shop.com/') is None
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import pytest
+
+from src.utils import email_validator
+from src.utils.dns_cache import DnsCache
+from src.utils.validation_pipeline import Tier, ValidationPipeline, email_pipeline, website_pipeline
+from tests.test_bulk_dns import ZONE, FakeAsyncResolver, FakeSyncResolver
+
+
+class FakeHunter:
+    """HunterService stand-in that accepts addresses at shop.com."""
+
+    def __init__(self):
+        self.batches = []
+
+    def verify_emails(self, emails):
+        self.batches.append(list(emails))
+        return {email.lower(): email.lower().endswith('@shop.com') for email in emails}
+
+
+@pytest.fixture(autouse=True)
+def fake_dns(tmp_path, monkeypatch):
+    FakeAsyncResolver.queries = []
+    monkeypatch.setitem(ZONE, ('sink.biz', 'MX'), (['10 catch-all.sink.biz.'], 300))
+    monkeypatch.setattr(email_validator, 'dns_cache', DnsCache(str(tmp_path / 'dns.sqlite3')))
+    monkeypatch.setattr(email_validator.dns.asyncresolver, 'Resolver', FakeAsyncResolver)
+    monkeypatch.setattr(email_validator.dns.resolver, 'Resolver', FakeSyncResolver)
+    monkeypatch.setattr(email_validator, '_thread_state', email_validator.threading.local())
+
+
+def test_tiers_short_circuit_and_record_stats():
+    """Test that each tier only sees the items every earlier tier passed."""
+    seen = []
+
+    def tier(name, rejects):
+        def check(items):
+            seen.append((name, list(items)))
+            return [f"{name} failed" if item in rejects else None for item in items]
+        return Tier(name, check)
+
+    pipeline = ValidationPipeline([tier('cheap', {1}), tier('costly', {2})], "ok")
+    results = pipeline.run([1, 2, 3])
+
+    assert seen == [('cheap', [1, 2, 3]), ('costly', [2, 3])]
+    assert [(result.valid, result.tier, result.message) for result in results] == [
+        (False, 'cheap', "cheap failed"), (False, 'costly', "costly failed"), (True, None, "ok")
+    ]
+    summary = pipeline.summary()
+    assert summary['cheap']['checked'] == 3 and summary['cheap']['rejected'] == 1
+    assert summary['costly']['checked'] == 2 and summary['costly']['rejection_rate'] == "50.00%"
+
+
+def test_email_pipeline_orders_checks_cheapest_first():
+    """Test that bad formats and blocklisted domains cost no DNS query, and only MX survivors reach Hunter."""
+    hunter = FakeHunter()
+    pipeline = email_pipeline(reject_suspicious_mx=True, hunter=hunter)
+    emails = ['a@shop.com', 'bad-email', None, 'x@tempmail.com', 'b@cafe.org', 'c@gone.biz', 'd@sink.biz']
+    results = pipeline.run(emails)
+
+    assert [(result.valid, result.tier) for result in results] == [
+        (True, None), (False, 'format'), (False, 'format'), (False, 'blocklist'),
+        (False, 'hunter'), (False, 'mx'), (False, 'mx')
+    ]
+    assert results[2].message == "No email provided"
+    assert results[6].message == "Suspicious MX record"
+    assert sorted(name for name, _ in FakeAsyncResolver.queries) == ['cafe.org', 'gone.biz', 'shop.com', 'sink.biz']
+    assert hunter.batches == [['a@shop.com', 'b@cafe.org']]
+
+
+def test_single_checks_skip_dns_on_cache_hits():
+    """Test that a repeat single-item check is answered from the DNS cache."""
+    pipeline = email_pipeline()
+    assert pipeline.check('a@shop.com').valid
+    assert pipeline.check('b@shop.com').valid
+    assert FakeAsyncResolver.queries == [('shop.com', 'MX')]
+
+
+def test_website_pipeline():
+    """Test URL parsing and the A-then-CNAME fallback."""
+    results = website_pipeline().run(['https://www.shop.com/about', 'not a url', 'http://alias.net', 'http://gone.biz'])
+    assert [(result.valid, result.tier) for result in results] == [
+        (True, None), (False, 'url'), (True, None), (False, 'dns')
+    ]